@@ -0,0 +1,113 @@
+"""Add service_id, duration_minutes and end_time to bookings
+
+Revision ID: 3c8e1f2a9b47
+Revises: f957f392ca77
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from datetime import datetime, timedelta, date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f2a9b47'
+down_revision: Union[str, None] = 'f957f392ca77'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_DURATION_MINUTES = 30
+BACKFILL_BATCH_SIZE = 500
+
+
+def _backfill(bind) -> None:
+    """Resolve service names to ids and snapshot each booking's duration and end time"""
+    inspector = sa.inspect(bind)
+    if 'services' not in inspector.get_table_names():
+        return
+
+    services = sa.table(
+        'services',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('duration', sa.Integer),
+    )
+    bookings = sa.table(
+        'bookings',
+        sa.column('id', sa.Integer),
+        sa.column('time', sa.Time),
+        sa.column('service', sa.String),
+        sa.column('service_id', sa.Integer),
+        sa.column('duration_minutes', sa.Integer),
+        sa.column('end_time', sa.Time),
+    )
+
+    by_name = {
+        row.name: (row.id, row.duration)
+        for row in bind.execute(sa.select(services.c.id, services.c.name, services.c.duration))
+    }
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(bookings.c.id, bookings.c.time, bookings.c.service)
+            .where(bookings.c.id > last_id, bookings.c.end_time.is_(None))
+            .order_by(bookings.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            service_id, duration = by_name.get(row.service, (None, None))
+            duration = duration or DEFAULT_DURATION_MINUTES
+            end_time = None
+            if row.time is not None:
+                end_time = (datetime.combine(date.min, row.time) + timedelta(minutes=duration)).time()
+            bind.execute(
+                bookings.update()
+                .where(bookings.c.id == row.id)
+                .values(service_id=service_id, duration_minutes=duration, end_time=end_time)
+            )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column['name'] for column in inspector.get_columns('bookings')}
+    indexes = {index['name'] for index in inspector.get_indexes('bookings')}
+
+    # Batch mode lets SQLite add the foreign key by recreating the table
+    with op.batch_alter_table('bookings') as batch_op:
+        if 'service_id' not in columns:
+            batch_op.add_column(sa.Column('service_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_bookings_service_id_services', 'services', ['service_id'], ['id'])
+        if 'duration_minutes' not in columns:
+            batch_op.add_column(sa.Column('duration_minutes', sa.Integer(), nullable=True))
+        if 'end_time' not in columns:
+            batch_op.add_column(sa.Column('end_time', sa.Time(), nullable=True))
+        if 'ix_bookings_service_id' not in indexes:
+            batch_op.create_index('ix_bookings_service_id', ['service_id'], unique=False)
+        if 'ix_bookings_artist_date_time' not in indexes:
+            batch_op.create_index(
+                'ix_bookings_artist_date_time',
+                ['hair_artist_id', 'date', 'time', 'end_time'],
+                unique=False
+            )
+
+    _backfill(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bookings') as batch_op:
+        batch_op.drop_index('ix_bookings_artist_date_time')
+        batch_op.drop_index('ix_bookings_service_id')
+        batch_op.drop_constraint('fk_bookings_service_id_services', type_='foreignkey')
+        batch_op.drop_column('end_time')
+        batch_op.drop_column('duration_minutes')
+        batch_op.drop_column('service_id')
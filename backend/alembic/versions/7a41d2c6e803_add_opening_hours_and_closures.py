@@ -0,0 +1,71 @@
+"""Add opening_hours and closures tables
+
+Revision ID: 7a41d2c6e803
+Revises: 3c8e1f2a9b47
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from datetime import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a41d2c6e803'
+down_revision: Union[str, None] = '3c8e1f2a9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'opening_hours' not in tables:
+        opening_hours = op.create_table(
+            'opening_hours',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('weekday', sa.Integer(), nullable=False),
+            sa.Column('open_time', sa.Time(), nullable=False),
+            sa.Column('close_time', sa.Time(), nullable=False),
+            sa.Column('valid_from', sa.Date(), nullable=True),
+            sa.Column('valid_to', sa.Date(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_opening_hours_id', 'opening_hours', ['id'], unique=False)
+        op.create_index('ix_opening_hours_weekday', 'opening_hours', ['weekday'], unique=False)
+
+        # Preserve the previously hardcoded pattern: 9:00-17:00, closed on Tuesdays
+        op.bulk_insert(opening_hours, [
+            {'weekday': weekday, 'open_time': time(9, 0), 'close_time': time(17, 0)}
+            for weekday in [0, 2, 3, 4, 5, 6]
+        ])
+
+    if 'closures' not in tables:
+        op.create_table(
+            'closures',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('start_date', sa.Date(), nullable=False),
+            sa.Column('end_date', sa.Date(), nullable=False),
+            sa.Column('reason', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_closures_id', 'closures', ['id'], unique=False)
+        op.create_index('ix_closures_start_date', 'closures', ['start_date'], unique=False)
+        op.create_index('ix_closures_end_date', 'closures', ['end_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_closures_end_date', table_name='closures')
+    op.drop_index('ix_closures_start_date', table_name='closures')
+    op.drop_index('ix_closures_id', table_name='closures')
+    op.drop_table('closures')
+    op.drop_index('ix_opening_hours_weekday', table_name='opening_hours')
+    op.drop_index('ix_opening_hours_id', table_name='opening_hours')
+    op.drop_table('opening_hours')
@@ -0,0 +1,40 @@
+"""Add booking reminders
+
+Revision ID: a5f2c8e1d9b4
+Revises: e3b8c5f1a7d2
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5f2c8e1d9b4'
+down_revision: Union[str, None] = 'e3b8c5f1a7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'booking_reminders' not in tables:
+        op.create_table(
+            'booking_reminders',
+            sa.Column('booking_id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('booking_id', 'kind')
+        )
+        op.create_index('ix_booking_reminders_created_at', 'booking_reminders', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_reminders_created_at', table_name='booking_reminders')
+    op.drop_table('booking_reminders')
@@ -0,0 +1,37 @@
+"""Add cache versions for cross-process invalidation
+
+Revision ID: a8d3f5e2c7b1
+Revises: e6a1c9d4b2f3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f5e2c7b1'
+down_revision: Union[str, None] = 'e6a1c9d4b2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'cache_versions' not in tables:
+        op.create_table(
+            'cache_versions',
+            sa.Column('namespace', sa.String(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('namespace')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cache_versions')
@@ -0,0 +1,86 @@
+"""Add artist shifts, breaks and time off
+
+Revision ID: b5e93f0d4c12
+Revises: 7a41d2c6e803
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e93f0d4c12'
+down_revision: Union[str, None] = '7a41d2c6e803'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'artist_shifts' not in tables:
+        op.create_table(
+            'artist_shifts',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('hair_artist_id', sa.Integer(), nullable=False),
+            sa.Column('weekday', sa.Integer(), nullable=False),
+            sa.Column('start_time', sa.Time(), nullable=False),
+            sa.Column('end_time', sa.Time(), nullable=False),
+            sa.Column('valid_from', sa.Date(), nullable=True),
+            sa.Column('valid_to', sa.Date(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['hair_artist_id'], ['hair_artists.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_artist_shifts_id', 'artist_shifts', ['id'], unique=False)
+        op.create_index('ix_artist_shifts_hair_artist_id', 'artist_shifts', ['hair_artist_id'], unique=False)
+
+    if 'artist_breaks' not in tables:
+        op.create_table(
+            'artist_breaks',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('hair_artist_id', sa.Integer(), nullable=False),
+            sa.Column('weekday', sa.Integer(), nullable=True),
+            sa.Column('start_time', sa.Time(), nullable=False),
+            sa.Column('end_time', sa.Time(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['hair_artist_id'], ['hair_artists.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_artist_breaks_id', 'artist_breaks', ['id'], unique=False)
+        op.create_index('ix_artist_breaks_hair_artist_id', 'artist_breaks', ['hair_artist_id'], unique=False)
+
+    if 'artist_time_off' not in tables:
+        op.create_table(
+            'artist_time_off',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('hair_artist_id', sa.Integer(), nullable=False),
+            sa.Column('start', sa.DateTime(), nullable=False),
+            sa.Column('end', sa.DateTime(), nullable=False),
+            sa.Column('reason', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['hair_artist_id'], ['hair_artists.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_artist_time_off_id', 'artist_time_off', ['id'], unique=False)
+        op.create_index(
+            'ix_artist_time_off_artist_range', 'artist_time_off',
+            ['hair_artist_id', 'start', 'end'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_artist_time_off_artist_range', table_name='artist_time_off')
+    op.drop_index('ix_artist_time_off_id', table_name='artist_time_off')
+    op.drop_table('artist_time_off')
+    op.drop_index('ix_artist_breaks_hair_artist_id', table_name='artist_breaks')
+    op.drop_index('ix_artist_breaks_id', table_name='artist_breaks')
+    op.drop_table('artist_breaks')
+    op.drop_index('ix_artist_shifts_hair_artist_id', table_name='artist_shifts')
+    op.drop_index('ix_artist_shifts_id', table_name='artist_shifts')
+    op.drop_table('artist_shifts')
@@ -0,0 +1,156 @@
+"""Add customers keyed by normalized contact
+
+Revision ID: b9c2d4e6f8a1
+Revises: f1e8b3c6a2d9
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c2d4e6f8a1'
+down_revision: Union[str, None] = 'f1e8b3c6a2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+# Copies of app.utils.customers normalization, frozen for this migration
+def _normalize_email(email):
+    email = (email or "").strip().lower()
+    return email if "@" in email else None
+
+
+def _normalize_phone(phone):
+    phone = (phone or "").strip()
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) < 6:
+        return None
+    return ("+" if phone.startswith("+") else "") + digits
+
+
+def _backfill(bind) -> None:
+    """Create one customer per normalized email (or phone) and link every booking to it"""
+    customers = sa.table(
+        'customers',
+        sa.column('id', sa.Integer),
+        sa.column('email_key', sa.String),
+        sa.column('phone_key', sa.String),
+        sa.column('name', sa.String),
+        sa.column('email', sa.String),
+        sa.column('phone', sa.String),
+        sa.column('gender', sa.String),
+    )
+    bookings = sa.table(
+        'bookings',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('email', sa.String),
+        sa.column('phone', sa.String),
+        sa.column('gender', sa.String),
+        sa.column('customer_id', sa.Integer),
+    )
+
+    by_email = {}
+    by_phone = {}
+    for row in bind.execute(sa.select(customers.c.id, customers.c.email_key, customers.c.phone_key)):
+        if row.email_key:
+            by_email[row.email_key] = row.id
+        if row.phone_key:
+            by_phone[row.phone_key] = row.id
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(bookings)
+            .where(bookings.c.id > last_id, bookings.c.customer_id.is_(None))
+            .order_by(bookings.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            email_key, phone_key = _normalize_email(row.email), _normalize_phone(row.phone)
+            customer_id = by_email.get(email_key) if email_key else None
+            if customer_id is None and phone_key:
+                customer_id = by_phone.get(phone_key)
+            # Bookings are visited oldest first, so the profile ends up with the latest details
+            details = {'name': row.name, 'gender': row.gender}
+            if email_key:
+                details['email'] = row.email.strip()
+            if phone_key:
+                details['phone'] = row.phone.strip()
+
+            if customer_id is None:
+                if not email_key and not phone_key:
+                    continue
+                customer_id = bind.execute(
+                    customers.insert().values(
+                        email_key=email_key,
+                        phone_key=phone_key if phone_key not in by_phone else None,
+                        **details
+                    ).returning(customers.c.id)
+                ).scalar()
+            else:
+                bind.execute(customers.update().where(customers.c.id == customer_id).values(**details))
+            if email_key:
+                by_email.setdefault(email_key, customer_id)
+            if phone_key:
+                by_phone.setdefault(phone_key, customer_id)
+
+            bind.execute(bookings.update().where(bookings.c.id == row.id).values(customer_id=customer_id))
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if 'customers' not in inspector.get_table_names():
+        op.create_table(
+            'customers',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email_key', sa.String(), nullable=True),
+            sa.Column('phone_key', sa.String(), nullable=True),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('email', sa.String(), nullable=True),
+            sa.Column('phone', sa.String(), nullable=True),
+            sa.Column('gender', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email_key'),
+            sa.UniqueConstraint('phone_key')
+        )
+        op.create_index('ix_customers_id', 'customers', ['id'], unique=False)
+
+    # A plain ADD COLUMN: batch mode would recreate bookings on SQLite and drop the search triggers
+    columns = {column['name'] for column in inspector.get_columns('bookings')}
+    if 'customer_id' not in columns:
+        op.add_column('bookings', sa.Column('customer_id', sa.Integer(), nullable=True))
+        if bind.dialect.name != 'sqlite':
+            op.create_foreign_key('fk_bookings_customer_id_customers', 'bookings', 'customers', ['customer_id'], ['id'])
+    indexes = {index['name'] for index in inspector.get_indexes('bookings')}
+    if 'ix_bookings_customer_date' not in indexes:
+        op.create_index('ix_bookings_customer_date', 'bookings', ['customer_id', 'date', 'time'], unique=False)
+
+    _backfill(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    op.drop_index('ix_bookings_customer_date', table_name='bookings')
+    if bind.dialect.name != 'sqlite':
+        op.drop_constraint('fk_bookings_customer_id_customers', 'bookings', type_='foreignkey')
+    op.drop_column('bookings', 'customer_id')
+    op.drop_index('ix_customers_id', table_name='customers')
+    op.drop_table('customers')
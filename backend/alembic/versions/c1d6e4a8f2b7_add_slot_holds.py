@@ -0,0 +1,52 @@
+"""Add slot holds
+
+Revision ID: c1d6e4a8f2b7
+Revises: a5f2c8e1d9b4
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d6e4a8f2b7'
+down_revision: Union[str, None] = 'a5f2c8e1d9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'slot_holds' not in tables:
+        op.create_table(
+            'slot_holds',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('contact', sa.String(), nullable=False),
+            sa.Column('hair_artist_id', sa.Integer(), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('time', sa.Time(), nullable=False),
+            sa.Column('end_time', sa.Time(), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['hair_artist_id'], ['hair_artists.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_slot_holds_contact', 'slot_holds', ['contact'], unique=False)
+        op.create_index('ix_slot_holds_expires_at', 'slot_holds', ['expires_at'], unique=False)
+        op.create_index(
+            'ix_slot_holds_artist_date_time', 'slot_holds',
+            ['hair_artist_id', 'date', 'time', 'end_time'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_slot_holds_artist_date_time', table_name='slot_holds')
+    op.drop_index('ix_slot_holds_expires_at', table_name='slot_holds')
+    op.drop_index('ix_slot_holds_contact', table_name='slot_holds')
+    op.drop_table('slot_holds')
@@ -0,0 +1,50 @@
+"""Add booking daily stats
+
+Revision ID: c4b7e1a9d3f6
+Revises: a8d3f5e2c7b1
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b7e1a9d3f6'
+down_revision: Union[str, None] = 'a8d3f5e2c7b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'booking_daily_stats' not in tables:
+        op.create_table(
+            'booking_daily_stats',
+            sa.Column('hair_artist_id', sa.Integer(), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('service_id', sa.Integer(), nullable=False),
+            sa.Column('bookings', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('booked_minutes', sa.Integer(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('hair_artist_id', 'date', 'service_id')
+        )
+        op.create_index('ix_booking_daily_stats_date', 'booking_daily_stats', ['date'], unique=False)
+
+        # Backfill from existing bookings; `python -m app.scripts.booking_stats verify` checks it later
+        op.execute(
+            "INSERT INTO booking_daily_stats (hair_artist_id, date, service_id, bookings, booked_minutes) "
+            "SELECT COALESCE(hair_artist_id, 0), date, COALESCE(service_id, 0), COUNT(id), "
+            "SUM(COALESCE(duration_minutes, 30)) "
+            "FROM bookings WHERE status != 'cancelled' AND date IS NOT NULL "
+            "GROUP BY COALESCE(hair_artist_id, 0), date, COALESCE(service_id, 0)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_daily_stats_date', table_name='booking_daily_stats')
+    op.drop_table('booking_daily_stats')
@@ -0,0 +1,81 @@
+"""Sync baseline schema with the models and add app_metadata
+
+Tables and columns that used to be created by Base.metadata.create_all at
+import time are now created here, so Alembic is the only source of schema.
+Every step is skipped when the object already exists, which keeps this safe
+on databases that were built by create_all (stamp them at f957f392ca77 first).
+
+Revision ID: d2f7a8c1e5b6
+Revises: b5e93f0d4c12
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f7a8c1e5b6'
+down_revision: Union[str, None] = 'b5e93f0d4c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'services' not in tables:
+        op.create_table(
+            'services',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('price', sa.Float(), nullable=True),
+            sa.Column('duration', sa.Integer(), nullable=True),
+            sa.Column('slot_gap_minutes', sa.Integer(), server_default='30'),
+            sa.Column('gender_specificity', sa.String(), server_default='both'),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_services_id', 'services', ['id'], unique=False)
+        op.create_index('ix_services_name', 'services', ['name'], unique=True)
+    elif 'slot_gap_minutes' not in {c['name'] for c in inspector.get_columns('services')}:
+        op.add_column('services', sa.Column('slot_gap_minutes', sa.Integer(), server_default='30'))
+
+    if 'otp' not in tables:
+        op.create_table(
+            'otp',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('contact', sa.String(), nullable=True),
+            sa.Column('code', sa.String(), nullable=True),
+            sa.Column('expires_at', sa.DateTime(), nullable=True),
+            sa.Column('verified', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'gender' not in {c['name'] for c in inspector.get_columns('bookings')}:
+        op.add_column('bookings', sa.Column('gender', sa.String(), nullable=True))
+
+    if 'gender_expertise' not in {c['name'] for c in inspector.get_columns('hair_artists')}:
+        op.add_column('hair_artists', sa.Column('gender_expertise', sa.String(), server_default='both'))
+
+    if 'app_metadata' not in tables:
+        op.create_table(
+            'app_metadata',
+            sa.Column('key', sa.String(), nullable=False),
+            sa.Column('value', sa.String(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.PrimaryKeyConstraint('key')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only app_metadata is new; the other objects predate migrations and are left in place
+    op.drop_table('app_metadata')
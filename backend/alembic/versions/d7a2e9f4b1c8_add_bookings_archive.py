@@ -0,0 +1,64 @@
+"""Add bookings archive
+
+Revision ID: d7a2e9f4b1c8
+Revises: b9c2d4e6f8a1
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2e9f4b1c8'
+down_revision: Union[str, None] = 'b9c2d4e6f8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'bookings_archive' not in tables:
+        op.create_table(
+            'bookings_archive',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('email', sa.String(), nullable=True),
+            sa.Column('phone', sa.String(), nullable=True),
+            sa.Column('date', sa.Date(), nullable=True),
+            sa.Column('time', sa.Time(), nullable=True),
+            sa.Column('service', sa.String(), nullable=True),
+            sa.Column('service_id', sa.Integer(), nullable=True),
+            sa.Column('duration_minutes', sa.Integer(), nullable=True),
+            sa.Column('end_time', sa.Time(), nullable=True),
+            sa.Column('hair_artist_id', sa.Integer(), nullable=True),
+            sa.Column('gender', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('customer_id', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('archived_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_bookings_archive_artist_date', 'bookings_archive',
+                        ['hair_artist_id', 'date', 'time'], unique=False)
+        op.create_index('ix_bookings_archive_customer_date', 'bookings_archive',
+                        ['customer_id', 'date', 'time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived bookings go back to the live table before the archive is dropped
+    op.execute(
+        "INSERT INTO bookings (id, name, email, phone, date, time, service, service_id, duration_minutes, "
+        "end_time, hair_artist_id, gender, status, customer_id, created_at) "
+        "SELECT id, name, email, phone, date, time, service, service_id, duration_minutes, "
+        "end_time, hair_artist_id, gender, status, customer_id, created_at FROM bookings_archive"
+    )
+    op.execute("DELETE FROM app_metadata WHERE key = 'bookings_archived_before'")
+    op.drop_index('ix_bookings_archive_customer_date', table_name='bookings_archive')
+    op.drop_index('ix_bookings_archive_artist_date', table_name='bookings_archive')
+    op.drop_table('bookings_archive')
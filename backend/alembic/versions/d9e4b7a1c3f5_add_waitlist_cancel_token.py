@@ -0,0 +1,33 @@
+"""Add waitlist cancel token
+
+Revision ID: d9e4b7a1c3f5
+Revises: c1d6e4a8f2b7
+Create Date: 2026-10-19 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b7a1c3f5'
+down_revision: Union[str, None] = 'c1d6e4a8f2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    columns = {column['name'] for column in inspector.get_columns('waitlist_entries')}
+    if 'cancel_token' not in columns:
+        op.add_column('waitlist_entries', sa.Column('cancel_token', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('waitlist_entries') as batch_op:
+        batch_op.drop_column('cancel_token')
@@ -0,0 +1,37 @@
+"""Add hair artist calendar token
+
+Revision ID: e3b8c5f1a7d2
+Revises: d7a2e9f4b1c8
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8c5f1a7d2'
+down_revision: Union[str, None] = 'd7a2e9f4b1c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    columns = {column['name'] for column in inspector.get_columns('hair_artists')}
+    if 'calendar_token' not in columns:
+        op.add_column('hair_artists', sa.Column('calendar_token', sa.String(), nullable=True))
+    indexes = {index['name'] for index in inspector.get_indexes('hair_artists')}
+    if 'ix_hair_artists_calendar_token' not in indexes:
+        op.create_index('ix_hair_artists_calendar_token', 'hair_artists', ['calendar_token'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hair_artists_calendar_token', table_name='hair_artists')
+    with op.batch_alter_table('hair_artists') as batch_op:
+        batch_op.drop_column('calendar_token')
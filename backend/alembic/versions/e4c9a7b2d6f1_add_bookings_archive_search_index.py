@@ -0,0 +1,83 @@
+"""Add full-text search index over archived booking contacts
+
+Revision ID: e4c9a7b2d6f1
+Revises: d9e4b7a1c3f5
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c9a7b2d6f1'
+down_revision: Union[str, None] = 'd9e4b7a1c3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_TRIGGERS = {
+    'bookings_archive_fts_insert': (
+        "CREATE TRIGGER bookings_archive_fts_insert AFTER INSERT ON bookings_archive BEGIN "
+        "INSERT INTO bookings_archive_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone); "
+        "END"
+    ),
+    'bookings_archive_fts_delete': (
+        "CREATE TRIGGER bookings_archive_fts_delete AFTER DELETE ON bookings_archive BEGIN "
+        "INSERT INTO bookings_archive_fts(bookings_archive_fts, rowid, name, email, phone) "
+        "VALUES ('delete', old.id, old.name, old.email, old.phone); "
+        "END"
+    ),
+    'bookings_archive_fts_update': (
+        "CREATE TRIGGER bookings_archive_fts_update AFTER UPDATE OF name, email, phone ON bookings_archive BEGIN "
+        "INSERT INTO bookings_archive_fts(bookings_archive_fts, rowid, name, email, phone) "
+        "VALUES ('delete', old.id, old.name, old.email, old.phone); "
+        "INSERT INTO bookings_archive_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone); "
+        "END"
+    ),
+}
+
+POSTGRESQL_INDEXES = {
+    'ix_bookings_archive_name_trgm': "lower(name) gin_trgm_ops",
+    'ix_bookings_archive_email_trgm': "lower(email) gin_trgm_ops",
+    'ix_bookings_archive_phone_trgm': "phone gin_trgm_ops",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, expression in POSTGRESQL_INDEXES.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON bookings_archive USING gin (({expression}))")
+        return
+
+    # Archived bookings leave bookings_fts with their row, so the archive gets its own index
+    tables = sa.inspect(bind).get_table_names()
+    if 'bookings_archive_fts' not in tables:
+        op.execute(
+            "CREATE VIRTUAL TABLE bookings_archive_fts USING fts5("
+            "name, email, phone, content='bookings_archive', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute("INSERT INTO bookings_archive_fts(bookings_archive_fts) VALUES ('rebuild')")
+
+    existing = {row[0] for row in bind.execute(sa.text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    for name, statement in SQLITE_TRIGGERS.items():
+        if name not in existing:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for name in POSTGRESQL_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        return
+
+    for name in SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS bookings_archive_fts")
@@ -0,0 +1,56 @@
+"""Add waitlist entries
+
+Revision ID: e6a1c9d4b2f3
+Revises: d2f7a8c1e5b6
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c9d4b2f3'
+down_revision: Union[str, None] = 'd2f7a8c1e5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'waitlist_entries' not in tables:
+        op.create_table(
+            'waitlist_entries',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('phone', sa.String(), nullable=True),
+            sa.Column('service_id', sa.Integer(), nullable=True),
+            sa.Column('service', sa.String(), nullable=True),
+            sa.Column('duration_minutes', sa.Integer(), nullable=False),
+            sa.Column('hair_artist_id', sa.Integer(), nullable=True),
+            sa.Column('start_date', sa.Date(), nullable=False),
+            sa.Column('end_date', sa.Date(), nullable=False),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('notified_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['service_id'], ['services.id']),
+            sa.ForeignKeyConstraint(['hair_artist_id'], ['hair_artists.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_waitlist_entries_id', 'waitlist_entries', ['id'], unique=False)
+        op.create_index(
+            'ix_waitlist_entries_status_end_date', 'waitlist_entries',
+            ['status', 'end_date'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_waitlist_entries_status_end_date', table_name='waitlist_entries')
+    op.drop_index('ix_waitlist_entries_id', table_name='waitlist_entries')
+    op.drop_table('waitlist_entries')
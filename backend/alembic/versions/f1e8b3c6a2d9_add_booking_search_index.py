@@ -0,0 +1,83 @@
+"""Add full-text search index over booking contacts
+
+Revision ID: f1e8b3c6a2d9
+Revises: c4b7e1a9d3f6
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1e8b3c6a2d9'
+down_revision: Union[str, None] = 'c4b7e1a9d3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_TRIGGERS = {
+    'bookings_fts_insert': (
+        "CREATE TRIGGER bookings_fts_insert AFTER INSERT ON bookings BEGIN "
+        "INSERT INTO bookings_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone); "
+        "END"
+    ),
+    'bookings_fts_delete': (
+        "CREATE TRIGGER bookings_fts_delete AFTER DELETE ON bookings BEGIN "
+        "INSERT INTO bookings_fts(bookings_fts, rowid, name, email, phone) "
+        "VALUES ('delete', old.id, old.name, old.email, old.phone); "
+        "END"
+    ),
+    'bookings_fts_update': (
+        "CREATE TRIGGER bookings_fts_update AFTER UPDATE OF name, email, phone ON bookings BEGIN "
+        "INSERT INTO bookings_fts(bookings_fts, rowid, name, email, phone) "
+        "VALUES ('delete', old.id, old.name, old.email, old.phone); "
+        "INSERT INTO bookings_fts(rowid, name, email, phone) VALUES (new.id, new.name, new.email, new.phone); "
+        "END"
+    ),
+}
+
+POSTGRESQL_INDEXES = {
+    'ix_bookings_name_trgm': "lower(name) gin_trgm_ops",
+    'ix_bookings_email_trgm': "lower(email) gin_trgm_ops",
+    'ix_bookings_phone_trgm': "phone gin_trgm_ops",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, expression in POSTGRESQL_INDEXES.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON bookings USING gin (({expression}))")
+        return
+
+    # External-content FTS5 table: the index only stores trigrams, the text stays in bookings
+    tables = sa.inspect(bind).get_table_names()
+    if 'bookings_fts' not in tables:
+        op.execute(
+            "CREATE VIRTUAL TABLE bookings_fts USING fts5("
+            "name, email, phone, content='bookings', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute("INSERT INTO bookings_fts(bookings_fts) VALUES ('rebuild')")
+
+    existing = {row[0] for row in bind.execute(sa.text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    for name, statement in SQLITE_TRIGGERS.items():
+        if name not in existing:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for name in POSTGRESQL_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        return
+
+    for name in SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS bookings_fts")
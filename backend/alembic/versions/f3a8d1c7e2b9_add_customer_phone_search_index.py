@@ -0,0 +1,75 @@
+"""Add trigram index over customer phone keys
+
+Revision ID: f3a8d1c7e2b9
+Revises: e4c9a7b2d6f1
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d1c7e2b9'
+down_revision: Union[str, None] = 'e4c9a7b2d6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_TRIGGERS = {
+    'customers_phone_fts_insert': (
+        "CREATE TRIGGER customers_phone_fts_insert AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customers_phone_fts(rowid, phone_key) VALUES (new.id, new.phone_key); "
+        "END"
+    ),
+    'customers_phone_fts_delete': (
+        "CREATE TRIGGER customers_phone_fts_delete AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customers_phone_fts(customers_phone_fts, rowid, phone_key) VALUES ('delete', old.id, old.phone_key); "
+        "END"
+    ),
+    'customers_phone_fts_update': (
+        "CREATE TRIGGER customers_phone_fts_update AFTER UPDATE OF phone_key ON customers BEGIN "
+        "INSERT INTO customers_phone_fts(customers_phone_fts, rowid, phone_key) VALUES ('delete', old.id, old.phone_key); "
+        "INSERT INTO customers_phone_fts(rowid, phone_key) VALUES (new.id, new.phone_key); "
+        "END"
+    ),
+}
+
+POSTGRESQL_INDEX = 'ix_customers_phone_key_trgm'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(f"CREATE INDEX IF NOT EXISTS {POSTGRESQL_INDEX} ON customers USING gin (phone_key gin_trgm_ops)")
+        return
+
+    # Phone keys are digits only, so any run of digits a customer typed is a substring of one
+    tables = sa.inspect(bind).get_table_names()
+    if 'customers_phone_fts' not in tables:
+        op.execute(
+            "CREATE VIRTUAL TABLE customers_phone_fts USING fts5("
+            "phone_key, content='customers', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute("INSERT INTO customers_phone_fts(customers_phone_fts) VALUES ('rebuild')")
+
+    existing = {row[0] for row in bind.execute(sa.text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+    for name, statement in SQLITE_TRIGGERS.items():
+        if name not in existing:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f"DROP INDEX IF EXISTS {POSTGRESQL_INDEX}")
+        return
+
+    for name in SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS customers_phone_fts")
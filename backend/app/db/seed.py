@@ -1,82 +1,150 @@
+import hashlib
+import json
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from app.models.database import Service
-from datetime import datetime
+from app.models.database import Service, OpeningHours, AppMetadata, dialect_insert
+from app.utils.cache_versions import cache_versions
+from datetime import datetime, time
+
+SEED_HASH_KEY = "seed_hash"
+
+SEED_SERVICES = [
+    {
+        "name": "Haircut",
+        "description": "Basic haircut service",
+        "duration": 30,
+        "price": 25.00,
+        "gender_specificity": "both"
+    },
+    {
+        "name": "Hair Coloring",
+        "description": "Full hair coloring service",
+        "duration": 120,
+        "price": 80.00,
+        "gender_specificity": "both"
+    },
+    {
+        "name": "Shaving",
+        "description": "Professional shaving service",
+        "duration": 30,
+        "price": 20.00,
+        "gender_specificity": "male"
+    },
+    {
+        "name": "Beard Trim",
+        "description": "Beard trimming and styling",
+        "duration": 20,
+        "price": 15.00,
+        "gender_specificity": "male"
+    },
+    {
+        "name": "Waxing",
+        "description": "Full body waxing service",
+        "duration": 60,
+        "price": 50.00,
+        "gender_specificity": "female"
+    },
+    {
+        "name": "Eyebrows",
+        "description": "Eyebrow shaping and threading",
+        "duration": 30,
+        "price": 25.00,
+        "gender_specificity": "female"
+    },
+    {
+        "name": "Facial",
+        "description": "Basic facial treatment",
+        "duration": 45,
+        "price": 40.00,
+        "gender_specificity": "both"
+    }
+]
+
+# Default weekly pattern: 9:00-17:00, closed on Tuesdays
+SEED_OPENING_WEEKDAYS = [0, 2, 3, 4, 5, 6]
+SEED_OPENING_TIME = time(9, 0)
+SEED_CLOSING_TIME = time(17, 0)
+
+def seed_data_hash() -> str:
+    """Hash of everything the startup seed writes, used to skip reseeding when nothing changed"""
+    payload = {
+        "services": SEED_SERVICES,
+        "opening_hours": {
+            "weekdays": SEED_OPENING_WEEKDAYS,
+            "open": SEED_OPENING_TIME.isoformat(),
+            "close": SEED_CLOSING_TIME.isoformat()
+        }
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
 
 def seed_services(db: Session):
-    services = [
-        {
-            "name": "Haircut",
-            "description": "Basic haircut service",
-            "duration": 30,
-            "price": 25.00,
-            "gender_specificity": "both"
-        },
-        {
-            "name": "Hair Coloring",
-            "description": "Full hair coloring service",
-            "duration": 120,
-            "price": 80.00,
-            "gender_specificity": "both"
-        },
-        {
-            "name": "Shaving",
-            "description": "Professional shaving service",
-            "duration": 30,
-            "price": 20.00,
-            "gender_specificity": "male"
-        },
-        {
-            "name": "Beard Trim",
-            "description": "Beard trimming and styling",
-            "duration": 20,
-            "price": 15.00,
-            "gender_specificity": "male"
-        },
-        {
-            "name": "Waxing",
-            "description": "Full body waxing service",
-            "duration": 60,
-            "price": 50.00,
-            "gender_specificity": "female"
-        },
-        {
-            "name": "Eyebrows",
-            "description": "Eyebrow shaping and threading",
-            "duration": 30,
-            "price": 25.00,
-            "gender_specificity": "female"
+    """Upsert the seed services in a single statement.
+
+    Existing rows are only rewritten (and their updated_at bumped) when a
+    seeded field actually differs, so repeated runs do not cause writes.
+    """
+    insert = dialect_insert(db)
+    now = datetime.now()
+    statement = insert(Service).values([
+        {**service_data, "created_at": now, "updated_at": now}
+        for service_data in SEED_SERVICES
+    ])
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[Service.name],
+        set_={
+            "description": excluded.description,
+            "duration": excluded.duration,
+            "price": excluded.price,
+            "gender_specificity": excluded.gender_specificity,
+            "updated_at": now
         },
-        {
-            "name": "Facial",
-            "description": "Basic facial treatment",
-            "duration": 45,
-            "price": 40.00,
-            "gender_specificity": "both"
-        }
-    ]
-    
-    for service_data in services:
-        # Check if service exists
-        existing_service = db.query(Service).filter(Service.name == service_data["name"]).first()
-        
-        if existing_service:
-            # Update existing service
-            existing_service.description = service_data["description"]
-            existing_service.duration = service_data["duration"]
-            existing_service.price = service_data["price"]
-            existing_service.gender_specificity = service_data["gender_specificity"]
-            existing_service.updated_at = datetime.now()
-        else:
-            # Create new service
-            service = Service(
-                name=service_data["name"],
-                description=service_data["description"],
-                duration=service_data["duration"],
-                price=service_data["price"],
-                gender_specificity=service_data["gender_specificity"],
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
-            db.add(service)
-    
-    db.commit() 
\ No newline at end of file
+        where=or_(
+            Service.description != excluded.description,
+            Service.duration != excluded.duration,
+            Service.price != excluded.price,
+            Service.gender_specificity != excluded.gender_specificity
+        )
+    )
+    db.execute(statement)
+    db.commit()
+
+def seed_business_hours(db: Session) -> bool:
+    """Seed the default weekly pattern if none is configured; returns True if it was inserted"""
+    if db.query(OpeningHours).first():
+        return False
+
+    for weekday in SEED_OPENING_WEEKDAYS:
+        db.add(OpeningHours(weekday=weekday, open_time=SEED_OPENING_TIME, close_time=SEED_CLOSING_TIME))
+
+    db.commit()
+    return True
+
+def seed_if_changed(db: Session) -> bool:
+    """Run the startup seed only when the seed data differs from the last applied version.
+
+    Returns True if seeding ran. The common case costs a single primary-key lookup.
+    """
+    current_hash = seed_data_hash()
+    stored = db.query(AppMetadata).filter(AppMetadata.key == SEED_HASH_KEY).first()
+    if stored and stored.value == current_hash:
+        return False
+
+    seed_services(db)
+    hours_seeded = seed_business_hours(db)
+
+    # Upsert so that workers seeding concurrently do not collide on the key
+    statement = dialect_insert(db)(AppMetadata).values(
+        key=SEED_HASH_KEY, value=current_hash, updated_at=datetime.now()
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[AppMetadata.key],
+        set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at}
+    ))
+    db.commit()
+    # Workers that already built catalog views must pick up the reseeded services
+    cache_versions.publish(db, "catalog")
+    # Likewise for business calendars built while no opening hours were configured
+    if hours_seeded:
+        cache_versions.publish(db, "business_calendar")
+    return True
@@ -1,10 +1,16 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from .routers import booking, services, hair_artists, auth
-from .models.database import get_db
+from fastapi.responses import JSONResponse
+import os
+from .routers import booking, services, hair_artists, auth, business_hours, artist_schedules, waitlist, reports, customers, calendar
+from .models.database import SessionLocal, engine
 from datetime import datetime
-from .db.seed import seed_services
+import time
+from .db.seed import seed_if_changed
+from .utils.health import health_prober
+from .utils.reminders import reminder_scheduler
+from .utils.compression import CompressionMiddleware
+from .utils.tracing import TracingMiddleware, instrument_engine, instrument_routing
 
 app = FastAPI(title="Salon Booking API")
 
@@ -17,37 +23,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated brotli/gzip compression for responses above the size threshold
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")))
+
+# Server-Timing spans for dependencies, DB queries, the endpoint and serialization (see utils/tracing.py)
+app.add_middleware(TracingMiddleware)
+instrument_engine(engine)
+instrument_routing()
+
 # Include routers
 app.include_router(booking.router, prefix="/api", tags=["booking"])
 app.include_router(services.router, prefix="/api", tags=["services"])
 app.include_router(hair_artists.router, prefix="/api", tags=["hair_artists"])
 app.include_router(auth.router, prefix="/api", tags=["auth"])
+app.include_router(business_hours.router, prefix="/api", tags=["business_hours"])
+app.include_router(artist_schedules.router, prefix="/api", tags=["artist_schedules"])
+app.include_router(waitlist.router, prefix="/api", tags=["waitlist"])
+app.include_router(reports.router, prefix="/api", tags=["reports"])
+app.include_router(customers.router, prefix="/api", tags=["customers"])
+app.include_router(calendar.router, prefix="/api", tags=["calendar"])
 
-# Seed the database with initial data
+# Seed the database with initial data (skipped when the seed data has not changed)
 @app.on_event("startup")
 async def startup_event():
-    db = next(get_db())
-    seed_services(db)
-    db.close()
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        seeded = seed_if_changed(db)
+    finally:
+        db.close()
+    duration_ms = (time.perf_counter() - started) * 1000
+    app.state.startup = {"seeded": seeded, "duration_ms": duration_ms}  # Read by tests/test_startup.py
+    print(f"Startup completed in {duration_ms:.1f}ms (seeded: {seeded})")
+    health_prober.start()
+    health_prober.register_queue("reminders", lambda: len(reminder_scheduler))
+    reminder_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await reminder_scheduler.stop()
+    await health_prober.stop()
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Salon Booking API"}
 
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe: answers from memory and never touches the database"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness_check():
+    """Readiness probe: serves the cached result of the background database prober"""
+    report = health_prober.readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
-    try:
-        # Test database connection
-        db.execute("SELECT 1")
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        } 
\ No newline at end of file
+async def health_check():
+    report = health_prober.readiness()
+    database = report.get("database", {})
+    response = {
+        "status": "healthy" if report["ready"] else "unhealthy",
+        "database": database.get("status", "unknown"),
+        "timestamp": datetime.now().isoformat()
+    }
+    if "error" in database:
+        response["error"] = database["error"]
+    return response
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Boolean, ForeignKey, func, Date, Time
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Boolean, ForeignKey, func, Date, Time, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime, timedelta
 import os
 from passlib.context import CryptContext
@@ -16,6 +17,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+def dialect_insert(db: Session):
+    """Return the dialect-specific insert() that supports ON CONFLICT upserts"""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
 class OTP(Base):
     __tablename__ = "otp"
     id = Column(Integer, primary_key=True)
@@ -47,12 +52,207 @@ class Booking(Base):
     phone = Column(String)
     date = Column(Date)
     time = Column(Time)
-    service = Column(String)
+    service = Column(String)  # Service name, kept as a compatible alias of service_id
+    service_id = Column(Integer, ForeignKey("services.id"), index=True)
+    duration_minutes = Column(Integer)  # Snapshot of the service duration at booking time
+    end_time = Column(Time)
     hair_artist_id = Column(Integer, ForeignKey("hair_artists.id"))
     gender = Column(String)  # "male" or "female"
     status = Column(String, default="pending")
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Overlap checks filter on (artist, date) and then range-compare time/end_time.
+    # name/email/phone are also indexed for search by bookings_fts (SQLite FTS5, kept in
+    # sync by triggers) or trigram indexes on PostgreSQL; see utils/booking_search.py
+    __table_args__ = (
+        Index("ix_bookings_artist_date_time", "hair_artist_id", "date", "time", "end_time"),
+        Index("ix_bookings_customer_date", "customer_id", "date", "time"),  # Booking history, newest first
+    )
+
+class BookingArchive(Base):
+    """Bookings moved out of the live table once they are past the archive horizon (see utils/booking_archive.py).
+
+    Rows keep their original id and columns; foreign keys are dropped so that
+    the archive outlives deleted artists and services.
+    """
+    __tablename__ = "bookings_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String)
+    email = Column(String)
+    phone = Column(String)
+    date = Column(Date)
+    time = Column(Time)
+    service = Column(String)
+    service_id = Column(Integer)
+    duration_minutes = Column(Integer)
+    end_time = Column(Time)
+    hair_artist_id = Column(Integer)
+    gender = Column(String)
+    status = Column(String)
+    customer_id = Column(Integer)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_bookings_archive_artist_date", "hair_artist_id", "date", "time"),
+        Index("ix_bookings_archive_customer_date", "customer_id", "date", "time"),
+    )
+
+class Customer(Base):
+    """A customer identified by normalized contact keys (see utils/customers.py)"""
+    __tablename__ = "customers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    email_key = Column(String, unique=True, nullable=True)  # Lowercased, trimmed email
+    phone_key = Column(String, unique=True, nullable=True)  # Digits only, with a leading + if given
+    name = Column(String)
+    email = Column(String)  # Contact details as last entered, for display
+    phone = Column(String)
+    gender = Column(String)  # "male" or "female"
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class OpeningHours(Base):
+    __tablename__ = "opening_hours"
+
+    id = Column(Integer, primary_key=True, index=True)
+    weekday = Column(Integer, nullable=False, index=True)  # 0 = Monday ... 6 = Sunday
+    open_time = Column(Time, nullable=False)
+    close_time = Column(Time, nullable=False)
+    # Optional validity window for seasonal patterns; dated rows override undated ones
+    valid_from = Column(Date, nullable=True)
+    valid_to = Column(Date, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class Closure(Base):
+    __tablename__ = "closures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    start_date = Column(Date, nullable=False, index=True)
+    end_date = Column(Date, nullable=False, index=True)  # Inclusive
+    reason = Column(String)  # e.g. "Public holiday"
+    created_at = Column(DateTime, default=func.now())
+
+class ArtistShift(Base):
+    __tablename__ = "artist_shifts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    hair_artist_id = Column(Integer, ForeignKey("hair_artists.id"), nullable=False, index=True)
+    weekday = Column(Integer, nullable=False)  # 0 = Monday ... 6 = Sunday
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    # Optional validity window; dated rows override undated ones for that day
+    valid_from = Column(Date, nullable=True)
+    valid_to = Column(Date, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+
+class ArtistBreak(Base):
+    __tablename__ = "artist_breaks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    hair_artist_id = Column(Integer, ForeignKey("hair_artists.id"), nullable=False, index=True)
+    weekday = Column(Integer, nullable=True)  # None applies the break to every day
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+
+class ArtistTimeOff(Base):
+    __tablename__ = "artist_time_off"
+
+    id = Column(Integer, primary_key=True, index=True)
+    hair_artist_id = Column(Integer, ForeignKey("hair_artists.id"), nullable=False)
+    start = Column(DateTime, nullable=False)
+    end = Column(DateTime, nullable=False)
+    reason = Column(String)  # e.g. "Vacation"
+    created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_artist_time_off_artist_range", "hair_artist_id", "start", "end"),
+    )
+
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    phone = Column(String)
+    service_id = Column(Integer, ForeignKey("services.id"))
+    service = Column(String)  # Service name, kept as a compatible alias of service_id
+    duration_minutes = Column(Integer, nullable=False)
+    hair_artist_id = Column(Integer, ForeignKey("hair_artists.id"), nullable=True)  # None means any artist
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)  # Inclusive
+    status = Column(String, default="waiting")  # "waiting", "notified" or "cancelled"
+    notified_at = Column(DateTime, nullable=True)
+    cancel_token = Column(String, nullable=True)  # Secret returned on joining, required to leave
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_waitlist_entries_status_end_date", "status", "end_date"),
+    )
+
+class SlotHold(Base):
+    """A slot kept for a customer between send-otp and verify-otp (see utils/slot_holds.py)"""
+    __tablename__ = "slot_holds"
+
+    id = Column(Integer, primary_key=True)
+    contact = Column(String, nullable=False, index=True)  # One hold per contact
+    hair_artist_id = Column(Integer, ForeignKey("hair_artists.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # UTC, like OTP.expires_at
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_slot_holds_artist_date_time", "hair_artist_id", "date", "time", "end_time"),
+    )
+
+class BookingReminder(Base):
+    """Reminders already handled per booking, so restarts and other workers do not send them again (see utils/reminders.py)"""
+    __tablename__ = "booking_reminders"
+
+    booking_id = Column(Integer, primary_key=True)  # No foreign key: bookings are moved to the archive
+    kind = Column(String, primary_key=True)  # "24h" or "2h"
+    status = Column(String, nullable=False)  # "sent", "failed" or "skipped"
+    created_at = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_booking_reminders_created_at", "created_at"),
+    )
+
+class AppMetadata(Base):
+    __tablename__ = "app_metadata"
+
+    key = Column(String, primary_key=True)
+    value = Column(String)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class BookingDailyStats(Base):
+    """Active (non-cancelled) bookings per artist, day and service, maintained with every booking write"""
+    __tablename__ = "booking_daily_stats"
+
+    hair_artist_id = Column(Integer, primary_key=True)  # 0 for legacy bookings without an artist
+    date = Column(Date, primary_key=True)
+    service_id = Column(Integer, primary_key=True)  # 0 for legacy bookings without a service id
+    bookings = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_booking_daily_stats_date", "date"),
+    )
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+
+    namespace = Column(String, primary_key=True)  # e.g. "business_calendar" or "artist_schedules:3"
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
 class HairArtist(Base):
     __tablename__ = "hair_artists"
 
@@ -62,6 +262,7 @@ class HairArtist(Base):
     hashed_password = Column(String)
     is_admin = Column(Boolean, default=False)
     gender_expertise = Column(String, default="both")  # "male", "female", or "both"
+    calendar_token = Column(String, unique=True, index=True, nullable=True)  # Secret in the .ics feed URL
     created_at = Column(DateTime, default=func.now())
 
     def verify_password(self, password: str):
@@ -70,8 +271,7 @@ class HairArtist(Base):
     def get_password_hash(self, password: str):
         return pwd_context.hash(password)
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic migrations only (`alembic upgrade head`)
 
 # Dependency
 def get_db():
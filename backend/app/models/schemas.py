@@ -1,25 +1,39 @@
 from pydantic import BaseModel, EmailStr
-from datetime import datetime
+from datetime import datetime, date, time
 from typing import List, Optional
 
 class BookingRequest(BaseModel):
-    name: str
+    name: Optional[str] = None  # Returning customers may omit name and gender
     contact: str
     service: str
     date: str
     time: str
     hair_artist_id: int
-    gender: str  # "male" or "female"
+    gender: Optional[str] = None  # "male" or "female"
 
 class OTPRequest(BaseModel):
     contact: str
     code: str
-    name: str
-    service: str
+    name: Optional[str] = None  # Defaults to the returning customer's profile
+    service: Optional[str] = None  # Service name, accepted as an alias of service_id
+    service_id: Optional[int] = None
     date: str
     time: str
     hair_artist_id: int
-    gender: str  # "male" or "female"
+    gender: Optional[str] = None  # "male" or "female"; defaults to the customer's profile
+
+class ContactOTPRequest(BaseModel):
+    contact: str  # Email or phone the code is sent to, for cancellations, reschedules and booking history
+
+class BookingCancel(BaseModel):
+    # Customers prove ownership with an OTP sent to the booking email or phone; staff use a bearer token instead
+    contact: Optional[str] = None
+    code: Optional[str] = None
+
+class BookingReschedule(BookingCancel):
+    date: str
+    time: str
+    hair_artist_id: Optional[int] = None  # Defaults to the booking's current artist
 
 class ServiceBase(BaseModel):
     name: str
@@ -53,21 +67,45 @@ class BookingResponse(BaseModel):
     date: str
     time: str
     service: str
+    service_id: Optional[int] = None
+    duration_minutes: Optional[int] = None
+    end_time: Optional[str] = None
     hair_artist_id: int
     status: str
 
     class Config:
         from_attributes = True
 
+class BookingSearchResults(BaseModel):
+    results: List[BookingResponse]
+    page: int
+    page_size: int
+    has_more: bool
+
 class BookingCreate(BaseModel):
     name: str
     email: str
     phone: str
     date: str
     time: str
-    service: str
+    service: Optional[str] = None  # Service name, accepted as an alias of service_id
+    service_id: Optional[int] = None
+    hair_artist_id: int
+    gender: str  # "male" or "female"
+
+class BasketItem(BaseModel):
+    service_id: Optional[int] = None
+    service: Optional[str] = None  # Service name, accepted as an alias of service_id
     hair_artist_id: int
+
+class BasketBookingCreate(BaseModel):
+    name: str
+    email: str
+    phone: str
+    date: str
+    time: str  # Start of the first service; later services follow back-to-back
     gender: str  # "male" or "female"
+    items: List[BasketItem]
 
 class Booking(BaseModel):
     id: int
@@ -101,6 +139,15 @@ class HairArtist(BaseModel):
     class Config:
         from_attributes = True
 
+class PublicHairArtist(BaseModel):
+    """The part of a hair artist's profile shown to customers"""
+    id: int
+    name: str
+    gender_expertise: str = "both"
+
+    class Config:
+        from_attributes = True
+
 class HairArtistCreate(BaseModel):
     name: str
     email: EmailStr
@@ -118,4 +165,206 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
-    is_admin: Optional[bool] = None 
\ No newline at end of file
+    is_admin: Optional[bool] = None 
+
+class OpeningHoursBase(BaseModel):
+    weekday: int  # 0 = Monday ... 6 = Sunday
+    open_time: time
+    close_time: time
+    valid_from: Optional[date] = None
+    valid_to: Optional[date] = None
+
+class OpeningHoursCreate(OpeningHoursBase):
+    pass
+
+class OpeningHours(OpeningHoursBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class ClosureBase(BaseModel):
+    start_date: date
+    end_date: date
+    reason: Optional[str] = None
+
+class ClosureCreate(ClosureBase):
+    pass
+
+class Closure(ClosureBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class CalendarDay(BaseModel):
+    date: date
+    open: bool
+    intervals: List[List[str]]  # [["09:00", "17:00"], ...]
+
+class ArtistShiftBase(BaseModel):
+    weekday: int  # 0 = Monday ... 6 = Sunday
+    start_time: time
+    end_time: time
+    valid_from: Optional[date] = None
+    valid_to: Optional[date] = None
+
+class ArtistShiftCreate(ArtistShiftBase):
+    pass
+
+class ArtistShift(ArtistShiftBase):
+    id: int
+    hair_artist_id: int
+
+    class Config:
+        from_attributes = True
+
+class ArtistBreakBase(BaseModel):
+    weekday: Optional[int] = None  # None applies the break to every day
+    start_time: time
+    end_time: time
+
+class ArtistBreakCreate(ArtistBreakBase):
+    pass
+
+class ArtistBreak(ArtistBreakBase):
+    id: int
+    hair_artist_id: int
+
+    class Config:
+        from_attributes = True
+
+class ArtistTimeOffBase(BaseModel):
+    start: datetime
+    end: datetime
+    reason: Optional[str] = None
+
+class ArtistTimeOffCreate(ArtistTimeOffBase):
+    pass
+
+class ArtistTimeOff(ArtistTimeOffBase):
+    id: int
+    hair_artist_id: int
+
+    class Config:
+        from_attributes = True
+
+class WaitlistBase(BaseModel):
+    name: str
+    email: EmailStr
+    phone: Optional[str] = None
+    service: Optional[str] = None  # Legacy alias; service_id takes precedence
+    service_id: Optional[int] = None
+    hair_artist_id: Optional[int] = None  # None accepts any hair artist
+    start_date: date
+    end_date: date
+
+class WaitlistCreate(WaitlistBase):
+    pass
+
+class WaitlistEntry(WaitlistBase):
+    id: int
+    duration_minutes: int
+    status: str
+    notified_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class WaitlistJoined(WaitlistEntry):
+    cancel_token: str  # Only returned here; needed to leave the waitlist
+
+class BookingStatsDay(BaseModel):
+    date: date
+    bookings: int
+    booked_minutes: int
+    available_minutes: int
+    utilization: Optional[float] = None  # booked / available; None when nobody was working
+    revenue: float
+
+class BookingStatsService(BaseModel):
+    service_id: Optional[int] = None
+    service: Optional[str] = None
+    bookings: int
+    booked_minutes: int
+    revenue: float
+
+class BookingStats(BaseModel):
+    start_date: date
+    end_date: date
+    hair_artist_id: Optional[int] = None  # None covers every hair artist
+    bookings: int
+    booked_minutes: int
+    available_minutes: int
+    utilization: Optional[float] = None
+    revenue: float
+    days: List[BookingStatsDay]
+    services: List[BookingStatsService]
+
+class Customer(BaseModel):
+    id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    gender: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class CustomerHistoryRequest(BaseModel):
+    contact: str
+    code: str
+
+class CustomerHistory(BaseModel):
+    customer: Customer
+    bookings: List[BookingResponse]
+    page: int
+    page_size: int
+    has_more: bool
+
+class CompatibleService(BaseModel):
+    id: int
+    name: str
+    duration: int
+    price: float
+    slot_gap_minutes: int = 30
+    hair_artist_ids: List[int]  # Artists whose expertise matches this service
+
+class CompatibleArtist(BaseModel):
+    id: int
+    name: str
+
+class CompatibleCatalog(BaseModel):
+    gender: Optional[str] = None  # None pairs services and artists that share any gender
+    services: List[CompatibleService]
+    hair_artists: List[CompatibleArtist]
+
+class AvailabilityHeatmapArtist(BaseModel):
+    hair_artist_id: int
+    slots: List[int]  # Bookable slots per day of the month
+
+class AvailabilityHeatmap(BaseModel):
+    month: str  # YYYY-MM
+    service_id: Optional[int] = None
+    duration: int
+    slot_gap_minutes: int
+    days: List[date]
+    salon: List[int]  # Bookable slots per day summed over the listed artists
+    hair_artists: List[AvailabilityHeatmapArtist]
+
+class BootstrapSlot(BaseModel):
+    hair_artist_id: int
+    date: date
+    time: str  # HH:MM
+
+class BookingBootstrap(BaseModel):
+    gender: Optional[str] = None
+    services: List[Service]
+    hair_artists: List[PublicHairArtist]
+    default_service_id: Optional[int] = None  # Service the slots are for
+    slots: List[BootstrapSlot]  # Next available slots for the default service, earliest first
+
+class CalendarFeedToken(BaseModel):
+    token: str
+    url: str  # Subscription URL for calendar apps, relative to the API host
@@ -0,0 +1,153 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from ..models.database import get_db, HairArtist, ArtistShift, ArtistBreak, ArtistTimeOff
+from ..models.schemas import (
+    ArtistShift as ArtistShiftSchema,
+    ArtistShiftCreate,
+    ArtistBreak as ArtistBreakSchema,
+    ArtistBreakCreate,
+    ArtistTimeOff as ArtistTimeOffSchema,
+    ArtistTimeOffCreate
+)
+from ..routers.auth import get_current_hair_artist
+from ..utils.cache_versions import cache_versions
+
+router = APIRouter(prefix="/hair-artists/{hair_artist_id}")
+
+def get_schedule_owner(
+    hair_artist_id: int,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_current_hair_artist)
+):
+    """Allow artists to manage their own schedule and admins to manage anyone's"""
+    if not current_hair_artist.is_admin and current_hair_artist.id != hair_artist_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    hair_artist = db.query(HairArtist).filter(HairArtist.id == hair_artist_id).first()
+    if not hair_artist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hair artist not found"
+        )
+    return hair_artist
+
+def validate_weekday(weekday):
+    if weekday is not None and not 0 <= weekday <= 6:
+        raise HTTPException(status_code=400, detail="weekday must be between 0 (Monday) and 6 (Sunday)")
+
+def get_owned_entry(db: Session, model, entry_id: int, hair_artist_id: int, label: str):
+    entry = db.query(model).filter(model.id == entry_id, model.hair_artist_id == hair_artist_id).first()
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{label} not found"
+        )
+    return entry
+
+@router.get("/shifts", response_model=List[ArtistShiftSchema])
+def list_shifts(hair_artist: HairArtist = Depends(get_schedule_owner), db: Session = Depends(get_db)):
+    return db.query(ArtistShift).filter(
+        ArtistShift.hair_artist_id == hair_artist.id
+    ).order_by(ArtistShift.weekday, ArtistShift.start_time).all()
+
+@router.post("/shifts", response_model=ArtistShiftSchema)
+def create_shift(
+    shift: ArtistShiftCreate,
+    hair_artist: HairArtist = Depends(get_schedule_owner),
+    db: Session = Depends(get_db)
+):
+    validate_weekday(shift.weekday)
+    if shift.start_time >= shift.end_time:
+        raise HTTPException(status_code=400, detail="start_time must be before end_time")
+
+    db_shift = ArtistShift(hair_artist_id=hair_artist.id, **shift.dict())
+    db.add(db_shift)
+    db.commit()
+    db.refresh(db_shift)
+    cache_versions.publish(db, "artist_schedules", hair_artist.id)
+    return db_shift
+
+@router.delete("/shifts/{shift_id}")
+def delete_shift(
+    shift_id: int,
+    hair_artist: HairArtist = Depends(get_schedule_owner),
+    db: Session = Depends(get_db)
+):
+    db_shift = get_owned_entry(db, ArtistShift, shift_id, hair_artist.id, "Shift")
+    db.delete(db_shift)
+    db.commit()
+    cache_versions.publish(db, "artist_schedules", hair_artist.id)
+    return {"message": "Shift deleted successfully"}
+
+@router.get("/breaks", response_model=List[ArtistBreakSchema])
+def list_breaks(hair_artist: HairArtist = Depends(get_schedule_owner), db: Session = Depends(get_db)):
+    return db.query(ArtistBreak).filter(
+        ArtistBreak.hair_artist_id == hair_artist.id
+    ).order_by(ArtistBreak.start_time).all()
+
+@router.post("/breaks", response_model=ArtistBreakSchema)
+def create_break(
+    artist_break: ArtistBreakCreate,
+    hair_artist: HairArtist = Depends(get_schedule_owner),
+    db: Session = Depends(get_db)
+):
+    validate_weekday(artist_break.weekday)
+    if artist_break.start_time >= artist_break.end_time:
+        raise HTTPException(status_code=400, detail="start_time must be before end_time")
+
+    db_break = ArtistBreak(hair_artist_id=hair_artist.id, **artist_break.dict())
+    db.add(db_break)
+    db.commit()
+    db.refresh(db_break)
+    cache_versions.publish(db, "artist_schedules", hair_artist.id)
+    return db_break
+
+@router.delete("/breaks/{break_id}")
+def delete_break(
+    break_id: int,
+    hair_artist: HairArtist = Depends(get_schedule_owner),
+    db: Session = Depends(get_db)
+):
+    db_break = get_owned_entry(db, ArtistBreak, break_id, hair_artist.id, "Break")
+    db.delete(db_break)
+    db.commit()
+    cache_versions.publish(db, "artist_schedules", hair_artist.id)
+    return {"message": "Break deleted successfully"}
+
+@router.get("/time-off", response_model=List[ArtistTimeOffSchema])
+def list_time_off(hair_artist: HairArtist = Depends(get_schedule_owner), db: Session = Depends(get_db)):
+    return db.query(ArtistTimeOff).filter(
+        ArtistTimeOff.hair_artist_id == hair_artist.id
+    ).order_by(ArtistTimeOff.start).all()
+
+@router.post("/time-off", response_model=ArtistTimeOffSchema)
+def create_time_off(
+    time_off: ArtistTimeOffCreate,
+    hair_artist: HairArtist = Depends(get_schedule_owner),
+    db: Session = Depends(get_db)
+):
+    if time_off.start >= time_off.end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    db_time_off = ArtistTimeOff(hair_artist_id=hair_artist.id, **time_off.dict())
+    db.add(db_time_off)
+    db.commit()
+    db.refresh(db_time_off)
+    cache_versions.publish(db, "artist_schedules", hair_artist.id)
+    return db_time_off
+
+@router.delete("/time-off/{time_off_id}")
+def delete_time_off(
+    time_off_id: int,
+    hair_artist: HairArtist = Depends(get_schedule_owner),
+    db: Session = Depends(get_db)
+):
+    db_time_off = get_owned_entry(db, ArtistTimeOff, time_off_id, hair_artist.id, "Time off")
+    db.delete(db_time_off)
+    db.commit()
+    cache_versions.publish(db, "artist_schedules", hair_artist.id)
+    return {"message": "Time off deleted successfully"}
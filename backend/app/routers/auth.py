@@ -8,6 +8,9 @@ from passlib.context import CryptContext
 
 from ..models.database import get_db, HairArtist
 from ..models.schemas import Token, TokenData, HairArtistCreate, HairArtist as HairArtistSchema
+from ..utils.rate_limit import login_rate_limit
+from ..utils.cache_versions import cache_versions
+from ..utils.tracing import span
 
 router = APIRouter()
 
@@ -17,6 +20,7 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str):
@@ -38,20 +42,27 @@ async def get_current_hair_artist(token: str = Depends(oauth2_scheme), db: Sessi
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    with span("auth"):
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+            token_data = TokenData(email=email)
+        except JWTError:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-    hair_artist = db.query(HairArtist).filter(HairArtist.email == token_data.email).first()
-    if hair_artist is None:
-        raise credentials_exception
-    return hair_artist
+        hair_artist = db.query(HairArtist).filter(HairArtist.email == token_data.email).first()
+        if hair_artist is None:
+            raise credentials_exception
+        return hair_artist
+
+async def get_optional_hair_artist(token: Optional[str] = Depends(optional_oauth2_scheme), db: Session = Depends(get_db)):
+    """Like get_current_hair_artist, but returns None when no bearer token is sent"""
+    if not token:
+        return None
+    return await get_current_hair_artist(token, db)
 
-@router.post("/token", response_model=Token)
+@router.post("/token", response_model=Token, dependencies=[Depends(login_rate_limit)])
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     hair_artist = db.query(HairArtist).filter(HairArtist.email == form_data.username).first()
     if not hair_artist or not hair_artist.verify_password(form_data.password):
@@ -78,11 +89,13 @@ def create_hair_artist(hair_artist: HairArtistCreate, db: Session = Depends(get_
         name=hair_artist.name,
         email=hair_artist.email,
         hashed_password=hashed_password,
-        is_admin=hair_artist.is_admin
+        is_admin=hair_artist.is_admin,
+        gender_expertise=hair_artist.gender_expertise
     )
     db.add(db_hair_artist)
     db.commit()
     db.refresh(db_hair_artist)
+    cache_versions.publish(db, "catalog")
     return db_hair_artist
 
 @router.get("/hair-artists/me", response_model=HairArtistSchema)
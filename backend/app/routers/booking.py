@@ -1,51 +1,212 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta, date, time
-from ..models.database import get_db, Booking, Service, HairArtist
+from ..models.database import get_db, Booking, Service, HairArtist, SlotHold, OTP
 from ..models.schemas import (
     BookingRequest,
     OTPRequest,
+    ContactOTPRequest,
     Service as ServiceSchema,
     TimeSlot,
     BookingResponse,
-    BookingCreate
+    BookingCreate,
+    BasketBookingCreate,
+    BookingCancel,
+    BookingReschedule,
+    BookingSearchResults,
+    AvailabilityHeatmap,
+    BookingBootstrap
 )
-from ..utils.otp import create_otp_record, verify_otp
+from ..utils.otp import create_otp_record, find_valid_otp, consume_otp
+from ..utils.availability import (
+    DEFAULT_DURATION_MINUTES,
+    MINUTES_PER_DAY,
+    resolve_service,
+    booking_end_time,
+    find_conflicting_booking,
+    to_minutes,
+    from_minutes,
+    subtract_intervals,
+    intersect_intervals,
+    start_ranges,
+    generate_slots,
+    earliest_start_minutes
+)
+from ..utils.business_calendar import business_calendar
+from ..utils.artist_schedule import artist_schedules, get_free_intervals
+from ..utils.rate_limit import send_otp_rate_limit, verify_otp_rate_limit, booking_change_rate_limit
+from ..utils.idempotency import idempotency_store
+from ..utils.booking_events import booking_events, bump_booking_versions
+from ..utils.slot_holds import slot_holds, get_unavailable_intervals
+from ..utils.booking_stats import record_booking
+from ..utils.booking_archive import booking_tables
+from ..utils.customers import find_customer, get_or_create_customer, split_contact, contact_keys
+from ..utils.fields import parse_fields, project_query, project_rows
+from ..utils.booking_search import search_bookings, MIN_QUERY_LENGTH, MAX_PAGE_SIZE
+from ..utils.waitlist import waitlist_index, match_freed_interval, notify_waitlist_matches
+from ..utils.heatmap import count_bookable_slots, month_days
+from ..utils.tracing import span
+from ..utils.catalog import catalog_views, parse_gender
+from ..utils.bootstrap import bootstrap_cache
+from ..utils.compression import etag_matches
 from ..utils.email import send_otp_email
-from ..routers.auth import get_current_hair_artist
+from ..routers.auth import get_current_hair_artist, get_optional_hair_artist
 
 router = APIRouter(prefix="/booking")
 
+# Formatting applied to projected booking columns, matching serialize_booking
+BOOKING_FIELD_FORMATTERS = {
+    'date': lambda value: value.strftime("%Y-%m-%d"),
+    'time': lambda value: value.strftime("%H:%M"),
+    'end_time': lambda value: value.strftime("%H:%M")
+}
+
+def serialize_booking(booking: Booking) -> dict:
+    """Convert a Booking row into a BookingResponse-compatible dict with string date/time values"""
+    return {
+        **{key: value for key, value in booking.__dict__.items() if not key.startswith('_')},
+        'date': booking.date.strftime("%Y-%m-%d"),
+        'time': booking.time.strftime("%H:%M"),
+        'end_time': booking.end_time.strftime("%H:%M") if booking.end_time else None
+    }
+
 @router.get("/services", response_model=List[ServiceSchema])
 async def get_services(db: Session = Depends(get_db)):
     services = db.query(Service).all()
     return services
 
-@router.post("/send-otp")
+@router.get("/bootstrap", response_model=BookingBootstrap)
+def get_booking_bootstrap(
+    gender: Optional[str] = None,
+    service_id: Optional[int] = None,
+    slots: int = Query(10, ge=1, le=50),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Everything the booking wizard shows first: services, hair artists and the next available slots.
+
+    Services and artists come from the catalog views (filtered by `gender`
+    when given); the slots are for `service_id`, or the first service some
+    artist can perform, across all artists who can perform it. The payload
+    is cached already serialized and carries an ETag covering all three
+    parts, so a client that sends If-None-Match gets 304 until something
+    changes (or, for the slots, for at most a minute).
+    """
+    gender = parse_gender(gender)
+    view = catalog_views.get(db, gender)
+    offered = [service["id"] for service in view.compatible["services"]]
+    if service_id is None:
+        service_id = offered[0] if offered else None
+    elif service_id not in offered:
+        raise HTTPException(status_code=400, detail="Service not found or not offered for this gender")
+    
+    etag = bootstrap_cache.etag(db, gender, service_id, slots)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    body = bootstrap_cache.get(gender, service_id, slots, etag)
+    if body is None:
+        with span("slots"):
+            body = bootstrap_cache.build(db, view, gender, service_id, slots, etag)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.post("/send-otp", dependencies=[Depends(send_otp_rate_limit)])
 async def send_otp(booking: BookingRequest, db: Session = Depends(get_db)):
+    # Hold the chosen slot while the customer enters the code, so it cannot be taken at the last step
+    hold = place_slot_hold(db, booking)
+    
     # Create OTP record
     otp_record = create_otp_record(db, booking.contact)
     
     # Skip email verification for testing
     print(f"OTP for {booking.contact}: {otp_record.code}")
     
+    return {
+        "message": "OTP sent successfully",
+        "otp_id": otp_record.id,
+        "hold_expires_at": hold.expires_at.isoformat() + "Z" if hold else None
+    }
+
+@router.post("/send-contact-otp", dependencies=[Depends(send_otp_rate_limit)])
+async def send_contact_otp(request: ContactOTPRequest, db: Session = Depends(get_db)):
+    """Send an OTP for cancelling or rescheduling a booking or reading the booking history; no slot is held"""
+    otp_record = create_otp_record(db, request.contact)
+    
+    # Skip email verification for testing
+    print(f"OTP for {request.contact}: {otp_record.code}")
+    
     return {"message": "OTP sent successfully", "otp_id": otp_record.id}
 
-@router.post("/verify-otp")
-async def verify_otp_endpoint(otp_request: OTPRequest, db: Session = Depends(get_db)):
+def place_slot_hold(db: Session, booking: BookingRequest) -> Optional[SlotHold]:
+    """Hold the requested slot for the contact; None when it could not be booked now (verify-otp will then refuse it).
+
+    Only a real booking request is held: a known service at an upcoming time
+    when the salon is open and the artist is working, not booked or held by
+    someone else.
+    """
+    try:
+        booking_date = datetime.strptime(booking.date, "%Y-%m-%d").date()
+        booking_time = datetime.strptime(booking.time, "%H:%M").time()
+        service = resolve_service(db, None, booking.service)
+        if not service or datetime.combine(booking_date, booking_time) < datetime.now():
+            print(f"Not holding {booking_date} {booking_time} for {booking.contact}: unknown service or past time")
+            return None
+        end_time = booking_end_time(booking_time, service.duration)
+        if not business_calendar.is_open(db, booking_date, booking_time, end_time) or \
+                not artist_schedules.is_working(db, booking.hair_artist_id, booking_date,
+                                                to_minutes(booking_time), to_minutes(booking_time) + service.duration):
+            print(f"Not holding {booking_date} {booking_time} for hair artist {booking.hair_artist_id}: not working")
+            return None
+        if find_conflicting_booking(db, booking.hair_artist_id, booking_date, booking_time, end_time):
+            print(f"Not holding {booking_date} {booking_time} for hair artist {booking.hair_artist_id}: slot taken")
+            return None
+        hold = slot_holds.place(db, booking.contact, booking.hair_artist_id, booking_date, booking_time, end_time)
+        if hold is None:
+            print(f"Not holding {booking_date} {booking_time} for hair artist {booking.hair_artist_id}: slot held")
+        return hold
+    except Exception as e:
+        db.rollback()
+        print(f"Error placing slot hold for {booking.contact}: {str(e)}")
+        return None
+
+@router.post("/verify-otp", dependencies=[Depends(verify_otp_rate_limit)])
+async def verify_otp_endpoint(
+    otp_request: OTPRequest,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    # A retried request with the same Idempotency-Key replays the recorded response
+    return await idempotency_store.run(
+        "verify-otp", idempotency_key, otp_request,
+        lambda: verify_otp_and_book(otp_request, db)
+    )
+
+async def verify_otp_and_book(otp_request: OTPRequest, db: Session):
     try:
-        # First verify the OTP
+        # First verify the OTP; it is only used up with the booking, so a request
+        # rejected below (e.g. a new customer who left out their name) can be retried
         print(f"Verifying OTP for contact: {otp_request.contact}, code: {otp_request.code}")
-        if not verify_otp(db, otp_request.contact, otp_request.code):
+        otp_record = find_valid_otp(db, otp_request.contact, otp_request.code)
+        if not otp_record:
             raise HTTPException(status_code=400, detail="Invalid or expired OTP")
         
+        # Returning customers may leave out the details already on their profile
+        customer = find_customer(db, *split_contact(otp_request.contact))
+        returning_customer = customer is not None
+        name = otp_request.name or (customer.name if customer else None)
+        gender = otp_request.gender or (customer.gender if customer else None)
+        
         # Validate that all required fields are present and not empty
         required_fields = {
             'date': otp_request.date,
             'time': otp_request.time,
-            'name': otp_request.name,
-            'service': otp_request.service,
+            'name': name,
+            'service': otp_request.service or otp_request.service_id,
             'hair_artist_id': otp_request.hair_artist_id
         }
         
@@ -72,35 +233,61 @@ async def verify_otp_endpoint(otp_request: OTPRequest, db: Session = Depends(get
                 detail=f"Invalid date or time format: {str(e)}. Use YYYY-MM-DD for date and HH:MM for time."
             )
         
+        # Resolve the service so the booking carries its own duration snapshot
+        service = resolve_service(db, otp_request.service_id, otp_request.service)
+        if otp_request.service_id and not service:
+            raise HTTPException(status_code=400, detail="Service not found")
+        duration = service.duration if service else DEFAULT_DURATION_MINUTES
+        end_time = booking_end_time(booking_time, duration)
+        
+        if not business_calendar.is_open(db, booking_date, booking_time, end_time):
+            raise HTTPException(status_code=400, detail="The salon is closed at the requested time")
+        if not artist_schedules.is_working(db, otp_request.hair_artist_id, booking_date,
+                                           to_minutes(booking_time), to_minutes(booking_time) + duration):
+            raise HTTPException(status_code=400, detail="The hair artist is not available at the requested time")
+        
         # Check if the slot is still available
-        print(f"Checking slot availability for date: {booking_date}, time: {booking_time}, hair_artist_id: {otp_request.hair_artist_id}")
-        existing_booking = db.query(Booking).filter(
-            Booking.date == booking_date,
-            Booking.time == booking_time,
-            Booking.hair_artist_id == otp_request.hair_artist_id
-        ).first()
+        print(f"Checking slot availability for date: {booking_date}, time: {booking_time}-{end_time}, hair_artist_id: {otp_request.hair_artist_id}")
+        existing_booking = find_conflicting_booking(
+            db, otp_request.hair_artist_id, booking_date, booking_time, end_time
+        )
         
-        if existing_booking:
+        # The customer's own hold (placed by send-otp) does not block them; anyone else's does
+        if existing_booking or slot_holds.find_conflicting_hold(
+            db, otp_request.hair_artist_id, booking_date, booking_time, end_time, [otp_request.contact]
+        ):
             raise HTTPException(status_code=400, detail="This time slot is no longer available")
         
         # Create the booking
-        print(f"Creating booking for {otp_request.name}")
+        print(f"Creating booking for {name}")
+        customer = get_or_create_customer(db, name, *split_contact(otp_request.contact), gender)
         booking = Booking(
-            name=otp_request.name,
+            name=name,
             email=otp_request.contact,
             phone="",
-            service=otp_request.service,
+            service=service.name if service else otp_request.service,
+            service_id=service.id if service else None,
+            duration_minutes=duration,
+            end_time=end_time,
             date=booking_date,
             time=booking_time,
             status="confirmed",
             hair_artist_id=otp_request.hair_artist_id,
-            gender=otp_request.gender
+            gender=gender,
+            customer_id=customer.id if customer else None
         )
         db.add(booking)
+        record_booking(db, booking)
+        bump_booking_versions(db, [(booking.hair_artist_id, booking.date)])
+        if not consume_otp(db, otp_record):
+            raise HTTPException(status_code=400, detail="Invalid or expired OTP")
         db.commit()
         db.refresh(booking)
+        # The hold has become the booking
+        slot_holds.release(db, otp_request.contact)
+        booking_events.publish("created", [booking.id], [(booking.hair_artist_id, booking.date)])
         
-        return {"message": "OTP verified successfully", "booking_id": booking.id}
+        return {"message": "OTP verified successfully", "booking_id": booking.id, "returning_customer": returning_customer}
     except HTTPException as http_exc:
         # Re-raise HTTP exceptions directly
         db.rollback()
@@ -127,9 +314,10 @@ async def get_available_slots(
         booking_date = datetime.strptime(date, "%Y-%m-%d").date()
         current_time = datetime.now()
         
-        # Check if the date is a Tuesday (salon closed)
-        if booking_date.weekday() == 1:  # 1 is Tuesday
-            print("Tuesday is a day off - no slots available")
+        # Look up the artist's compiled working intervals (opening hours, shifts, breaks, time off)
+        working_intervals = artist_schedules.get_working_intervals(db, hair_artist_id, booking_date)
+        if not working_intervals:
+            print(f"No working hours on {booking_date} for hair artist {hair_artist_id} - no slots available")
             return []
         
         # Get service information if provided
@@ -145,77 +333,32 @@ async def get_available_slots(
             else:
                 print(f"Warning: Service ID {service_id} not found, using defaults")
         
-        # Define salon hours (9 AM to 5 PM)
-        salon_open = datetime.combine(booking_date, time(9, 0))
-        salon_close = datetime.combine(booking_date, time(17, 0))
+        # Get all booked and held time for the given date and hair artist, already sorted by start time
+        booked_intervals = get_unavailable_intervals(db, hair_artist_id, booking_date)
+        print(f"Found {len(booked_intervals)} booked or held intervals for this day and artist")
         
-        # For current day bookings, use the current time as the starting point
-        if booking_date == current_time.date() and current_time.time() > salon_open.time():
-            # Use current time as the starting point - this is the key change to show the earliest available slot
-            current_slot = current_time
-            print(f"Booking for today, starting from current time: {current_slot.strftime('%H:%M')}")
-        else:
-            current_slot = salon_open
-            print(f"Booking for future date, starting from opening time: {salon_open.strftime('%H:%M')}")
+        # Free time is the working time minus booked time; both lists are sorted so this is linear
+        free_intervals = subtract_intervals(working_intervals, booked_intervals)
         
-        # Get all bookings for the given date and hair artist
-        bookings = db.query(Booking).filter(
-            Booking.date == booking_date,
-            Booking.hair_artist_id == hair_artist_id,
-            Booking.status != "cancelled"
-        ).all()
-        print(f"Found {len(bookings)} existing bookings for this day and artist")
+        # For current day bookings, use the current time as the starting point
+        is_today = booking_date == current_time.date()
+        earliest = earliest_start_minutes(booking_date, current_time)
+        if is_today:
+            print(f"Booking for today, starting from current time: {current_time.strftime('%H:%M')}")
         
-        all_slots = []
-        
-        # Generate time slots
-        while current_slot < salon_close:
-            # End time of the current appointment slot
-            end_time = current_slot + timedelta(minutes=service_duration)
-            
-            # Check if the end time is after the salon closes
-            if end_time > salon_close:
-                print(f"Stopping slot generation at {current_slot.strftime('%H:%M')} as it would end after closing")
-                break
-            
-            is_available = True
-            
-            # Check if the current slot overlaps with any existing bookings
-            for booking in bookings:
-                booking_start = datetime.combine(booking_date, booking.time)
-                service_name = booking.service
-                
-                # Find service duration for this booking
-                booking_service = db.query(Service).filter(Service.name == service_name).first()
-                booking_duration = 30  # Default duration if service not found
-                if booking_service:
-                    booking_duration = booking_service.duration
-                
-                booking_end = booking_start + timedelta(minutes=booking_duration)
-                
-                # Check for overlap
-                if (current_slot < booking_end and end_time > booking_start):
-                    print(f"Slot {current_slot.strftime('%H:%M')} conflicts with booking {booking.id} at {booking_start.strftime('%H:%M')}")
-                    is_available = False
-                    break
-            
-            if is_available:
-                time_str = current_slot.strftime("%H:%M")
-                print(f"Adding available slot: {time_str}")
-                all_slots.append(time_str)
-            
-            # Key change: Move to next slot using the service's slot gap setting
-            # This makes the slot gaps configurable
-            if booking_date == current_time.date() and len(all_slots) == 0:
-                # For first slot of current day, increment by just 15 minutes to find earliest slot
-                # This helps find the exact earliest available slot rather than only 30-min boundaries
-                increment = min(15, slot_gap_minutes)
-                print(f"Looking for earliest slot, incrementing by {increment} minutes")
-            else:
-                # For subsequent slots or future dates, use the configured slot gap
-                increment = slot_gap_minutes
-            
-            current_slot = current_slot + timedelta(minutes=increment)
+        # For the first slot of the current day, step by just 15 minutes to find the exact earliest slot
+        with span("slots"):
+            all_slots = [
+                from_minutes(slot).strftime("%H:%M")
+                for slot in generate_slots(
+                    working_intervals,
+                    free_intervals,
+                    service_duration,
+                    slot_gap_minutes,
+                    earliest=earliest,
+                    first_slot_step=15 if is_today else None
+                )
+            ]
         
         slots = sorted(all_slots)
         print(f"Generated {len(slots)} available slots")
@@ -224,53 +367,196 @@ async def get_available_slots(
         print(f"Error generating available slots: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/available-slots/basket")
+async def get_basket_available_slots(
+    date: str,
+    service_ids: List[int] = Query(...),
+    hair_artist_ids: List[int] = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Get start times at which an ordered list of services can be done back-to-back.
+
+    Pass one hair_artist_id to use the same artist for every service, or one per service.
+    """
+    try:
+        booking_date = datetime.strptime(date, "%Y-%m-%d").date()
+        current_time = datetime.now()
+        
+        if len(hair_artist_ids) == 1:
+            hair_artist_ids = hair_artist_ids * len(service_ids)
+        if len(hair_artist_ids) != len(service_ids):
+            raise HTTPException(status_code=400, detail="Pass one hair_artist_id, or one per service")
+        
+        services = {service.id: service for service in db.query(Service).filter(Service.id.in_(service_ids)).all()}
+        missing = [str(service_id) for service_id in service_ids if service_id not in services]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Services not found: {', '.join(missing)}")
+        
+        # Intersect, item by item, the basket start times at which each service fits its artist's free time
+        free_by_artist = {}
+        basket_starts = None
+        offset = 0
+        for service_id, hair_artist_id in zip(service_ids, hair_artist_ids):
+            if hair_artist_id not in free_by_artist:
+                free_by_artist[hair_artist_id] = get_free_intervals(db, hair_artist_id, booking_date)
+            service = services[service_id]
+            item_starts = start_ranges(free_by_artist[hair_artist_id][1], offset, service.duration)
+            basket_starts = item_starts if basket_starts is None else intersect_intervals(basket_starts, item_starts)
+            offset += service.duration
+        print(f"Basket of {len(service_ids)} services takes {offset} minutes in total")
+        
+        first_service = services[service_ids[0]]
+        first_working, _ = free_by_artist[hair_artist_ids[0]]
+        slots = generate_slots(
+            first_working,
+            basket_starts,
+            1,  # basket_starts already accounts for every service's duration
+            first_service.slot_gap_minutes,
+            earliest=earliest_start_minutes(booking_date, current_time),
+            first_slot_step=15 if booking_date == current_time.date() else None
+        )
+        return [from_minutes(slot).strftime("%H:%M") for slot in slots]
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error generating basket slots: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/available-slots/heatmap", response_model=AvailabilityHeatmap)
+def get_availability_heatmap(
+    month: str,
+    service_id: Optional[int] = None,
+    hair_artist_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Count bookable slots for every day of a month, per artist and for the whole salon.
+
+    Replaces one available-slots call per artist and day when shading a
+    month calendar. Without hair_artist_id, every artist able to perform the
+    service is included.
+    """
+    try:
+        month_start = datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="month must be in YYYY-MM format")
+
+    service_duration = DEFAULT_DURATION_MINUTES
+    slot_gap_minutes = 30
+    if service_id:
+        service = db.query(Service).filter(Service.id == service_id).first()
+        if not service:
+            raise HTTPException(status_code=400, detail="Service not found")
+        service_duration = service.duration
+        slot_gap_minutes = service.slot_gap_minutes
+
+    if hair_artist_id is not None:
+        hair_artist_ids = [hair_artist_id]
+    elif service_id:
+        compatible = catalog_views.get(db).compatible["services"]
+        hair_artist_ids = next((s["hair_artist_ids"] for s in compatible if s["id"] == service_id), [])
+    else:
+        hair_artist_ids = [artist_id for (artist_id,) in db.query(HairArtist.id).order_by(HairArtist.id).all()]
+
+    days = month_days(month_start.year, month_start.month)
+    with span("slots"):
+        counts = count_bookable_slots(db, hair_artist_ids, days, service_duration, slot_gap_minutes)
+    return {
+        "month": month_start.strftime("%Y-%m"),
+        "service_id": service_id,
+        "duration": service_duration,
+        "slot_gap_minutes": slot_gap_minutes,
+        "days": days,
+        "salon": counts.sum(axis=0).tolist(),
+        "hair_artists": [
+            {"hair_artist_id": artist_id, "slots": row}
+            for artist_id, row in zip(hair_artist_ids, counts.tolist())
+        ]
+    }
+
 @router.get("/bookings", response_model=List[BookingResponse])
 async def get_bookings(
     date: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_hair_artist = Depends(get_current_hair_artist)
 ):
+    """List the artist's bookings; `?fields=id,name,time` selects only those columns"""
+    projection = parse_fields(fields, list(BookingResponse.model_fields))
     try:
         if start_date and end_date:
             # Parse the date range
             start = datetime.strptime(start_date, "%Y-%m-%d").date()
             end = datetime.strptime(end_date, "%Y-%m-%d").date()
-            
-            # Get all bookings for the specified date range
-            bookings = db.query(Booking).filter(
-                Booking.date >= start,
-                Booking.date <= end,
-                Booking.hair_artist_id == current_hair_artist.id
-            ).all()
         else:
             # Parse the single date string to date (backward compatibility)
-            target_date = datetime.strptime(date, "%Y-%m-%d").date()
-            
-            # Get all bookings for the specified date
-            bookings = db.query(Booking).filter(
-                Booking.date == target_date,
-                Booking.hair_artist_id == current_hair_artist.id
-            ).all()
+            start = end = datetime.strptime(date, "%Y-%m-%d").date()
         
-        # Convert datetime objects to strings in the response
-        return [
-            {
-                **booking.__dict__,
-                'date': booking.date.strftime("%Y-%m-%d"),
-                'time': booking.time.strftime("%H:%M")
-            }
-            for booking in bookings
+        # Ranges reaching past the archive horizon also read bookings_archive (older rows first)
+        queries = [
+            (model, db.query(model).filter(
+                model.date >= start,
+                model.date <= end,
+                model.hair_artist_id == current_hair_artist.id
+            ))
+            for model in booking_tables(db, start)
         ]
+        
+        if projection:
+            # Only the requested columns are selected; partial rows skip response_model validation
+            rows = [row for model, query in queries for row in project_query(query, model, projection).all()]
+            return JSONResponse(content=jsonable_encoder(project_rows(rows, projection, BOOKING_FIELD_FORMATTERS)))
+        
+        # Convert datetime objects to strings in the response
+        return [serialize_booking(booking) for _, query in queries for booking in query.all()]
     except ValueError as e:
         raise HTTPException(
             status_code=400, 
             detail=f"Invalid date format: {str(e)}. Use YYYY-MM-DD format."
         )
 
+@router.get("/bookings/search", response_model=BookingSearchResults)
+async def search_bookings_endpoint(
+    q: str,
+    fuzzy: bool = False,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_hair_artist = Depends(get_current_hair_artist)
+):
+    """Search bookings by customer name, email or phone.
+
+    Exact matches come newest first; set fuzzy=true to tolerate typos and
+    get the most similar first. Admins search every booking, other artists
+    only their own.
+    """
+    if len(q.strip()) < MIN_QUERY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Search terms must be at least {MIN_QUERY_LENGTH} characters")
+    
+    hair_artist_id = None if current_hair_artist.is_admin else current_hair_artist.id
+    # Fetch one extra row to know whether another page exists without counting all matches
+    bookings = search_bookings(db, q, fuzzy, hair_artist_id, page_size + 1, (page - 1) * page_size)
+    return {
+        "results": [serialize_booking(booking) for booking in bookings[:page_size]],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(bookings) > page_size
+    }
+
 @router.post("/bookings", response_model=BookingResponse)
-async def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
+async def create_booking(
+    booking: BookingCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    # A retried request with the same Idempotency-Key replays the recorded response
+    return await idempotency_store.run(
+        "create-booking", idempotency_key, booking,
+        lambda: insert_booking(booking, db)
+    )
+
+async def insert_booking(booking: BookingCreate, db: Session):
     try:
         # Parse the booking date and time strings into Python objects
         booking_date = datetime.strptime(booking.date, "%Y-%m-%d").date()
@@ -285,19 +571,43 @@ async def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
                 detail="Cannot book appointments in the past"
             )
         
-        # Check if the slot is available
-        existing_booking = db.query(Booking).filter(
-            Booking.date == booking_date,
-            Booking.time == booking_time,
-            Booking.hair_artist_id == booking.hair_artist_id,
-            Booking.status == "confirmed"
-        ).first()
+        service = resolve_service(db, booking.service_id, booking.service)
+        if not service and (booking.service_id or not booking.service):
+            raise HTTPException(status_code=400, detail="Service not found")
+        duration = service.duration if service else DEFAULT_DURATION_MINUTES
+        end_time = booking_end_time(booking_time, duration)
+        
+        if not business_calendar.is_open(db, booking_date, booking_time, end_time):
+            raise HTTPException(
+                status_code=400,
+                detail="The salon is closed at the requested time"
+            )
+        if not artist_schedules.is_working(db, booking.hair_artist_id, booking_date,
+                                           to_minutes(booking_time), to_minutes(booking_time) + duration):
+            raise HTTPException(
+                status_code=400,
+                detail="The hair artist is not available at the requested time"
+            )
+        
+        # Check if the slot overlaps any active booking for this artist
+        existing_booking = find_conflicting_booking(
+            db, booking.hair_artist_id, booking_date, booking_time, end_time
+        )
         
         if existing_booking:
             raise HTTPException(
                 status_code=400,
                 detail="This time slot is already booked"
             )
+        if slot_holds.find_conflicting_hold(
+            db, booking.hair_artist_id, booking_date, booking_time, end_time, [booking.email, booking.phone]
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="This time slot is being held for another customer"
+            )
+        
+        customer = get_or_create_customer(db, booking.name, booking.email, booking.phone, booking.gender)
         
         # Create new booking with proper date and time objects
         db_booking = Booking(
@@ -306,22 +616,300 @@ async def create_booking(booking: BookingCreate, db: Session = Depends(get_db)):
             phone=booking.phone,
             date=booking_date,
             time=booking_time,
-            service=booking.service,
+            service=service.name if service else booking.service,
+            service_id=service.id if service else None,
+            duration_minutes=duration,
+            end_time=end_time,
             hair_artist_id=booking.hair_artist_id,
             gender=booking.gender,
+            customer_id=customer.id if customer else None,
             status="pending"
         )
         
         db.add(db_booking)
+        record_booking(db, db_booking)
+        bump_booking_versions(db, [(db_booking.hair_artist_id, db_booking.date)])
         db.commit()
         db.refresh(db_booking)
+        booking_events.publish("created", [db_booking.id], [(db_booking.hair_artist_id, db_booking.date)])
         
         # Convert the response to include string values for date and time
-        return {
-            **db_booking.__dict__,
-            'date': db_booking.date.strftime("%Y-%m-%d"),
-            'time': db_booking.time.strftime("%H:%M")
-        }
+        return serialize_booking(db_booking)
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bookings/basket", response_model=List[BookingResponse])
+async def create_basket_booking(
+    basket: BasketBookingCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Book an ordered list of services back-to-back in a single transaction"""
+    return await idempotency_store.run(
+        "create-basket", idempotency_key, basket,
+        lambda: insert_basket(basket, db)
+    )
+
+async def insert_basket(basket: BasketBookingCreate, db: Session):
+    try:
+        booking_date = datetime.strptime(basket.date, "%Y-%m-%d").date()
+        booking_time = datetime.strptime(basket.time, "%H:%M").time()
+        
+        if datetime.combine(booking_date, booking_time) < datetime.now():
+            raise HTTPException(status_code=400, detail="Cannot book appointments in the past")
+        if not basket.items:
+            raise HTTPException(status_code=400, detail="At least one service is required")
+        
+        # Lay the services out back-to-back and check each against its artist's working hours
+        planned = []
+        start = to_minutes(booking_time)
+        for item in basket.items:
+            service = resolve_service(db, item.service_id, item.service)
+            if not service:
+                raise HTTPException(status_code=400, detail="Service not found")
+            end = start + service.duration
+            if end >= MINUTES_PER_DAY or not artist_schedules.is_working(db, item.hair_artist_id, booking_date, start, end):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"The hair artist is not available for {service.name} at {from_minutes(start).strftime('%H:%M')}"
+                )
+            planned.append((item.hair_artist_id, service, start, end))
+            start = end
+        
+        # One conflict query covering every planned interval
+        conflict = db.query(Booking.id).filter(
+            Booking.date == booking_date,
+            Booking.status != "cancelled",
+            or_(*[
+                and_(
+                    Booking.hair_artist_id == hair_artist_id,
+                    Booking.time < from_minutes(end),
+                    or_(Booking.end_time > from_minutes(start), Booking.end_time <= Booking.time)
+                )
+                for hair_artist_id, _, start, end in planned
+            ])
+        ).first()
+        if conflict:
+            raise HTTPException(status_code=400, detail="One of the requested time slots is already booked")
+        if any(
+            slot_holds.find_conflicting_hold(
+                db, hair_artist_id, booking_date, from_minutes(start), from_minutes(end), [basket.email, basket.phone]
+            )
+            for hair_artist_id, _, start, end in planned
+        ):
+            raise HTTPException(status_code=400, detail="One of the requested time slots is being held for another customer")
+        
+        customer = get_or_create_customer(db, basket.name, basket.email, basket.phone, basket.gender)
+        bookings = [
+            Booking(
+                name=basket.name,
+                email=basket.email,
+                phone=basket.phone,
+                date=booking_date,
+                time=from_minutes(start),
+                end_time=from_minutes(end),
+                duration_minutes=service.duration,
+                service=service.name,
+                service_id=service.id,
+                hair_artist_id=hair_artist_id,
+                gender=basket.gender,
+                customer_id=customer.id if customer else None,
+                status="pending"
+            )
+            for hair_artist_id, service, start, end in planned
+        ]
+        db.add_all(bookings)
+        for booking in bookings:
+            record_booking(db, booking)
+        bump_booking_versions(db, [(booking.hair_artist_id, booking.date) for booking in bookings])
+        db.commit()
+        for booking in bookings:
+            db.refresh(booking)
+        booking_events.publish(
+            "created",
+            [booking.id for booking in bookings],
+            [(booking.hair_artist_id, booking.date) for booking in bookings]
+        )
+        
+        return [serialize_booking(booking) for booking in bookings]
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
+
+def get_owned_booking(
+    db: Session,
+    booking_id: int,
+    change: BookingCancel,
+    current_hair_artist: Optional[HairArtist]
+) -> Tuple[Booking, Optional[OTP]]:
+    """Load an active, upcoming booking the caller may change, with the customer's OTP record.
+
+    Staff authenticate with a bearer token (their own bookings, or any booking
+    for admins); customers with an OTP sent to the booking's email or phone,
+    compared by normalized contact keys. The OTP is only checked here: the
+    caller consumes it with consume_otp just before committing the change, so
+    a request that fails a later check leaves the code usable.
+    """
+    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    if not booking:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    
+    otp_record = None
+    if current_hair_artist is not None:
+        if not current_hair_artist.is_admin and current_hair_artist.id != booking.hair_artist_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    else:
+        if not change.contact or not change.code:
+            raise HTTPException(status_code=401, detail="A bearer token or an OTP is required")
+        email_key, phone_key = contact_keys(*split_contact(change.contact.strip()))
+        booking_email_key, booking_phone_key = contact_keys(booking.email, booking.phone)
+        if not ((email_key and email_key == booking_email_key) or (phone_key and phone_key == booking_phone_key)):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        otp_record = find_valid_otp(db, change.contact, change.code)
+        if not otp_record:
+            raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+    
+    if booking.status == "cancelled":
+        raise HTTPException(status_code=400, detail="Booking is already cancelled")
+    if datetime.combine(booking.date, booking.time) < datetime.now():
+        raise HTTPException(status_code=400, detail="Cannot change appointments in the past")
+    return booking, otp_record
+
+def consume_change_otp(db: Session, otp_record: Optional[OTP]):
+    """Use up the OTP a customer's change was authorized with, as the last step before its commit"""
+    if otp_record is not None and not consume_otp(db, otp_record):
+        raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+
+def offer_freed_slot(db: Session, background_tasks: BackgroundTasks, hair_artist_id: int, day: date, start: time):
+    """Offer a just-freed slot to the waitlist; emails go out after the response is sent"""
+    try:
+        matches = match_freed_interval(db, hair_artist_id, day, to_minutes(start))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error matching waitlist for hair artist {hair_artist_id} on {day}: {str(e)}")
+        return
+    for match in matches:
+        waitlist_index.remove(match["id"])
+    if matches:
+        background_tasks.add_task(notify_waitlist_matches, matches, day)
+
+@router.post(
+    "/bookings/{booking_id}/cancel",
+    response_model=BookingResponse,
+    dependencies=[Depends(booking_change_rate_limit)]
+)
+async def cancel_booking(
+    booking_id: int,
+    change: BookingCancel,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_hair_artist: Optional[HairArtist] = Depends(get_optional_hair_artist)
+):
+    try:
+        booking, otp_record = get_owned_booking(db, booking_id, change, current_hair_artist)
+        record_booking(db, booking, -1)
+        booking.status = "cancelled"
+        bump_booking_versions(db, [(booking.hair_artist_id, booking.date)])
+        consume_change_otp(db, otp_record)
+        db.commit()
+        db.refresh(booking)
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        print(f"Error cancelling booking {booking_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to cancel booking")
+    
+    booking_events.publish("cancelled", [booking.id], [(booking.hair_artist_id, booking.date)])
+    response = serialize_booking(booking)  # Before the waitlist commit expires the loaded attributes
+    offer_freed_slot(db, background_tasks, booking.hair_artist_id, booking.date, booking.time)
+    return response
+
+@router.post(
+    "/bookings/{booking_id}/reschedule",
+    response_model=BookingResponse,
+    dependencies=[Depends(booking_change_rate_limit)]
+)
+async def reschedule_booking(
+    booking_id: int,
+    change: BookingReschedule,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_hair_artist: Optional[HairArtist] = Depends(get_optional_hair_artist)
+):
+    """Move a booking to a new slot; the conflict check and the move share one transaction"""
+    try:
+        try:
+            new_date = datetime.strptime(change.date, "%Y-%m-%d").date()
+            new_time = datetime.strptime(change.time, "%H:%M").time()
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid date or time format: {str(e)}. Use YYYY-MM-DD for date and HH:MM for time."
+            )
+        
+        booking, otp_record = get_owned_booking(db, booking_id, change, current_hair_artist)
+        old_hair_artist_id, old_date, old_time = booking.hair_artist_id, booking.date, booking.time
+        new_hair_artist_id = change.hair_artist_id or booking.hair_artist_id
+        if current_hair_artist is not None and not current_hair_artist.is_admin \
+                and new_hair_artist_id != current_hair_artist.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        
+        if datetime.combine(new_date, new_time) < datetime.now():
+            raise HTTPException(status_code=400, detail="Cannot book appointments in the past")
+        duration = booking.duration_minutes or DEFAULT_DURATION_MINUTES
+        new_end_time = booking_end_time(new_time, duration)
+        
+        if not business_calendar.is_open(db, new_date, new_time, new_end_time):
+            raise HTTPException(status_code=400, detail="The salon is closed at the requested time")
+        if not artist_schedules.is_working(db, new_hair_artist_id, new_date,
+                                           to_minutes(new_time), to_minutes(new_time) + duration):
+            raise HTTPException(status_code=400, detail="The hair artist is not available at the requested time")
+        
+        # The booking's own current slot does not count as a conflict, so it can shift within itself
+        existing_booking = find_conflicting_booking(
+            db, new_hair_artist_id, new_date, new_time, new_end_time, exclude_booking_id=booking.id
+        )
+        if existing_booking:
+            raise HTTPException(status_code=400, detail="This time slot is already booked")
+        if slot_holds.find_conflicting_hold(
+            db, new_hair_artist_id, new_date, new_time, new_end_time, [booking.email, booking.phone]
+        ):
+            raise HTTPException(status_code=400, detail="This time slot is being held for another customer")
+        
+        record_booking(db, booking, -1)
+        booking.hair_artist_id = new_hair_artist_id
+        booking.date = new_date
+        booking.time = new_time
+        booking.end_time = new_end_time
+        booking.duration_minutes = duration
+        record_booking(db, booking)
+        bump_booking_versions(db, [(old_hair_artist_id, old_date), (new_hair_artist_id, new_date)])
+        consume_change_otp(db, otp_record)
+        db.commit()
+        db.refresh(booking)
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        print(f"Error rescheduling booking {booking_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to reschedule booking")
+    
+    booking_events.publish(
+        "rescheduled",
+        [booking.id],
+        [(old_hair_artist_id, old_date), (booking.hair_artist_id, booking.date)]
+    )
+    response = serialize_booking(booking)
+    offer_freed_slot(db, background_tasks, old_hair_artist_id, old_date, old_time)
+    return response
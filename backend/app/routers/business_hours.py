@@ -0,0 +1,155 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from datetime import datetime, timedelta
+
+from ..models.database import get_db, OpeningHours, Closure, HairArtist
+from ..models.schemas import (
+    OpeningHours as OpeningHoursSchema,
+    OpeningHoursCreate,
+    Closure as ClosureSchema,
+    ClosureCreate,
+    CalendarDay
+)
+from ..routers.hair_artists import get_admin_hair_artist
+from ..utils.business_calendar import business_calendar
+from ..utils.cache_versions import cache_versions
+
+router = APIRouter()
+
+MAX_CALENDAR_RANGE_DAYS = 366
+
+def validate_opening_hours(opening_hours: OpeningHoursCreate):
+    if not 0 <= opening_hours.weekday <= 6:
+        raise HTTPException(status_code=400, detail="weekday must be between 0 (Monday) and 6 (Sunday)")
+    if opening_hours.open_time >= opening_hours.close_time:
+        raise HTTPException(status_code=400, detail="open_time must be before close_time")
+    if opening_hours.valid_from and opening_hours.valid_to and opening_hours.valid_from > opening_hours.valid_to:
+        raise HTTPException(status_code=400, detail="valid_from must not be after valid_to")
+
+@router.get("/business-hours/", response_model=List[OpeningHoursSchema])
+def list_opening_hours(db: Session = Depends(get_db)):
+    return db.query(OpeningHours).order_by(OpeningHours.weekday, OpeningHours.open_time).all()
+
+@router.post("/business-hours/", response_model=OpeningHoursSchema)
+def create_opening_hours(
+    opening_hours: OpeningHoursCreate,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    validate_opening_hours(opening_hours)
+    db_opening_hours = OpeningHours(**opening_hours.dict())
+    db.add(db_opening_hours)
+    db.commit()
+    db.refresh(db_opening_hours)
+    cache_versions.publish(db, "business_calendar")
+    return db_opening_hours
+
+@router.put("/business-hours/{opening_hours_id}", response_model=OpeningHoursSchema)
+def update_opening_hours(
+    opening_hours_id: int,
+    opening_hours: OpeningHoursCreate,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    validate_opening_hours(opening_hours)
+    db_opening_hours = db.query(OpeningHours).filter(OpeningHours.id == opening_hours_id).first()
+    if not db_opening_hours:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Opening hours not found"
+        )
+
+    for key, value in opening_hours.dict().items():
+        setattr(db_opening_hours, key, value)
+
+    db.commit()
+    db.refresh(db_opening_hours)
+    cache_versions.publish(db, "business_calendar")
+    return db_opening_hours
+
+@router.delete("/business-hours/{opening_hours_id}")
+def delete_opening_hours(
+    opening_hours_id: int,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    db_opening_hours = db.query(OpeningHours).filter(OpeningHours.id == opening_hours_id).first()
+    if not db_opening_hours:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Opening hours not found"
+        )
+
+    db.delete(db_opening_hours)
+    db.commit()
+    cache_versions.publish(db, "business_calendar")
+    return {"message": "Opening hours deleted successfully"}
+
+@router.get("/closures/", response_model=List[ClosureSchema])
+def list_closures(db: Session = Depends(get_db)):
+    return db.query(Closure).order_by(Closure.start_date).all()
+
+@router.post("/closures/", response_model=ClosureSchema)
+def create_closure(
+    closure: ClosureCreate,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    if closure.start_date > closure.end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+    db_closure = Closure(**closure.dict())
+    db.add(db_closure)
+    db.commit()
+    db.refresh(db_closure)
+    cache_versions.publish(db, "business_calendar")
+    return db_closure
+
+@router.delete("/closures/{closure_id}")
+def delete_closure(
+    closure_id: int,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    db_closure = db.query(Closure).filter(Closure.id == closure_id).first()
+    if not db_closure:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Closure not found"
+        )
+
+    db.delete(db_closure)
+    db.commit()
+    cache_versions.publish(db, "business_calendar")
+    return {"message": "Closure deleted successfully"}
+
+@router.get("/business-hours/calendar", response_model=List[CalendarDay])
+def get_business_calendar(
+    start_date: str,
+    end_date: str,
+    db: Session = Depends(get_db)
+):
+    """Get the compiled opening intervals for each date in a range"""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid date format: {str(e)}. Use YYYY-MM-DD format."
+        )
+    if start > end or (end - start).days >= MAX_CALENDAR_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+
+    days = []
+    current = start
+    while current <= end:
+        intervals = business_calendar.get_intervals(db, current)
+        days.append({
+            "date": current,
+            "open": bool(intervals),
+            "intervals": [[o.strftime("%H:%M"), c.strftime("%H:%M")] for o, c in intervals]
+        })
+        current += timedelta(days=1)
+    return days
@@ -0,0 +1,67 @@
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..models.database import get_db, HairArtist
+from ..models.schemas import CalendarFeedToken
+from ..routers.auth import get_current_hair_artist
+from ..utils.compression import etag_matches
+from ..utils.calendar_feed import calendar_feeds, feed_etag, iter_feed
+
+router = APIRouter(prefix="/calendar")
+
+CALENDAR_MEDIA_TYPE = "text/calendar"  # Starlette adds the utf-8 charset
+
+def feed_url(token: str) -> str:
+    return f"/api/calendar/{token}.ics"
+
+@router.post("/token", response_model=CalendarFeedToken)
+def rotate_calendar_token(
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_current_hair_artist)
+):
+    """Create (or replace) the secret in the artist's calendar subscription URL; old URLs stop working"""
+    current_hair_artist.calendar_token = secrets.token_urlsafe(24)
+    db.commit()
+    calendar_feeds.invalidate(current_hair_artist.id)
+    return {"token": current_hair_artist.calendar_token, "url": feed_url(current_hair_artist.calendar_token)}
+
+@router.get("/{token}.ics")
+def get_calendar_feed(
+    token: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """An artist's bookings as an iCalendar subscription feed.
+
+    The token in the URL is the only credential, as calendar apps cannot
+    send a bearer token. Clients that send If-None-Match with the current
+    ETag get 304 Not Modified; otherwise the feed is served from the
+    rendered cache, or streamed and cached when the artist's bookings
+    changed since it was last rendered.
+    """
+    hair_artist = db.query(HairArtist).filter(HairArtist.calendar_token == token).first()
+    if not hair_artist:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+    
+    etag = feed_etag(db, hair_artist)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    cached = calendar_feeds.get(hair_artist.id, etag)
+    if cached is not None:
+        return Response(content=cached, media_type=CALENDAR_MEDIA_TYPE, headers=headers)
+    
+    def stream():
+        chunks = []
+        for chunk in iter_feed(db, hair_artist):
+            chunk = chunk.encode()
+            chunks.append(chunk)
+            yield chunk
+        # Only a completely sent feed is cached
+        calendar_feeds.put(hair_artist.id, etag, b"".join(chunks))
+    
+    return StreamingResponse(stream(), media_type=CALENDAR_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from ..models.database import get_db, Customer, HairArtist
+from ..models.schemas import CustomerHistory, CustomerHistoryRequest
+from ..routers.auth import get_current_hair_artist
+from ..routers.booking import serialize_booking
+from ..utils.customers import find_customer, split_contact
+from ..utils.booking_archive import latest_customer_bookings
+from ..utils.otp import verify_otp
+from ..utils.rate_limit import customer_history_rate_limit
+
+router = APIRouter(prefix="/customers")
+
+MAX_PAGE_SIZE = 100
+
+def get_admin_hair_artist(current_hair_artist: HairArtist = Depends(get_current_hair_artist)):
+    if not current_hair_artist.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return current_hair_artist
+
+def customer_history(db: Session, customer: Customer, page: int, page_size: int) -> dict:
+    """One page of a customer's bookings, newest first, including archived ones"""
+    bookings = latest_customer_bookings(db, customer.id, (page - 1) * page_size, page_size + 1)
+    return {
+        "customer": customer,
+        "bookings": [serialize_booking(booking) for booking in bookings[:page_size]],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(bookings) > page_size
+    }
+
+@router.post("/history", response_model=CustomerHistory, dependencies=[Depends(customer_history_rate_limit)])
+def get_my_history(
+    request: CustomerHistoryRequest,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """A customer's own profile and past appointments, authenticated with an OTP"""
+    if not verify_otp(db, request.contact, request.code):
+        raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+    customer = find_customer(db, *split_contact(request.contact))
+    if not customer:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No bookings found for this contact")
+    return customer_history(db, customer, page, page_size)
+
+@router.get("/{customer_id}/history", response_model=CustomerHistory)
+def get_customer_history(
+    customer_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    admin: HairArtist = Depends(get_admin_hair_artist)
+):
+    """Any customer's profile and appointments, for admins"""
+    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    if not customer:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+    return customer_history(db, customer, page, page_size)
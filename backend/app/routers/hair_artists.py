@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..models.database import get_db, HairArtist
-from ..models.schemas import HairArtist as HairArtistSchema
+from ..models.schemas import HairArtist as HairArtistSchema, PublicHairArtist
 from ..routers.auth import get_current_hair_artist
+from ..utils.fields import parse_fields, project_query, project_rows
+from ..utils.catalog import catalog_views, parse_gender
+from ..utils.cache_versions import cache_versions
 
 router = APIRouter()
 
@@ -16,14 +21,30 @@ def get_admin_hair_artist(current_hair_artist: HairArtist = Depends(get_current_
         )
     return current_hair_artist
 
-@router.get("/hair-artists/public", response_model=List[HairArtistSchema])
+@router.get("/hair-artists/public", response_model=List[PublicHairArtist])
 def list_hair_artists_public(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = None,
+    gender: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    hair_artists = db.query(HairArtist).offset(skip).limit(limit).all()
-    return hair_artists
+    """List hair artists' public profiles; `?fields=id,name` selects only those columns.
+
+    `?gender=male|female` returns only artists whose expertise covers that
+    gender, served from the precomputed catalog views.
+    """
+    projection = parse_fields(fields, list(PublicHairArtist.model_fields))
+    if parse_gender(gender):
+        items = catalog_views.get(db, gender).hair_artists[skip:skip + limit]
+        if projection:
+            items = [{name: item[name] for name in projection} for item in items]
+        return JSONResponse(content=items)
+    query = db.query(HairArtist).order_by(HairArtist.id).offset(skip).limit(limit)
+    if projection:
+        rows = project_query(query, HairArtist, projection).all()
+        return JSONResponse(content=jsonable_encoder(project_rows(rows, projection)))
+    return query.all()
 
 @router.get("/hair-artists/", response_model=List[HairArtistSchema])
 def list_hair_artists(
@@ -56,4 +77,5 @@ def delete_hair_artist(
     
     db.delete(hair_artist)
     db.commit()
+    cache_versions.publish(db, "catalog")
     return {"message": "Hair artist deleted successfully"} 
\ No newline at end of file
@@ -0,0 +1,167 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, timedelta
+
+from ..models.database import get_db, BookingDailyStats, Service, HairArtist
+from ..models.schemas import BookingStats
+from ..routers.auth import get_current_hair_artist
+from ..utils.artist_schedule import artist_schedules
+from ..utils.booking_stats import UNKNOWN_ID
+from ..utils.booking_consistency import ConsistencyCheck, cancel_duplicate_bookings
+
+router = APIRouter(prefix="/reports")
+
+MAX_STATS_RANGE_DAYS = 366
+
+def get_admin_hair_artist(current_hair_artist: HairArtist = Depends(get_current_hair_artist)):
+    if not current_hair_artist.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return current_hair_artist
+
+def utilization(booked_minutes: int, available_minutes: int) -> Optional[float]:
+    return round(booked_minutes / available_minutes, 3) if available_minutes else None
+
+@router.get("/bookings", response_model=BookingStats)
+def get_booking_stats(
+    start_date: date,
+    end_date: date,
+    hair_artist_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_current_hair_artist)
+):
+    """Per-day and per-service booking counts, utilization and revenue for a date range.
+
+    Figures are aggregated in SQL from booking_daily_stats (one row per
+    artist, day and service), so the cost depends on the number of days and
+    services, not on the number of bookings. Artists
+    see their own figures; admins may pass any hair_artist_id, or none for
+    the whole salon.
+    """
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if (end_date - start_date).days >= MAX_STATS_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_STATS_RANGE_DAYS} days")
+    if not current_hair_artist.is_admin:
+        if hair_artist_id is not None and hair_artist_id != current_hair_artist.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        hair_artist_id = current_hair_artist.id
+
+    bookings = func.coalesce(func.sum(BookingDailyStats.bookings), 0)
+    booked_minutes = func.coalesce(func.sum(BookingDailyStats.booked_minutes), 0)
+    # Revenue uses the current service price, as the stats rows only count bookings
+    revenue = func.coalesce(func.sum(BookingDailyStats.bookings * func.coalesce(Service.price, 0)), 0)
+    filters = [
+        BookingDailyStats.date >= start_date,
+        BookingDailyStats.date <= end_date
+    ]
+    if hair_artist_id is not None:
+        filters.append(BookingDailyStats.hair_artist_id == hair_artist_id)
+
+    by_day = {
+        row.date: row
+        for row in db.query(
+            BookingDailyStats.date,
+            bookings.label("bookings"),
+            booked_minutes.label("booked_minutes"),
+            revenue.label("revenue")
+        ).outerjoin(Service, Service.id == BookingDailyStats.service_id).filter(*filters).group_by(BookingDailyStats.date)
+    }
+    by_service = [
+        row for row in db.query(
+            BookingDailyStats.service_id,
+            func.max(Service.name).label("service"),
+            bookings.label("bookings"),
+            booked_minutes.label("booked_minutes"),
+            revenue.label("revenue")
+        ).outerjoin(Service, Service.id == BookingDailyStats.service_id).filter(*filters).group_by(BookingDailyStats.service_id)
+        if row.bookings
+    ]
+
+    # Available minutes come from the compiled (cached) working intervals, one lookup per artist-day
+    if hair_artist_id is not None:
+        artist_ids = [hair_artist_id]
+    else:
+        artist_ids = [artist_id for (artist_id,) in db.query(HairArtist.id).all()]
+
+    days = []
+    current = start_date
+    while current <= end_date:
+        available = sum(
+            end - start
+            for artist_id in artist_ids
+            for start, end in artist_schedules.get_working_intervals(db, artist_id, current)
+        )
+        row = by_day.get(current)
+        booked = int(row.booked_minutes) if row else 0
+        days.append({
+            "date": current,
+            "bookings": int(row.bookings) if row else 0,
+            "booked_minutes": booked,
+            "available_minutes": available,
+            "utilization": utilization(booked, available),
+            "revenue": round(float(row.revenue), 2) if row else 0.0
+        })
+        current += timedelta(days=1)
+
+    total_booked = sum(day["booked_minutes"] for day in days)
+    total_available = sum(day["available_minutes"] for day in days)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "hair_artist_id": hair_artist_id,
+        "bookings": sum(day["bookings"] for day in days),
+        "booked_minutes": total_booked,
+        "available_minutes": total_available,
+        "utilization": utilization(total_booked, total_available),
+        "revenue": round(sum(day["revenue"] for day in days), 2),
+        "days": days,
+        "services": [
+            {
+                "service_id": row.service_id if row.service_id != UNKNOWN_ID else None,
+                "service": row.service,
+                "bookings": int(row.bookings),
+                "booked_minutes": int(row.booked_minutes),
+                "revenue": round(float(row.revenue), 2)
+            }
+            for row in sorted(by_service, key=lambda row: -row.bookings)
+        ]
+    }
+
+@router.get("/consistency")
+def get_consistency_report(
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    """Overlapping, duplicate and orphaned active bookings, as JSON lines.
+
+    The report is streamed while the bookings are scanned (see
+    utils/booking_consistency.py): one object per issue, then a
+    {"type": "summary"} line with the totals.
+    """
+    def stream():
+        check = ConsistencyCheck(db)
+        for issue in check.issues():
+            yield json.dumps(issue) + "\n"
+        yield json.dumps({"type": "summary", **check.summary()}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/consistency/cancel-duplicates")
+def cancel_duplicates(
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_admin_hair_artist)
+):
+    """Cancel every booking that repeats an earlier booking of the same customer, artist and start time"""
+    try:
+        check = ConsistencyCheck(db)
+        for _ in check.issues():
+            pass
+        return {**check.summary(), "cancelled": cancel_duplicate_bookings(db, check.duplicate_ids)}
+    except Exception as e:
+        db.rollback()
+        print(f"Error cancelling duplicate bookings: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to cancel duplicate bookings")
@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from ..models.database import get_db, Service, HairArtist
-from ..models.schemas import Service as ServiceSchema, ServiceCreate
+from ..models.database import get_db, Service, HairArtist, Booking, BookingArchive
+from ..models.schemas import Service as ServiceSchema, ServiceCreate, CompatibleCatalog
 from ..routers.auth import get_current_hair_artist
+from ..utils.fields import parse_fields, project_query, project_rows
+from ..utils.catalog import catalog_views, parse_gender
+from ..utils.cache_versions import cache_versions
 
 router = APIRouter()
 
@@ -20,10 +25,35 @@ def get_admin_hair_artist(current_hair_artist: HairArtist = Depends(get_current_
 def list_services(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = None,
+    gender: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    services = db.query(Service).offset(skip).limit(limit).all()
-    return services
+    """List services; `?fields=id,name,duration` selects only those columns.
+
+    `?gender=male|female` returns only services offered to that gender, served
+    from the precomputed catalog views.
+    """
+    projection = parse_fields(fields, list(ServiceSchema.model_fields))
+    if parse_gender(gender):
+        items = catalog_views.get(db, gender).services[skip:skip + limit]
+        if projection:
+            items = [{name: item[name] for name in projection} for item in items]
+        return JSONResponse(content=items)
+    query = db.query(Service).order_by(Service.id).offset(skip).limit(limit)
+    if projection:
+        # Partial objects skip response_model validation; the columns were already checked
+        rows = project_query(query, Service, projection).all()
+        return JSONResponse(content=jsonable_encoder(project_rows(rows, projection)))
+    return query.all()
+
+@router.get("/services/compatible", response_model=CompatibleCatalog)
+def list_compatible_services(
+    gender: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Services with the hair artists able to perform them, for rendering the booking wizard in one request"""
+    return JSONResponse(content=catalog_views.get(db, parse_gender(gender)).compatible)
 
 @router.get("/services/{service_id}", response_model=ServiceSchema)
 def get_service(
@@ -49,6 +79,7 @@ def create_service(
     db.add(db_service)
     db.commit()
     db.refresh(db_service)
+    cache_versions.publish(db, "catalog")
     return db_service
 
 @router.put("/services/{service_id}", response_model=ServiceSchema)
@@ -65,11 +96,21 @@ def update_service(
             detail="Service not found"
         )
     
+    previous_name = db_service.name
     for key, value in service.dict().items():
         setattr(db_service, key, value)
     
+    # Bookings reference the service by id; keep their name alias in step with a rename.
+    # Duration snapshots are left untouched so existing appointments keep their length.
+    if db_service.name != previous_name:
+        for model in (Booking, BookingArchive):
+            db.query(model).filter(model.service_id == service_id).update(
+                {model.service: db_service.name}, synchronize_session=False
+            )
+    
     db.commit()
     db.refresh(db_service)
+    cache_versions.publish(db, "catalog")
     return db_service
 
 @router.delete("/services/{service_id}")
@@ -87,4 +128,5 @@ def delete_service(
     
     db.delete(db_service)
     db.commit()
+    cache_versions.publish(db, "catalog")
     return {"message": "Service deleted successfully"} 
\ No newline at end of file
@@ -0,0 +1,82 @@
+import secrets
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date, timedelta
+
+from ..models.database import get_db, HairArtist, WaitlistEntry
+from ..models.schemas import WaitlistCreate, WaitlistJoined, WaitlistEntry as WaitlistEntrySchema
+from ..routers.auth import get_current_hair_artist
+from ..utils.availability import resolve_service
+from ..utils.waitlist import waitlist_index, MAX_WAITLIST_RANGE_DAYS
+from ..utils.cache_versions import cache_versions
+
+router = APIRouter(prefix="/booking/waitlist")
+
+@router.post("", response_model=WaitlistJoined)
+def join_waitlist(entry: WaitlistCreate, db: Session = Depends(get_db)):
+    if entry.start_date > entry.end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if entry.end_date < date.today():
+        raise HTTPException(status_code=400, detail="Cannot join the waitlist for past dates")
+    if entry.end_date - entry.start_date > timedelta(days=MAX_WAITLIST_RANGE_DAYS - 1):
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_WAITLIST_RANGE_DAYS} days")
+
+    service = resolve_service(db, entry.service_id, entry.service)
+    if not service:
+        raise HTTPException(status_code=400, detail="Service not found")
+    if entry.hair_artist_id is not None:
+        hair_artist = db.query(HairArtist).filter(HairArtist.id == entry.hair_artist_id).first()
+        if not hair_artist:
+            raise HTTPException(status_code=400, detail="Hair artist not found")
+
+    db_entry = WaitlistEntry(
+        name=entry.name,
+        email=entry.email,
+        phone=entry.phone,
+        service_id=service.id,
+        service=service.name,
+        duration_minutes=service.duration,
+        hair_artist_id=entry.hair_artist_id,
+        start_date=entry.start_date,
+        end_date=entry.end_date,
+        status="waiting",
+        cancel_token=secrets.token_urlsafe(24)
+    )
+    db.add(db_entry)
+    db.commit()
+    db.refresh(db_entry)
+    waitlist_index.add(db_entry)
+    cache_versions.publish(db, "waitlist", notify_local=False)
+    return db_entry
+
+@router.delete("/{entry_id}")
+def leave_waitlist(entry_id: int, token: str, db: Session = Depends(get_db)):
+    """Leave the waitlist with the cancel_token returned when the entry was created"""
+    db_entry = db.query(WaitlistEntry).filter(WaitlistEntry.id == entry_id).first()
+    if not db_entry or not db_entry.cancel_token or not secrets.compare_digest(db_entry.cancel_token, token):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Waitlist entry not found"
+        )
+
+    db_entry.status = "cancelled"
+    db.commit()
+    waitlist_index.remove(entry_id)
+    cache_versions.publish(db, "waitlist", notify_local=False)
+    return {"message": "Left the waitlist successfully"}
+
+@router.get("", response_model=List[WaitlistEntrySchema])
+def list_waitlist(
+    date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_hair_artist: HairArtist = Depends(get_current_hair_artist)
+):
+    query = db.query(WaitlistEntry).filter(WaitlistEntry.status == "waiting")
+    if not current_hair_artist.is_admin:
+        query = query.filter(
+            (WaitlistEntry.hair_artist_id == current_hair_artist.id) | (WaitlistEntry.hair_artist_id.is_(None))
+        )
+    if date:
+        query = query.filter(WaitlistEntry.start_date <= date, WaitlistEntry.end_date >= date)
+    return query.order_by(WaitlistEntry.id).all()
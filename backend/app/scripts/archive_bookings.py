@@ -0,0 +1,30 @@
+import argparse
+from datetime import datetime
+from app.models.database import SessionLocal
+from app.utils.booking_archive import archive_bookings, ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from app.utils.booking_search import optimize_search_indexes
+
+def main():
+    parser = argparse.ArgumentParser(description="Move past bookings from the live bookings table into bookings_archive")
+    parser.add_argument("--before", help=f"Archive bookings dated before this day (YYYY-MM-DD, today at the latest); "
+                                         f"defaults to {ARCHIVE_AFTER_DAYS} days ago (BOOKING_ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Bookings moved per transaction")
+    args = parser.parse_args()
+    before = datetime.strptime(args.before, "%Y-%m-%d").date() if args.before else None
+
+    db = SessionLocal()
+    try:
+        moved = archive_bookings(db, before, args.batch_size)
+        print(f"Archived {moved} bookings")
+        if moved:
+            optimize_search_indexes(db)
+        return 0
+    except Exception as e:
+        db.rollback()
+        print(f"Error archiving bookings: {str(e)}")
+        return 2
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+import argparse
+import gzip
+import json
+import time
+from fastapi.encoders import jsonable_encoder
+from app.models.database import SessionLocal, Service, HairArtist, Booking
+from app.models.schemas import Service as ServiceSchema, PublicHairArtist
+from app.routers.booking import serialize_booking, BOOKING_FIELD_FORMATTERS
+from app.utils.compression import brotli
+from app.utils.fields import project_query, project_rows
+
+def measure(label, build, repeat):
+    """Time building + JSON-encoding a payload and report its raw and compressed sizes"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = json.dumps(build()).encode()
+    cpu_ms = (time.perf_counter() - started) * 1000 / repeat
+    sizes = f"raw {len(body):>8} B  gzip {len(gzip.compress(body, 6)):>7} B"
+    if brotli is not None:
+        sizes += f"  br {len(brotli.compress(body, quality=5)):>7} B"
+    print(f"{label:<34} {cpu_ms:8.2f} ms  {sizes}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and ?fields= projected list payloads")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bookings", type=int, default=1000, help="Number of bookings to list")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        services_fields = ["id", "name", "duration"]
+        artists_fields = ["id", "name"]
+        bookings_fields = ["id", "name", "date", "time", "status"]
+        booking_query = db.query(Booking).order_by(Booking.id.desc()).limit(args.bookings)
+
+        measure("services (full)", lambda: jsonable_encoder(
+            [ServiceSchema.model_validate(s, from_attributes=True) for s in db.query(Service).all()]), args.repeat)
+        measure("services ?fields=" + ",".join(services_fields), lambda: jsonable_encoder(project_rows(
+            project_query(db.query(Service), Service, services_fields).all(), services_fields)), args.repeat)
+        measure("hair-artists (full)", lambda: jsonable_encoder(
+            [PublicHairArtist.model_validate(a, from_attributes=True) for a in db.query(HairArtist).all()]), args.repeat)
+        measure("hair-artists ?fields=" + ",".join(artists_fields), lambda: jsonable_encoder(project_rows(
+            project_query(db.query(HairArtist), HairArtist, artists_fields).all(), artists_fields)), args.repeat)
+        measure("bookings (full)", lambda: jsonable_encoder(
+            [serialize_booking(b) for b in booking_query.all()]), args.repeat)
+        measure("bookings ?fields=" + ",".join(bookings_fields), lambda: jsonable_encoder(project_rows(
+            project_query(booking_query, Booking, bookings_fields).all(), bookings_fields,
+            BOOKING_FIELD_FORMATTERS)), args.repeat)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.utils.booking_archive import archive_bookings
+from app.utils.booking_search import optimize_search_indexes, search_bookings
+from app.utils.customers import contact_keys
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Daniel", "Nancy", "Matthew", "Lisa", "Anthony", "Betty", "Mark", "Margaret", "Donald", "Sandra",
+    "Steven", "Ashley", "Paul", "Kimberly", "Andrew", "Emily", "Joshua", "Donna", "Kenneth", "Michelle",
+    "Sofia", "Lucas", "Amelia", "Mateo", "Chloe", "Noah", "Yasmin", "Omar", "Ingrid", "Kenji"
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "Kowalski", "Novak", "Okafor", "Haddad", "Lindqvist", "Yamamoto", "Fitzgerald", "Delacroix", "Papadopoulos", "Ivanova"
+]
+DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "icloud.com", "example.org"]
+BOOKINGS_PER_CUSTOMER = 8
+# Searched for, but only ever booked once, in the oldest booking
+OLD_CUSTOMER = ("Wilhelmina Blackwood", "wilhelmina.blackwood@example.org", "+1 (212) 555-0143")
+OLD_BOOKING_ID = 1
+
+def synthetic_customers(rng: random.Random, count: int):
+    """(name, email, phone) of `count` customers with distinct phone numbers, OLD_CUSTOMER first"""
+    customers, phones = [OLD_CUSTOMER], {OLD_CUSTOMER[2]}
+    while len(customers) < count:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        phone = f"+1 ({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}"
+        if phone in phones:
+            continue
+        phones.add(phone)
+        email = f"{first.lower()}.{last.lower()}{len(customers)}@{rng.choice(DOMAINS)}"
+        customers.append((f"{first} {last}", email, phone))
+    return customers
+
+def build_database(path: Path, rows: int, seed: int):
+    """Migrate a new database to head and fill it with `rows` synthetic bookings over five years"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=5 * 365)
+    engine = create_engine(f"sqlite:///{path}")
+    started = time.perf_counter()
+    customers = synthetic_customers(rng, max(2, rows // BOOKINGS_PER_CUSTOMER))
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO customers (id, email_key, phone_key, name, email, phone) "
+            "VALUES (:id, :email_key, :phone_key, :name, :email, :phone)"
+        ), [
+            dict(zip(("email_key", "phone_key"), contact_keys(email, phone)), id=i + 1, name=name, email=email, phone=phone)
+            for i, (name, email, phone) in enumerate(customers)
+        ])
+        batch = []
+        for i in range(rows):
+            # The old customer only has the first booking
+            customer_id = 1 if i == 0 else rng.randint(2, len(customers))
+            name, email, phone = customers[customer_id - 1]
+            minutes = 9 * 60 + 30 * rng.randint(0, 17)
+            batch.append({
+                "name": name, "email": email, "phone": phone, "service": "Haircut",
+                "date": first_day + timedelta(days=i * 5 * 365 // rows),
+                "time": f"{minutes // 60:02d}:{minutes % 60:02d}:00.000000",
+                "hair_artist_id": rng.randint(1, 8), "status": "confirmed", "customer_id": customer_id
+            })
+            if len(batch) == 10000:
+                insert_bookings(connection, batch)
+                batch = []
+        if batch:
+            insert_bookings(connection, batch)
+    engine.dispose()
+    print(f"Built {rows} bookings in {time.perf_counter() - started:.1f}s")
+
+def archive_database(path: Path, after_days: int):
+    """Move bookings older than `after_days` into bookings_archive, as the nightly archive job would"""
+    engine = create_engine(f"sqlite:///{path}")
+    db = sessionmaker(bind=engine)()
+    started = time.perf_counter()
+    try:
+        moved = archive_bookings(db, date.today() - timedelta(days=after_days), batch_size=10000)
+        optimize_search_indexes(db)
+    finally:
+        db.close()
+        engine.dispose()
+    print(f"Archived {moved} bookings in {time.perf_counter() - started:.1f}s")
+
+def insert_bookings(connection, batch):
+    connection.execute(text(
+        "INSERT INTO bookings (name, email, phone, service, date, time, hair_artist_id, status, customer_id) "
+        "VALUES (:name, :email, :phone, :service, :date, :time, :hair_artist_id, :status, :customer_id)"
+    ), batch)
+
+def measure(db, label, query, fuzzy, repeat, hair_artist_id=None, offset=0, expect=None):
+    """Time one search page and report p50/p95, the number of results and where `expect` ranked"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = search_bookings(db, query, fuzzy, hair_artist_id, 21, offset)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p50, p95 = timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    found = ""
+    if expect is not None:
+        ids = [booking.id for booking in results]
+        found = f"  booking {expect} at #{ids.index(expect) + 1}" if expect in ids else f"  booking {expect} NOT FOUND"
+    print(f"{label:<36} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  results {len(results):>2}{found}")
+    return p95
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure booking search latency on a synthetic bookings table")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--archive-after-days", type=int, default=90,
+                        help="Archive bookings older than this many days once built, so searches span both tables; "
+                             "0 keeps every booking live")
+    parser.add_argument("--db", help="Database file to reuse (built on first run); defaults to the temp directory")
+    args = parser.parse_args()
+
+    name = f"benchmark_search_{args.rows}_archive_{args.archive_after_days}.db"
+    path = Path(args.db or os.path.join(tempfile.gettempdir(), name))
+    if not path.exists():
+        build_database(path, args.rows, args.seed)
+        if args.archive_after_days > 0:
+            archive_database(path, args.archive_after_days)
+    engine = create_engine(f"sqlite:///{path}")
+    db = sessionmaker(bind=engine)()
+    try:
+        measure(db, "warm-up", "smith", False, 3)
+        cases = [
+            ("surname", "johnson", False, None),
+            ("full name", "mary garcia", False, None),
+            ("email fragment", "kenji.yamamoto", False, None),
+            ("fuzzy typo", "jonhson", True, None),
+            ("fuzzy full name", "marry garsia", True, None),
+            ("old customer by name", "blackwood", False, OLD_BOOKING_ID),
+            ("old customer fuzzy", "wilhelmina blakwood", True, OLD_BOOKING_ID),
+            ("old customer by phone", "2125550143", False, OLD_BOOKING_ID),
+            ("old customer by phone with +1", "+12125550143", False, OLD_BOOKING_ID),
+            ("old customer by formatted phone", "(212) 555-0143", False, OLD_BOOKING_ID),
+            ("phone digits (local number, any area code)", "5550143", False, None),
+            ("phone digits (555 prefix)", "555", False, None),
+            ("phone digits (country + area code)", "+1212555", False, None),
+            ("phone digits (line)", "0143", False, None),
+        ]
+        p95s = [measure(db, label, query, fuzzy, args.repeat, expect=expect) for label, query, fuzzy, expect in cases]
+        measure(db, "surname, page 20", "johnson", False, args.repeat, offset=19 * 20)
+        measure(db, "surname, one artist", "johnson", False, args.repeat, hair_artist_id=3)
+        print(f"Worst p95: {max(p95s):.2f} ms")
+    finally:
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
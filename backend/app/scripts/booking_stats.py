@@ -0,0 +1,38 @@
+import argparse
+from datetime import datetime
+from app.models.database import SessionLocal
+from app.utils.booking_stats import rebuild_stats, verify_stats
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the booking_daily_stats reporting table")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--start", help="First date (YYYY-MM-DD); defaults to all history")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD); defaults to all future bookings")
+    args = parser.parse_args()
+    start, end = parse_date(args.start), parse_date(args.end)
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            rows = rebuild_stats(db, start, end)
+            print(f"Rebuilt booking_daily_stats: {rows} rows")
+            return 0
+
+        drift = verify_stats(db, start, end)
+        for entry in drift:
+            print(f"Drift for artist {entry['hair_artist_id']} on {entry['date']}, service {entry['service_id']}: "
+                  f"expected {entry['expected']}, found {entry['actual']}")
+        print("booking_daily_stats is consistent" if not drift else f"{len(drift)} drifted rows; run 'rebuild' to fix")
+        return 1 if drift else 0
+    except Exception as e:
+        db.rollback()
+        print(f"Error processing booking stats: {str(e)}")
+        return 2
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    raise SystemExit(main())
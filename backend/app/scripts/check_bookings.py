@@ -0,0 +1,44 @@
+import argparse
+import json
+from app.models.database import SessionLocal
+from app.utils.booking_consistency import ConsistencyCheck, cancel_duplicate_bookings
+
+def describe(issue):
+    where = f"booking {issue['booking_id']} (artist {issue['hair_artist_id']}, {issue['date']} {issue['time']})"
+    if issue["type"] == "overlap":
+        return f"Overlap: {where} overlaps booking {issue['overlaps']}"
+    if issue["type"] == "duplicate":
+        return f"Duplicate: {where} repeats booking {issue['duplicate_of']}"
+    if issue["type"] == "unknown_service":
+        return f"Unknown service: {where} has service {issue['service']!r}"
+    return f"Unknown hair artist: {where}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Report overlapping, duplicate and orphaned active bookings")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per issue, then a summary")
+    parser.add_argument("--cancel-duplicates", action="store_true",
+                        help="Cancel bookings that repeat an earlier booking of the same customer and slot")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        check = ConsistencyCheck(db)
+        for issue in check.issues():
+            print(json.dumps(issue) if args.json else describe(issue))
+        summary = check.summary()
+        if args.cancel_duplicates:
+            summary["cancelled"] = cancel_duplicate_bookings(db, check.duplicate_ids)
+        if args.json:
+            print(json.dumps({"type": "summary", **summary}))
+        else:
+            print(", ".join(f"{key}: {value}" for key, value in summary.items()))
+        return 1 if any(check.counts.values()) else 0
+    except Exception as e:
+        db.rollback()
+        print(f"Error checking bookings: {str(e)}")
+        return 2
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,5 @@
 from app.models.database import SessionLocal, Service
+from app.utils.cache_versions import cache_versions
 from datetime import datetime
 
 def update_services():
@@ -18,6 +19,7 @@ def update_services():
                 print(f"Service {service_name} not found")
         
         db.commit()
+        cache_versions.publish(db, "catalog")
         print("Successfully updated services")
     except Exception as e:
         print(f"Error updating services: {str(e)}")
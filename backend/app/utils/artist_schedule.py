@@ -0,0 +1,127 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import ArtistShift, ArtistBreak, ArtistTimeOff
+from .availability import (
+    MinuteInterval,
+    MINUTES_PER_DAY,
+    to_minutes,
+    merge_intervals,
+    intersect_intervals,
+    subtract_intervals
+)
+from .business_calendar import business_calendar
+from .cache_versions import cache_versions
+from .slot_holds import get_unavailable_intervals
+
+SCHEDULE_WINDOW_DAYS = 31  # Days compiled per cache miss
+MAX_CACHED_ARTIST_DAYS = 20000
+
+
+class ArtistScheduleCache:
+    """Per artist-day working intervals: opening hours ∩ shifts − breaks − time off.
+
+    Each entry is a sorted tuple of disjoint (start, end) minute intervals. A
+    cache miss compiles a whole window of days for the artist with three
+    queries. Entries are tagged with the business calendar generation, so an
+    opening-hours edit also invalidates them; schedule edits must publish the
+    "artist_schedules" cache version keyed by the affected artist.
+    """
+
+    def __init__(self):
+        self._days: Dict[Tuple[int, date], Tuple[int, Tuple[MinuteInterval, ...]]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, hair_artist_id: int = None):
+        with self._lock:
+            if hair_artist_id is None:
+                self._days.clear()
+            else:
+                for key in [k for k in self._days if k[0] == hair_artist_id]:
+                    del self._days[key]
+            self._generation += 1
+
+    def compile_range(self, db: Session, hair_artist_id: int, start: date, end: date) -> Dict[date, Tuple[MinuteInterval, ...]]:
+        """Compile working intervals for the artist on every date in [start, end]"""
+        shifts = db.query(ArtistShift).filter(ArtistShift.hair_artist_id == hair_artist_id).all()
+        breaks = db.query(ArtistBreak).filter(ArtistBreak.hair_artist_id == hair_artist_id).all()
+        time_off = db.query(ArtistTimeOff).filter(
+            ArtistTimeOff.hair_artist_id == hair_artist_id,
+            ArtistTimeOff.start < datetime.combine(end + timedelta(days=1), datetime.min.time()),
+            ArtistTimeOff.end > datetime.combine(start, datetime.min.time())
+        ).order_by(ArtistTimeOff.start).all()
+
+        days: Dict[date, Tuple[MinuteInterval, ...]] = {}
+        current = start
+        while current <= end:
+            opening = [(to_minutes(o), to_minutes(c)) for o, c in business_calendar.get_intervals(db, current)]
+
+            if shifts:
+                matching = [
+                    s for s in shifts
+                    if s.weekday == current.weekday()
+                    and (s.valid_from is None or s.valid_from <= current)
+                    and (s.valid_to is None or s.valid_to >= current)
+                ]
+                dated = [s for s in matching if s.valid_from is not None or s.valid_to is not None]
+                working = merge_intervals(sorted(
+                    (to_minutes(s.start_time), to_minutes(s.end_time)) for s in (dated or matching)
+                ))
+                working = intersect_intervals(opening, working)
+            else:
+                # Artists without a configured schedule work the full salon day
+                working = opening
+
+            blocked: List[MinuteInterval] = [
+                (to_minutes(b.start_time), to_minutes(b.end_time))
+                for b in breaks
+                if b.weekday is None or b.weekday == current.weekday()
+            ]
+            day_start = datetime.combine(current, datetime.min.time())
+            for entry in time_off:
+                if entry.start < day_start + timedelta(days=1) and entry.end > day_start:
+                    start_minutes = max(0, int((entry.start - day_start).total_seconds() // 60))
+                    end_minutes = min(MINUTES_PER_DAY, -int(-(entry.end - day_start).total_seconds() // 60))
+                    blocked.append((start_minutes, end_minutes))
+
+            days[current] = tuple(subtract_intervals(working, sorted(blocked)))
+            current += timedelta(days=1)
+        return days
+
+    def get_working_intervals(self, db: Session, hair_artist_id: int, day: date) -> Tuple[MinuteInterval, ...]:
+        """Return the artist's working intervals for a date; an empty tuple means unavailable"""
+        cache_versions.sync(db)
+        calendar_generation = business_calendar.generation
+        entry = self._days.get((hair_artist_id, day))
+        if entry is not None and entry[0] == calendar_generation:
+            return entry[1]
+
+        generation = self._generation
+        compiled = self.compile_range(db, hair_artist_id, day, day + timedelta(days=SCHEDULE_WINDOW_DAYS - 1))
+        with self._lock:
+            # Drop the result if a schedule edit invalidated the cache while we were compiling
+            if generation == self._generation:
+                if len(self._days) + len(compiled) > MAX_CACHED_ARTIST_DAYS:
+                    self._days.clear()
+                for compiled_day, intervals in compiled.items():
+                    self._days[(hair_artist_id, compiled_day)] = (calendar_generation, intervals)
+        return compiled[day]
+
+    def is_working(self, db: Session, hair_artist_id: int, day: date, start: int, end: int) -> bool:
+        """Check that the minute interval [start, end) lies within one working interval"""
+        return any(s <= start and end <= e for s, e in self.get_working_intervals(db, hair_artist_id, day))
+
+
+artist_schedules = ArtistScheduleCache()
+cache_versions.subscribe(
+    "artist_schedules",
+    lambda key: artist_schedules.invalidate(int(key) if key else None)
+)
+
+
+def get_free_intervals(db: Session, hair_artist_id: int, day: date):
+    """Return an artist's (working, free) minute intervals for a date; free excludes active bookings and slot holds"""
+    working_intervals = artist_schedules.get_working_intervals(db, hair_artist_id, day)
+    return working_intervals, subtract_intervals(working_intervals, get_unavailable_intervals(db, hair_artist_id, day))
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, date, time
+from typing import List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from ..models.database import Booking, Service
+
+DEFAULT_DURATION_MINUTES = 30  # Used when a booking's service cannot be resolved
+MINUTES_PER_DAY = 24 * 60
+
+# Half-open [start, end) interval in minutes since midnight
+MinuteInterval = Tuple[int, int]
+
+
+def resolve_service(db: Session, service_id: Optional[int] = None, service_name: Optional[str] = None) -> Optional[Service]:
+    """Look up a service by id, falling back to the legacy name-based alias"""
+    if service_id:
+        return db.query(Service).filter(Service.id == service_id).first()
+    if service_name:
+        return db.query(Service).filter(Service.name == service_name).first()
+    return None
+
+
+def booking_end_time(start: time, duration_minutes: int) -> time:
+    """Compute the end time of an appointment starting at `start`.
+
+    Appointments must end before midnight: a wrapped end time (23:30 + 60
+    minutes = 00:30) would make every range comparison on the day wrong.
+    """
+    if to_minutes(start) + duration_minutes >= MINUTES_PER_DAY:
+        raise HTTPException(status_code=400, detail="Appointments must end before midnight")
+    return from_minutes(to_minutes(start) + duration_minutes)
+
+
+def booked_interval(start: time, end: time) -> MinuteInterval:
+    """Minute interval of a stored booking or hold; legacy rows whose end wrapped past midnight occupy the rest of their day"""
+    start_minutes, end_minutes = to_minutes(start), to_minutes(end)
+    return start_minutes, end_minutes if end_minutes > start_minutes else MINUTES_PER_DAY
+
+
+def find_conflicting_booking(
+    db: Session,
+    hair_artist_id: int,
+    booking_date: date,
+    start: time,
+    end: time,
+    exclude_booking_id: Optional[int] = None
+) -> Optional[Booking]:
+    """Return an active booking overlapping [start, end) for the artist, if any.
+
+    This is a pure range predicate on the bookings table, served by
+    ix_bookings_artist_date_time without joining back to services.
+    """
+    query = db.query(Booking).filter(
+        Booking.hair_artist_id == hair_artist_id,
+        Booking.date == booking_date,
+        Booking.time < end,
+        or_(Booking.end_time > start, Booking.end_time <= Booking.time),  # Legacy rows may wrap past midnight
+        Booking.status != "cancelled"
+    )
+    if exclude_booking_id is not None:
+        query = query.filter(Booking.id != exclude_booking_id)
+    return query.first()
+
+
+def get_booked_intervals(db: Session, hair_artist_id: int, booking_date: date) -> List[MinuteInterval]:
+    """Active bookings of an artist on a date as minute intervals sorted by start"""
+    return [
+        booked_interval(start, end)
+        for start, end in db.query(Booking.time, Booking.end_time).filter(
+            Booking.date == booking_date,
+            Booking.hair_artist_id == hair_artist_id,
+            Booking.status != "cancelled"
+        ).order_by(Booking.time).all()
+    ]
+
+
+def earliest_start_minutes(booking_date: date, now: datetime) -> int:
+    """First bookable minute on a date: the next whole minute for today, midnight otherwise"""
+    if booking_date != now.date():
+        return 0
+    return now.hour * 60 + now.minute + (1 if now.second or now.microsecond else 0)
+
+
+def to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def from_minutes(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+def merge_intervals(intervals: Sequence[MinuteInterval]) -> List[MinuteInterval]:
+    """Merge overlapping or touching intervals of a list sorted by start"""
+    merged: List[MinuteInterval] = []
+    for start, end in intervals:
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersect_intervals(a: Sequence[MinuteInterval], b: Sequence[MinuteInterval]) -> List[MinuteInterval]:
+    """Intersect two sorted, disjoint interval lists in O(len(a) + len(b))"""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def subtract_intervals(a: Sequence[MinuteInterval], b: Sequence[MinuteInterval]) -> List[MinuteInterval]:
+    """Remove the intervals in b (sorted by start, possibly overlapping) from sorted, disjoint a"""
+    b = merge_intervals(b)
+    result = []
+    j = 0
+    for start, end in a:
+        # Skip removals that end before this interval starts; they cannot affect later intervals either
+        while j < len(b) and b[j][1] <= start:
+            j += 1
+        k = j
+        while k < len(b) and b[k][0] < end:
+            if b[k][0] > start:
+                result.append((start, b[k][0]))
+            start = max(start, b[k][1])
+            k += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def start_ranges(free: Sequence[MinuteInterval], offset: int, duration: int) -> List[MinuteInterval]:
+    """Translate free intervals into the half-open ranges of basket start times for one basket item.
+
+    An item that begins `offset` minutes after the basket start and lasts
+    `duration` minutes fits when the basket starts in [free_start - offset,
+    free_end - offset - duration]. Intersecting these ranges across items gives
+    the starts at which the whole basket fits.
+    """
+    return [
+        (start - offset, end - offset - duration + 1)
+        for start, end in free
+        if end - start >= duration
+    ]
+
+
+def generate_slots(
+    working: Sequence[MinuteInterval],
+    free: Sequence[MinuteInterval],
+    duration: int,
+    slot_gap: int,
+    earliest: int = 0,
+    first_slot_step: Optional[int] = None
+) -> List[int]:
+    """Walk the slot grid of each working interval and keep the starts that fit in a free interval.
+
+    The grid is anchored at the start of each working interval (or `earliest`, for
+    same-day requests). Candidates and free intervals are both sorted, so a single
+    forward pointer over `free` tests every candidate in linear time overall.
+    Until the first slot is found, `first_slot_step` can replace the slot gap to
+    locate the exact earliest opening.
+    """
+    slots = []
+    p = 0
+    for start, end in working:
+        current = max(start, earliest)
+        while current + duration <= end:
+            slot_end = current + duration
+            # Free intervals ending before this slot ends cannot hold it or any later slot
+            while p < len(free) and free[p][1] < slot_end:
+                p += 1
+            if p < len(free) and free[p][0] <= current:
+                slots.append(current)
+            if not slots and first_slot_step:
+                current += min(first_slot_step, slot_gap)
+            else:
+                current += slot_gap
+    return slots
@@ -0,0 +1,127 @@
+import heapq
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.orm import Session
+from ..models.database import AppMetadata, Booking, BookingArchive, dialect_insert
+from .booking_events import bump_booking_versions
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("BOOKING_ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVED_BEFORE_KEY = "bookings_archived_before"
+
+ARCHIVED_COLUMNS = [column.name for column in Booking.__table__.columns]
+
+
+def archived_before(db: Session) -> Optional[date]:
+    """The archive horizon: bookings dated before it may live in bookings_archive. None if never archived."""
+    value = db.query(AppMetadata.value).filter(AppMetadata.key == ARCHIVED_BEFORE_KEY).scalar()
+    return date.fromisoformat(value) if value else None
+
+
+def booking_tables(db: Session, start: Optional[date] = None) -> list:
+    """Models to read for bookings dated from `start` (None for all history), oldest first.
+
+    The archive is only included when the range reaches before the archive
+    horizon, so queries about current and future bookings stay on the small
+    live table.
+    """
+    horizon = archived_before(db)
+    if horizon is not None and (start is None or start < horizon):
+        return [BookingArchive, Booking]
+    return [Booking]
+
+
+def _newest_first_key(booking) -> tuple:
+    # None cannot be compared with a date or time, so missing values rank below every real one
+    return (
+        booking.date is not None, booking.date or date.min,
+        booking.time is not None, booking.time or time.min
+    )
+
+
+def latest_customer_bookings(db: Session, customer_id: int, offset: int, limit: int) -> list:
+    """A customer's bookings newest first, merged across the live and archive tables.
+
+    Each table returns its own newest `offset + limit` rows through its
+    (customer_id, date, time) index, and the sorted streams are merged.
+    Bookings without a date or time sort after those with one, in SQL and
+    in the merge alike.
+    """
+    streams = [
+        db.query(model).filter(model.customer_id == customer_id)
+        .order_by(model.date.desc().nullslast(), model.time.desc().nullslast()).limit(offset + limit).all()
+        for model in booking_tables(db)
+    ]
+    if len(streams) == 1:
+        return streams[0][offset:offset + limit]
+    merged = heapq.merge(*streams, key=_newest_first_key, reverse=True)
+    return list(merged)[offset:offset + limit]
+
+
+def _set_archived_before(db: Session, horizon: date):
+    statement = dialect_insert(db)(AppMetadata).values(
+        key=ARCHIVED_BEFORE_KEY, value=horizon.isoformat(), updated_at=datetime.now()
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[AppMetadata.key],
+        set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at}
+    ))
+    db.commit()
+
+
+def archive_bookings(db: Session, before: Optional[date] = None, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move bookings dated before `before` into bookings_archive in batches; returns the number moved.
+
+    Defaults to ARCHIVE_AFTER_DAYS before today. Only bookings dated before
+    today can be archived: availability, reminders, holds and the consistency
+    check read the live table alone, so an archived upcoming booking would
+    free its slot for a second booking. Each batch is copied and
+    deleted in its own transaction, so the job can be stopped and rerun at any
+    point and every booking is always in exactly one of the two tables. The
+    horizon is recorded first, so readers start including the archive before
+    the first row moves. Each batch bumps the bookings cache versions of the
+    artists it touched, so calendar feeds drop the moved rows. Daily stats
+    are left as they are: archived bookings still count in reports.
+    """
+    if before is None:
+        if ARCHIVE_AFTER_DAYS < 1:
+            raise ValueError(f"BOOKING_ARCHIVE_AFTER_DAYS must be at least 1, got {ARCHIVE_AFTER_DAYS}")
+        before = date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    if before > date.today():
+        raise ValueError(f"Cannot archive bookings dated from today on (before={before})")
+    horizon = archived_before(db)
+    if horizon is None or before > horizon:
+        _set_archived_before(db, before)
+
+    # SQLite reuses the highest rowid once it is deleted, and a reused id would clash
+    # with the archived copy, so the newest booking always stays in the live table
+    newest_id = db.query(func.max(Booking.id)).scalar()
+    bookings = Booking.__table__
+    moved = 0
+    last_id = 0
+    while True:
+        ids = [
+            booking_id for (booking_id,) in db.query(Booking.id).filter(
+                Booking.id > last_id,
+                Booking.id != newest_id,
+                Booking.date < before
+            ).order_by(Booking.id).limit(batch_size)
+        ]
+        if not ids:
+            break
+
+        db.execute(insert(BookingArchive).from_select(
+            ARCHIVED_COLUMNS + ["archived_at"],
+            select(*[bookings.c[name] for name in ARCHIVED_COLUMNS], literal(datetime.utcnow()))
+            .where(bookings.c.id.in_(ids))
+        ))
+        affected = db.query(Booking.hair_artist_id, Booking.date).filter(Booking.id.in_(ids)).distinct().all()
+        db.query(Booking).filter(Booking.id.in_(ids)).delete(synchronize_session=False)
+        bump_booking_versions(db, affected)
+        db.commit()
+        moved += len(ids)
+        last_id = ids[-1]
+        print(f"Archived {moved} bookings dated before {before}")
+    return moved
@@ -0,0 +1,143 @@
+import heapq
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import Booking, HairArtist, Service
+from .availability import DEFAULT_DURATION_MINUTES, MINUTES_PER_DAY, to_minutes, booked_interval
+from .booking_events import booking_events, bump_booking_versions
+from .booking_stats import record_booking
+
+CHECK_BATCH_SIZE = 1000  # Bookings loaded per round trip while scanning
+CANCEL_BATCH_SIZE = 500  # Duplicates cancelled per transaction
+
+
+def _booked_minutes(booking) -> Tuple[int, int]:
+    if booking.end_time is not None:
+        return booked_interval(booking.time, booking.end_time)
+    start = to_minutes(booking.time)
+    return start, min(start + (booking.duration_minutes or DEFAULT_DURATION_MINUTES), MINUTES_PER_DAY)
+
+
+def _customer_key(booking) -> Optional[tuple]:
+    if booking.customer_id is not None:
+        return ("customer", booking.customer_id)
+    if booking.email:
+        return ("email", booking.email.strip().lower())
+    if booking.phone:
+        return ("phone", booking.phone.strip())
+    return None
+
+
+class ConsistencyCheck:
+    """One pass over the active bookings that reports overlaps and orphans.
+
+    Bookings are streamed in (artist, date, time) order straight off the
+    ix_bookings_artist_date_time index, so the database does no sort and the
+    scan holds one batch plus the bookings still running at the current
+    start time, however many rows the table has. Each artist-day is swept
+    with a min-heap of end times: bookings that ended before the next start
+    are popped, and whatever is left overlaps it, which is O(n log n) plus
+    one entry per overlapping pair.
+
+    An overlap with the same customer and start time as an earlier booking
+    is reported as a duplicate (a resubmitted booking) instead; only those
+    are safe to cancel automatically and their ids are kept in
+    `duplicate_ids`. Orphans are bookings whose service name is not in the
+    catalog or whose hair artist no longer exists. Only the live table is
+    checked: archived bookings are in the past and cannot be acted on.
+    """
+
+    def __init__(self, db: Session, batch_size: int = CHECK_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.checked = 0
+        self.counts = Counter()
+        self.duplicate_ids: List[int] = []
+
+    def issues(self) -> Iterator[dict]:
+        service_names = {name for (name,) in self.db.query(Service.name)}
+        hair_artist_ids = {artist_id for (artist_id,) in self.db.query(HairArtist.id)}
+        bookings = self.db.query(
+            Booking.id, Booking.hair_artist_id, Booking.date, Booking.time, Booking.end_time,
+            Booking.duration_minutes, Booking.service, Booking.service_id,
+            Booking.customer_id, Booking.email, Booking.phone
+        ).filter(
+            Booking.status != "cancelled"
+        ).order_by(
+            Booking.hair_artist_id, Booking.date, Booking.time, Booking.end_time, Booking.id
+        ).yield_per(self.batch_size)
+
+        day = None
+        running = []  # (end, start, id, customer key) of bookings not yet ended
+        for booking in bookings:
+            self.checked += 1
+            if booking.hair_artist_id not in hair_artist_ids:
+                yield self._issue("unknown_artist", booking)
+            if booking.service not in service_names:
+                yield self._issue("unknown_service", booking, service=booking.service, service_id=booking.service_id)
+            if booking.hair_artist_id is None or booking.date is None or booking.time is None:
+                continue
+
+            if (booking.hair_artist_id, booking.date) != day:
+                day = (booking.hair_artist_id, booking.date)
+                running = []
+            start, end = _booked_minutes(booking)
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+
+            customer = _customer_key(booking)
+            duplicate_of = next((
+                other_id for _, other_start, other_id, other_customer in running
+                if other_start == start and customer is not None and other_customer == customer
+            ), None)
+            if duplicate_of is not None:
+                self.duplicate_ids.append(booking.id)
+                yield self._issue("duplicate", booking, duplicate_of=duplicate_of)
+                continue  # It would repeat the overlaps of the booking it duplicates
+            for _, _, other_id, _ in sorted(running, key=lambda entry: entry[2]):
+                yield self._issue("overlap", booking, overlaps=other_id)
+            heapq.heappush(running, (end, start, booking.id, customer))
+
+    def _issue(self, kind: str, booking, **details) -> dict:
+        self.counts[kind] += 1
+        return {
+            "type": kind,
+            "booking_id": booking.id,
+            "hair_artist_id": booking.hair_artist_id,
+            "date": booking.date.isoformat() if booking.date else None,
+            "time": booking.time.strftime("%H:%M") if booking.time else None,
+            **details
+        }
+
+    def summary(self) -> dict:
+        return {"checked": self.checked, **{kind: self.counts[kind] for kind in
+                ("overlap", "duplicate", "unknown_service", "unknown_artist")}}
+
+
+def cancel_duplicate_bookings(db: Session, booking_ids: Iterable[int], batch_size: int = CANCEL_BATCH_SIZE) -> int:
+    """Cancel the given bookings in batches, keeping the daily stats and caches in step; returns the number cancelled.
+
+    The booking each one duplicates keeps the slot, so no waitlist offers
+    are made.
+    """
+    booking_ids = list(booking_ids)
+    cancelled = 0
+    for i in range(0, len(booking_ids), batch_size):
+        bookings = db.query(Booking).filter(
+            Booking.id.in_(booking_ids[i:i + batch_size]),
+            Booking.status != "cancelled"
+        ).all()
+        for booking in bookings:
+            record_booking(db, booking, -1)
+            booking.status = "cancelled"
+        if bookings:
+            bump_booking_versions(db, [(booking.hair_artist_id, booking.date) for booking in bookings])
+        db.commit()
+        if bookings:
+            booking_events.publish(
+                "cancelled",
+                [booking.id for booking in bookings],
+                [(booking.hair_artist_id, booking.date) for booking in bookings]
+            )
+        cancelled += len(bookings)
+    return cancelled
@@ -0,0 +1,72 @@
+import threading
+from collections import deque
+from datetime import date
+from typing import Callable, Deque, Iterable, List, NamedTuple, Tuple
+from sqlalchemy.orm import Session
+from .cache_versions import cache_versions
+
+MAX_RECENT_EVENTS = 1000
+BOOKINGS_VERSION = "bookings"  # Cache version bumped by every booking change
+ARTIST_BOOKINGS_VERSION = "artist_bookings"  # Bumped per artist whose bookings a change touched
+
+
+class BookingChange(NamedTuple):
+    sequence: int
+    action: str  # "created", "cancelled" or "rescheduled"
+    booking_ids: Tuple[int, ...]
+    affected: Tuple[Tuple[int, date], ...]  # (hair_artist_id, date) pairs whose availability changed
+
+
+class BookingEventBus:
+    """In-process publisher of booking changes.
+
+    Events name exactly the (artist, date) pairs whose availability changed,
+    so subscribers (caches, the waitlist, future push channels) can update
+    those days instead of recomputing everything. Events are published after
+    the transaction commits; a failing subscriber is logged and does not
+    affect the request or the other subscribers. Writers bump the bookings
+    cache versions with bump_booking_versions() in the transaction itself,
+    so readers in other processes never depend on a subscriber having run.
+    """
+
+    def __init__(self, max_recent: int = MAX_RECENT_EVENTS):
+        self._subscribers: List[Callable[[BookingChange], None]] = []
+        self._recent: Deque[BookingChange] = deque(maxlen=max_recent)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: Callable[[BookingChange], None]):
+        self._subscribers.append(handler)
+
+    def publish(self, action: str, booking_ids, affected) -> BookingChange:
+        # Deduplicate while keeping order, e.g. a reschedule within the same artist and day
+        affected = tuple(dict.fromkeys(affected))
+        with self._lock:
+            self._sequence += 1
+            event = BookingChange(self._sequence, action, tuple(booking_ids), affected)
+            self._recent.append(event)
+        for handler in self._subscribers:
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Error handling booking event {event.sequence}: {str(e)}")
+        return event
+
+    def since(self, sequence: int) -> List[BookingChange]:
+        """Events after `sequence` that are still retained, oldest first"""
+        with self._lock:
+            return [event for event in self._recent if event.sequence > sequence]
+
+
+booking_events = BookingEventBus()
+
+
+def bump_booking_versions(db: Session, affected: Iterable[Tuple[int, date]]):
+    """Bump the bookings version and the version of each artist in `affected`, before the change commits.
+
+    One statement in the writer's own transaction, so the versions cost no
+    extra commit and can never disagree with the bookings they describe.
+    """
+    cache_versions.bump(db, [BOOKINGS_VERSION] + [
+        f"{ARTIST_BOOKINGS_VERSION}:{hair_artist_id}" for hair_artist_id, _ in affected if hair_artist_id
+    ])
@@ -0,0 +1,325 @@
+import re
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from ..models.database import Booking, BookingArchive
+from .booking_archive import booking_tables
+from .customers import normalize_phone
+
+MIN_QUERY_LENGTH = 3  # Trigram indexes cannot serve shorter terms
+MIN_PHONE_DIGITS = 6  # Digit queries at least this long are matched against phone digits only
+MIN_FULL_NUMBER_DIGITS = 8  # Shorter unpunctuated digit queries are only matched against customer phone keys
+MAX_PAGE_SIZE = 100
+# Newest exact matches ranked by bm25, per table; older ones follow, most recent first
+EXACT_CANDIDATES = 200
+BM25_K1 = 1.2  # FTS5's bm25() parameters
+BM25_B = 0.75
+# Newest matches of each fuzzy candidate query that are scored, per table
+FUZZY_CANDIDATES = 200
+
+PHONE_QUERY = re.compile(r"\+?[\d\s().-]+")
+
+# Table and trigram index searched for the bookings of each model; ids are unique across both tables
+SEARCH_TABLES = {
+    Booking: ("bookings", "bookings_fts"),
+    BookingArchive: ("bookings_archive", "bookings_archive_fts")
+}
+
+
+def _trigrams(term: str) -> List[str]:
+    return [term[i:i + 3] for i in range(len(term) - 2)]
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _terms(query: str) -> List[str]:
+    return [term for term in query.lower().split() if len(term) >= MIN_QUERY_LENGTH]
+
+
+def _match_terms(query: str) -> List[str]:
+    if PHONE_QUERY.fullmatch(query.strip()):
+        return [group for group in re.findall(r"\d+", query) if len(group) >= MIN_QUERY_LENGTH]
+    return _terms(query)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """An FTS5 MATCH expression over the trigram index requiring every term as a substring (which includes prefixes).
+
+    Short digit queries are matched by their digit groups alone, whatever
+    punctuation the number was entered or typed with; longer ones are
+    served by _search_sqlite_phone.
+    """
+    terms = _match_terms(query)
+    if not terms:
+        return None
+    return " AND ".join(_fts_phrase(term) for term in terms)
+
+
+def build_fuzzy_match_queries(query: str) -> List[str]:
+    """FTS5 MATCH expressions whose newest matches are the fuzzy candidates.
+
+    The first matches any four-character chunk of a term (a three-character
+    term stands for itself), which finds rows of any age that share a run
+    with a misspelled term; the second matches any trigram, for misspellings
+    that break every chunk.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    chunks = dict.fromkeys(term[i:i + 4] for term in terms for i in range(max(1, len(term) - 3)))
+    grams = dict.fromkeys(gram for term in terms for gram in _trigrams(term))
+    return [" OR ".join(_fts_phrase(chunk) for chunk in chunks), " OR ".join(_fts_phrase(gram) for gram in grams)]
+
+
+def phone_digits(query: str) -> Optional[str]:
+    """The digits of a query that looks like a phone number with at least MIN_PHONE_DIGITS of them, else None"""
+    query = query.strip()
+    if not PHONE_QUERY.fullmatch(query):
+        return None
+    digits = re.sub(r"\D", "", query)
+    return digits if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+def bm25_scores(terms: List[str], rows: List[tuple]) -> List[float]:
+    """Okapi BM25 of each row's (name, email, phone) for `terms`, higher is better, as FTS5's bm25() over trigrams.
+
+    Every row must contain every term, as exact matches do, so each term is
+    weighted equally: its IDF would be the same for all of them. The average
+    row length is taken over `rows`.
+    """
+    lengths = [sum(max(len(value or "") - 2, 0) for value in row) for row in rows]
+    average = sum(lengths) / len(lengths) if lengths else 0
+    # A customer's bookings repeat the same name, email and phone, so each row is scored once
+    row_scores: Dict[tuple, float] = {}
+    for row, length in zip(rows, lengths):
+        if row in row_scores:
+            continue
+        values = [(value or "").lower() for value in row]
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average) if average else BM25_K1
+        score = 0.0
+        for term in terms:
+            frequency = sum(value.count(term) for value in values)
+            score += frequency * (BM25_K1 + 1) / (frequency + norm)
+        row_scores[row] = score
+    return [row_scores[row] for row in rows]
+
+
+def similarity(query_grams: Set[str], value: Optional[str]) -> float:
+    """Share of trigrams in common, as pg_trgm's similarity() (without its word padding)"""
+    value = (value or "").lower()
+    grams = {value[i:i + 3] for i in range(len(value) - 2)}
+    if not grams or not query_grams:
+        return 0.0
+    shared = len(query_grams & grams)
+    return shared / (len(query_grams) + len(grams) - shared)
+
+
+def _search_sqlite(db: Session, tables: List[Tuple[str, str]], query: str, fuzzy: bool,
+                   hair_artist_id: Optional[int], limit: int, offset: int) -> List[int]:
+    artist_filter = "AND b.hair_artist_id = :hair_artist_id" if hair_artist_id is not None else ""
+    if fuzzy:
+        return _search_sqlite_fuzzy(db, tables, query, artist_filter, hair_artist_id, limit, offset)
+    digits = phone_digits(query)
+    if digits is not None:
+        # Keys keep a leading + only when it was entered, so only a query with one must start the key
+        key = ("+" if query.strip().startswith("+") else "") + digits
+        customer_ids = [row[0] for row in db.execute(text(
+            "SELECT rowid FROM customers_phone_fts WHERE customers_phone_fts MATCH :key"
+        ), {"key": _fts_phrase(key)})]
+        rows = {}
+        for table, fts in tables:
+            rows.update(_search_sqlite_phone(db, table, fts, query, key, customer_ids, artist_filter,
+                                             hair_artist_id, offset + limit))
+        ranked = sorted(rows.items(), key=lambda item: (item[1] or "", item[0]), reverse=True)
+        return [booking_id for booking_id, _ in ranked[offset:offset + limit]]
+
+    return _search_sqlite_exact(db, tables, query, artist_filter, hair_artist_id, limit, offset)
+
+
+def _search_sqlite_exact(db: Session, tables: List[Tuple[str, str]], query: str, artist_filter: str,
+                         hair_artist_id: Optional[int], limit: int, offset: int) -> List[int]:
+    """Exact matches by bm25 relevance, then most recent date first.
+
+    The newest EXACT_CANDIDATES matches of each table, which FTS5 finds by
+    walking the match in rowid order, are ranked together by bm25_scores()
+    and any older ones are listed after them, most recent first. FTS5's own
+    bm25() would first count every match of each term for its IDF, over
+    100 ms for a mail domain on a million rows, to scale scores that all
+    candidates share.
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+    params = {"match": match, "hair_artist_id": hair_artist_id, "candidates": EXACT_CANDIDATES}
+    candidates, full = [], []
+    for table, fts in tables:
+        rows = db.execute(text(
+            f"SELECT b.id, b.date, b.name, b.email, b.phone FROM {fts} JOIN {table} b ON b.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :match {artist_filter} ORDER BY {fts}.rowid DESC LIMIT :candidates"
+        ), params).all()
+        candidates.extend(rows)
+        if len(rows) == EXACT_CANDIDATES:
+            full.append((table, fts))
+    scores = bm25_scores(_match_terms(query), [row[2:] for row in candidates])
+    ranked = sorted(zip(scores, candidates), key=lambda item: (item[0], item[1][1] or "", item[1][0]), reverse=True)
+    ids = [row[0] for _, row in ranked]
+
+    wanted = offset + limit - len(ids)
+    if wanted > 0 and full:
+        older = []
+        for table, fts in full:
+            older.extend(db.execute(text(
+                f"SELECT b.id, b.date FROM {fts} JOIN {table} b ON b.id = {fts}.rowid "
+                f"WHERE {fts} MATCH :match {artist_filter} ORDER BY {fts}.rowid DESC LIMIT :limit OFFSET :candidates"
+            ), {**params, "limit": wanted}))
+        older.sort(key=lambda row: (row[1] or "", row[0]), reverse=True)
+        ids.extend(row[0] for row in older)
+    return ids[offset:offset + limit]
+
+
+def _search_sqlite_phone(db: Session, table: str, fts: str, query: str, key: str, customer_ids: List[int],
+                         artist_filter: str, hair_artist_id: Optional[int], wanted: int) -> Dict[int, Optional[str]]:
+    """Bookings whose phone contains the query's digits, whatever the punctuation of either, by id with their date.
+
+    Two bounded lookups are merged: the bookings of `customer_ids`, the
+    customers whose normalized phone_key contains `key` (so "5551234" finds
+    a booking made as "+1 555 1234"), and index candidates sharing the
+    query's digit groups whose phone digits are then checked, for bookings
+    whose phone differs from their customer's key. A single run of digits is only indexed as typed when
+    the number was entered without punctuation, so for a whole number the
+    candidates are those containing its last four digits; a shorter run is
+    left to the keys. Returns up to the `wanted` most recent matches of each
+    lookup.
+    """
+    rows = {}
+    if customer_ids:
+        # Served by the table's (customer_id, date, time) index
+        rows = dict(db.execute(text(
+            f"SELECT b.id, b.date FROM {table} b WHERE b.customer_id IN :customer_ids {artist_filter} "
+            f"ORDER BY b.date DESC, b.id DESC LIMIT :limit"
+        ).bindparams(bindparam("customer_ids", expanding=True)),
+            {"customer_ids": customer_ids, "hair_artist_id": hair_artist_id, "limit": wanted}).all())
+
+    digits = key.lstrip("+")
+    groups = [group for group in re.findall(r"\d+", query) if len(group) >= MIN_QUERY_LENGTH]
+    if len(groups) > 1:
+        terms = groups
+    elif len(digits) >= MIN_FULL_NUMBER_DIGITS:
+        terms = [digits[-4:]]
+    else:
+        return rows
+    matched = 0
+    for booking_id, booking_date, phone in db.execute(text(
+        f"SELECT b.id, b.date, b.phone FROM {fts} JOIN {table} b ON b.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :match {artist_filter} ORDER BY {fts}.rowid DESC"
+    ), {"match": " AND ".join(f"phone : {_fts_phrase(term)}" for term in terms), "hair_artist_id": hair_artist_id}):
+        phone_key = normalize_phone(phone) or ""
+        if digits in phone_key and (key == digits or phone_key.startswith(key)):
+            rows[booking_id] = booking_date
+            matched += 1
+            if matched == wanted:
+                break
+    return rows
+
+
+def _search_sqlite_fuzzy(db: Session, tables: List[Tuple[str, str]], query: str, artist_filter: str,
+                         hair_artist_id: Optional[int], limit: int, offset: int) -> List[int]:
+    candidates: Dict[int, tuple] = {}
+    for table, fts in tables:
+        for match in build_fuzzy_match_queries(query):
+            for row in db.execute(text(
+                f"SELECT b.id, b.name, b.email, b.phone FROM {fts} JOIN {table} b ON b.id = {fts}.rowid "
+                f"WHERE {fts} MATCH :match {artist_filter} "
+                f"ORDER BY {fts}.rowid DESC LIMIT :candidates"
+            ), {"match": match, "hair_artist_id": hair_artist_id, "candidates": FUZZY_CANDIDATES}):
+                candidates[row[0]] = row[1:]
+
+    query_grams = {gram for term in _terms(query) for gram in _trigrams(term)}
+    # A customer's bookings repeat the same name, email and phone, so each value is scored once
+    value_scores: Dict[Optional[str], float] = {}
+    for values in candidates.values():
+        for value in values:
+            if value not in value_scores:
+                value_scores[value] = similarity(query_grams, value)
+    scores = {booking_id: max(value_scores[value] for value in values) for booking_id, values in candidates.items()}
+    ranked = sorted(scores, key=lambda booking_id: (-scores[booking_id], -booking_id))
+    return ranked[offset:offset + limit]
+
+
+def optimize_search_indexes(db: Session):
+    """Merge the trigram indexes into one segment each (SQLite only).
+
+    Archiving deletes many rows from bookings_fts at once, and the deletions
+    are only recorded, slowing every later match until the index is merged.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return
+    for _, fts in SEARCH_TABLES.values():
+        db.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('optimize')"))
+    db.commit()
+
+
+def _search_postgresql(db: Session, tables: List[Tuple[str, str]], query: str, fuzzy: bool,
+                       hair_artist_id: Optional[int], limit: int, offset: int) -> List[int]:
+    # Served by the pg_trgm GIN indexes on lower(name), lower(email), phone and customers.phone_key
+    term = query.strip().lower()
+    if len(term) < MIN_QUERY_LENGTH:
+        return []
+    key = None
+    if fuzzy:
+        clauses = ["lower(b.name) % :term", "lower(b.email) % :term", "b.phone % :term"]
+    else:
+        clauses = ["lower(b.name) LIKE :pattern", "lower(b.email) LIKE :pattern", "b.phone LIKE :pattern"]
+        digits = phone_digits(query)
+        if digits is not None:
+            # Phone numbers whatever their punctuation, through the pg_trgm index on customers.phone_key
+            clauses.append("b.customer_id IN (SELECT c.id FROM customers c WHERE c.phone_key LIKE :key)")
+            key = ("+" + digits + "%") if term.startswith("+") else ("%" + digits + "%")
+    condition = "(" + " OR ".join(clauses) + ")"
+    artist_filter = "AND b.hair_artist_id = :hair_artist_id" if hair_artist_id is not None else ""
+    pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    rows = []
+    for table, _ in tables:
+        rows.extend(db.execute(text(
+            "SELECT b.id, greatest(similarity(lower(b.name), :term), similarity(lower(b.email), :term), "
+            f"similarity(coalesce(b.phone, ''), :term)) AS score, b.date FROM {table} b "
+            f"WHERE {condition} {artist_filter} ORDER BY score DESC, b.date DESC, b.id DESC LIMIT :limit"
+        ), {"term": term, "pattern": pattern, "key": key, "hair_artist_id": hair_artist_id, "limit": offset + limit}))
+    rows.sort(key=lambda row: (row[1], row[2] or date.min, row[0]), reverse=True)
+    return [row[0] for row in rows[offset:offset + limit]]
+
+
+def search_bookings(
+    db: Session,
+    query: str,
+    fuzzy: bool = False,
+    hair_artist_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Booking]:
+    """Bookings whose customer name, email or phone match `query`, one page of ids at a time.
+
+    The archive is searched too once bookings have been archived. On SQLite,
+    exact searches list every booking containing all terms, by bm25 relevance
+    and then most recent date; a phone number query matches phone digits
+    whatever their punctuation, most recent first. Fuzzy searches score the
+    newest FUZZY_CANDIDATES rows of each candidate query by trigram
+    similarity, best first. The page's rows are then loaded by primary key,
+    so the cost does not grow with the table size; see
+    app/scripts/benchmark_search.py.
+    """
+    models = booking_tables(db)
+    tables = [SEARCH_TABLES[model] for model in models]
+    if db.get_bind().dialect.name == "postgresql":
+        ids = _search_postgresql(db, tables, query, fuzzy, hair_artist_id, limit, offset)
+    else:
+        ids = _search_sqlite(db, tables, query, fuzzy, hair_artist_id, limit, offset)
+    if not ids:
+        return []
+    by_id = {}
+    for model in models:
+        by_id.update((booking.id, booking) for booking in db.query(model).filter(model.id.in_(ids)))
+    return [by_id[booking_id] for booking_id in ids if booking_id in by_id]
@@ -0,0 +1,121 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session
+from ..models.database import Booking, BookingArchive, BookingDailyStats, dialect_insert
+from .availability import DEFAULT_DURATION_MINUTES
+
+UNKNOWN_ID = 0  # Stats key for legacy bookings without an artist or service id
+
+StatsKey = Tuple[int, date, int]
+
+
+def apply_booking_delta(db: Session, hair_artist_id: Optional[int], day: date, service_id: Optional[int],
+                        duration_minutes: Optional[int], sign: int):
+    """Add (sign=1) or remove (sign=-1) one booking from its daily stats row.
+
+    Runs in the caller's transaction, so the stats commit or roll back together
+    with the booking write they describe.
+    """
+    minutes = duration_minutes or DEFAULT_DURATION_MINUTES
+    statement = dialect_insert(db)(BookingDailyStats).values(
+        hair_artist_id=hair_artist_id or UNKNOWN_ID,
+        date=day,
+        service_id=service_id or UNKNOWN_ID,
+        bookings=sign,
+        booked_minutes=sign * minutes
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[BookingDailyStats.hair_artist_id, BookingDailyStats.date, BookingDailyStats.service_id],
+        set_={
+            "bookings": BookingDailyStats.bookings + statement.excluded.bookings,
+            "booked_minutes": BookingDailyStats.booked_minutes + statement.excluded.booked_minutes
+        }
+    ))
+
+
+def record_booking(db: Session, booking: Booking, sign: int = 1):
+    """Count (or uncount) an active booking in booking_daily_stats"""
+    if booking.status == "cancelled":
+        return
+    apply_booking_delta(db, booking.hair_artist_id, booking.date, booking.service_id,
+                        booking.duration_minutes, sign)
+
+
+def _range_filters(model, start: Optional[date], end: Optional[date]):
+    filters = []
+    if start:
+        filters.append(model.date >= start)
+    if end:
+        filters.append(model.date <= end)
+    return filters
+
+
+def _source_query(db: Session, start: Optional[date], end: Optional[date]):
+    """The stats recomputed from the bookings table (and its archive) with one GROUP BY"""
+    source = union_all(*[
+        select(
+            func.coalesce(model.hair_artist_id, UNKNOWN_ID).label("hair_artist_id"),
+            model.date.label("date"),
+            func.coalesce(model.service_id, UNKNOWN_ID).label("service_id"),
+            func.coalesce(model.duration_minutes, DEFAULT_DURATION_MINUTES).label("minutes")
+        ).where(
+            model.status != "cancelled",
+            model.date != None,
+            *_range_filters(model, start, end)
+        )
+        for model in (Booking, BookingArchive)
+    ]).subquery()
+    return db.query(
+        source.c.hair_artist_id,
+        source.c.date,
+        source.c.service_id,
+        func.count().label("bookings"),
+        func.sum(source.c.minutes).label("booked_minutes")
+    ).group_by(source.c.hair_artist_id, source.c.date, source.c.service_id)
+
+
+def rebuild_stats(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """Recompute booking_daily_stats for a date range (everything by default); returns the row count"""
+    db.query(BookingDailyStats).filter(*_range_filters(BookingDailyStats, start, end)).delete(synchronize_session=False)
+    rows = [
+        {
+            "hair_artist_id": row.hair_artist_id,
+            "date": row.date,
+            "service_id": row.service_id,
+            "bookings": row.bookings,
+            "booked_minutes": int(row.booked_minutes)
+        }
+        for row in _source_query(db, start, end)
+    ]
+    if rows:
+        db.bulk_insert_mappings(BookingDailyStats, rows)
+    db.commit()
+    return len(rows)
+
+
+def verify_stats(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> List[dict]:
+    """Compare booking_daily_stats with the bookings and archive tables; returns one entry per drifted key"""
+    expected: Dict[StatsKey, Tuple[int, int]] = {
+        (row.hair_artist_id, row.date, row.service_id): (row.bookings, int(row.booked_minutes))
+        for row in _source_query(db, start, end)
+    }
+    actual: Dict[StatsKey, Tuple[int, int]] = {
+        (row.hair_artist_id, row.date, row.service_id): (row.bookings, row.booked_minutes)
+        for row in db.query(BookingDailyStats).filter(*_range_filters(BookingDailyStats, start, end))
+        # Rows decremented to zero are equivalent to missing rows
+        if row.bookings or row.booked_minutes
+    }
+
+    drift = []
+    for key in sorted(expected.keys() | actual.keys()):
+        if expected.get(key) != actual.get(key):
+            hair_artist_id, day, service_id = key
+            drift.append({
+                "hair_artist_id": hair_artist_id,
+                "date": day.isoformat(),
+                "service_id": service_id,
+                "expected": expected.get(key, (0, 0)),
+                "actual": actual.get(key, (0, 0))
+            })
+    return drift
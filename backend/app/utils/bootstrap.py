@@ -0,0 +1,89 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models.database import CacheVersion
+from .availability import earliest_start_minutes, from_minutes, generate_slots
+from .artist_schedule import get_free_intervals
+from .catalog import CatalogView
+
+BOOTSTRAP_SEARCH_DAYS = 14  # Days searched for the first available slots
+BOOTSTRAP_SLOTS_TTL_SECONDS = 60  # Same-day slots move with the clock, so a payload is reused at most this long
+
+
+def state_version(db: Session) -> int:
+    """Sum of every cache version: it grows with each catalog, schedule, opening hours, booking or slot hold change.
+
+    Booking changes count through the "bookings" version, which every
+    booking write bumps in its own transaction.
+    """
+    return db.query(func.coalesce(func.sum(CacheVersion.version), 0)).scalar()
+
+
+def next_available_slots(db: Session, service: dict, hair_artist_ids: List[int], count: int) -> List[dict]:
+    """The first `count` bookable (date, time, artist) slots for a service, from now on, earliest first"""
+    now = datetime.now()
+    slots = []
+    for offset in range(BOOTSTRAP_SEARCH_DAYS):
+        day = now.date() + timedelta(days=offset)
+        earliest = earliest_start_minutes(day, now)
+        for hair_artist_id in hair_artist_ids:
+            working_intervals, free_intervals = get_free_intervals(db, hair_artist_id, day)
+            slots.extend(
+                (day, start, hair_artist_id)
+                for start in generate_slots(
+                    working_intervals, free_intervals, service["duration"], service["slot_gap_minutes"],
+                    earliest=earliest, first_slot_step=15 if offset == 0 else None
+                )
+            )
+        # Later days only hold later slots, so the search can stop once enough are found
+        if len(slots) >= count:
+            break
+    return [
+        {"hair_artist_id": hair_artist_id, "date": day.isoformat(), "time": from_minutes(start).strftime("%H:%M")}
+        for day, start, hair_artist_id in sorted(slots)[:count]
+    ]
+
+
+class BootstrapCache:
+    """Serialized booking wizard bootstrap payloads, keyed by gender, service and slot count.
+
+    Each payload is stored with its entity tag, which combines the request
+    parameters, the state version (one aggregate query) and the current
+    BOOTSTRAP_SLOTS_TTL_SECONDS time bucket. A tag that still matches means
+    nothing the payload was built from has changed, so it is served (or
+    answered with 304) without rebuilding.
+    """
+
+    def __init__(self):
+        self._payloads: Dict[Tuple[Optional[str], Optional[int], int], Tuple[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def etag(self, db: Session, gender: Optional[str], service_id: Optional[int], count: int) -> str:
+        key = f"{gender}:{service_id}:{count}:{state_version(db)}:{int(time.time() // BOOTSTRAP_SLOTS_TTL_SECONDS)}"
+        return f'"{hashlib.sha1(key.encode()).hexdigest()[:16]}"'
+
+    def get(self, gender: Optional[str], service_id: Optional[int], count: int, etag: str) -> Optional[bytes]:
+        entry = self._payloads.get((gender, service_id, count))
+        return entry[1] if entry is not None and entry[0] == etag else None
+
+    def build(self, db: Session, view: CatalogView, gender: Optional[str], service_id: Optional[int],
+              count: int, etag: str) -> bytes:
+        service = next((item for item in view.compatible["services"] if item["id"] == service_id), None)
+        body = json.dumps({
+            "gender": gender,
+            "services": view.services,
+            "hair_artists": view.hair_artists,
+            "default_service_id": service_id,
+            "slots": next_available_slots(db, service, service["hair_artist_ids"], count) if service else []
+        }, separators=(",", ":")).encode()
+        with self._lock:
+            self._payloads[(gender, service_id, count)] = (etag, body)
+        return body
+
+
+bootstrap_cache = BootstrapCache()
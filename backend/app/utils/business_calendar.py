@@ -0,0 +1,110 @@
+import threading
+from datetime import date, time, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from ..models.database import OpeningHours, Closure
+from .cache_versions import cache_versions
+
+CALENDAR_WINDOW_DAYS = 62  # Days compiled per cache miss
+MAX_CACHED_DAYS = 2000
+
+Interval = Tuple[time, time]
+
+
+def _merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sort and merge overlapping or touching opening intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class BusinessCalendar:
+    """In-memory per-date calendar of salon opening intervals.
+
+    Opening hours and closures are compiled for a whole window of dates on a
+    cache miss, so availability checks become a dictionary lookup. Any edit to
+    the opening_hours or closures tables must publish the "business_calendar"
+    cache version, which invalidates the calendar in every worker process.
+    """
+
+    def __init__(self):
+        self._days: Dict[date, Tuple[Interval, ...]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._days.clear()
+            self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        """Incremented on every invalidation; dependent caches use it to detect edits"""
+        return self._generation
+
+    def compile_range(self, db: Session, start: date, end: date) -> Dict[date, Tuple[Interval, ...]]:
+        """Compile opening intervals for every date in [start, end] with two queries"""
+        patterns = db.query(OpeningHours).filter(
+            or_(OpeningHours.valid_from == None, OpeningHours.valid_from <= end),
+            or_(OpeningHours.valid_to == None, OpeningHours.valid_to >= start)
+        ).all()
+        closures = db.query(Closure).filter(
+            Closure.start_date <= end,
+            Closure.end_date >= start
+        ).all()
+
+        by_weekday: Dict[int, List[OpeningHours]] = {}
+        for pattern in patterns:
+            by_weekday.setdefault(pattern.weekday, []).append(pattern)
+
+        days: Dict[date, Tuple[Interval, ...]] = {}
+        current = start
+        while current <= end:
+            if any(c.start_date <= current <= c.end_date for c in closures):
+                days[current] = ()
+            else:
+                matching = [
+                    p for p in by_weekday.get(current.weekday(), [])
+                    if (p.valid_from is None or p.valid_from <= current)
+                    and (p.valid_to is None or p.valid_to >= current)
+                ]
+                # A seasonal (dated) pattern replaces the default weekly pattern for that day
+                dated = [p for p in matching if p.valid_from is not None or p.valid_to is not None]
+                chosen = dated or matching
+                days[current] = tuple(_merge_intervals([(p.open_time, p.close_time) for p in chosen]))
+            current += timedelta(days=1)
+        return days
+
+    def get_intervals(self, db: Session, day: date) -> Tuple[Interval, ...]:
+        """Return the opening intervals for a date; an empty tuple means closed"""
+        cache_versions.sync(db)
+        intervals = self._days.get(day)
+        if intervals is not None:
+            return intervals
+
+        generation = self._generation
+        compiled = self.compile_range(db, day, day + timedelta(days=CALENDAR_WINDOW_DAYS - 1))
+        with self._lock:
+            # Drop the result if an edit invalidated the calendar while we were compiling
+            if generation != self._generation:
+                return compiled[day]
+            if len(self._days) + len(compiled) > MAX_CACHED_DAYS:
+                self._days.clear()
+            self._days.update(compiled)
+        return compiled[day]
+
+    def is_open(self, db: Session, day: date, start: time, end: time) -> bool:
+        """Check that [start, end) lies entirely within one opening interval"""
+        return any(open_time <= start and end <= close_time
+                   for open_time, close_time in self.get_intervals(db, day))
+
+
+business_calendar = BusinessCalendar()
+cache_versions.subscribe("business_calendar", lambda key: business_calendar.invalidate())
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.database import CacheVersion, dialect_insert
+
+# How stale another worker's edits may be before this process notices them
+SYNC_INTERVAL_SECONDS = float(os.getenv("CACHE_SYNC_INTERVAL_SECONDS", "1"))
+
+
+class CacheVersionBus:
+    """Cross-process cache invalidation through a version table.
+
+    Each cache namespace (optionally narrowed to a key, stored as
+    "namespace:key") has a monotonic version row in cache_versions. Writers
+    bump the row with publish(), which also invalidates the local cache right
+    away. Caches call sync() before serving; at most once per sync interval
+    it reads all versions in one small query and runs the invalidation
+    handlers for every namespace another process has bumped. This keeps
+    in-memory caches coherent across uvicorn workers without any external
+    service.
+    """
+
+    def __init__(self, sync_interval: float = SYNC_INTERVAL_SECONDS):
+        self.sync_interval = sync_interval
+        self._handlers: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+        self._seen: Dict[str, int] = {}
+        self._synced = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def subscribe(self, namespace: str, handler: Callable[[Optional[str]], None]):
+        """Register a local invalidation handler; it receives the key, or None for the whole namespace"""
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    def _notify(self, name: str):
+        namespace, _, key = name.partition(":")
+        for handler in self._handlers.get(namespace, []):
+            try:
+                handler(key or None)
+            except Exception as e:
+                print(f"Error invalidating cache {name}: {str(e)}")
+
+    def _bump(self, db: Session, name: str) -> int:
+        updated = db.query(CacheVersion).filter(CacheVersion.namespace == name).update(
+            {"version": CacheVersion.version + 1, "updated_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        if not updated:
+            db.add(CacheVersion(namespace=name, version=1, updated_at=datetime.utcnow()))
+            db.flush()
+        # Still inside the writing transaction, so this is our own version
+        version = db.query(CacheVersion.version).filter(CacheVersion.namespace == name).scalar()
+        db.commit()
+        return version
+
+    def publish(self, db: Session, namespace: str, key=None, notify_local: bool = True):
+        """Invalidate a cache namespace (or one key of it) in this and every other process.
+
+        Call after the edit itself has been committed. Pass notify_local=False
+        when the local cache has already been updated in place.
+        """
+        name = namespace if key is None else f"{namespace}:{key}"
+        version = None
+        for attempt in range(2):
+            try:
+                version = self._bump(db, name)
+                break
+            except IntegrityError:
+                # Another process created the row first; the retry updates it
+                db.rollback()
+            except Exception as e:
+                db.rollback()
+                print(f"Error publishing cache version for {name}: {str(e)}")
+                break
+
+        if version is not None:
+            with self._lock:
+                # Our own bump must not trigger a second invalidation on the next sync
+                if version > self._seen.get(name, 0):
+                    self._seen[name] = version
+        if notify_local:
+            self._notify(name)
+
+    def bump(self, db: Session, names: Iterable[str]):
+        """Bump several versions with one upsert in the caller's transaction, so they commit with its change.
+
+        No invalidation handlers run, here or elsewhere: use it for versions
+        that readers compare (e.g. in an ETag) rather than subscribe to.
+        """
+        # Sorted, so concurrent writers lock the rows in the same order
+        names = sorted(set(names))
+        if not names:
+            return
+        now = datetime.utcnow()
+        statement = dialect_insert(db)(CacheVersion).values([
+            {"namespace": name, "version": 1, "updated_at": now} for name in names
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[CacheVersion.namespace],
+            set_={"version": CacheVersion.version + 1, "updated_at": statement.excluded.updated_at}
+        ))
+
+    def sync(self, db: Session, force: bool = False):
+        """Run invalidation handlers for namespaces bumped by other processes since the last sync"""
+        now = time.monotonic()
+        if not force and self._synced and now - self._checked_at < self.sync_interval:
+            return
+        self._checked_at = now
+
+        try:
+            rows = db.query(CacheVersion.namespace, CacheVersion.version).all()
+        except Exception as e:
+            print(f"Error reading cache versions: {str(e)}")
+            return
+
+        changed = []
+        with self._lock:
+            # The first sync only records a baseline: nothing has been cached yet
+            baseline = not self._synced
+            for name, version in rows:
+                if version > self._seen.get(name, 0):
+                    if not baseline:
+                        changed.append(name)
+                    self._seen[name] = version
+            self._synced = True
+        for name in changed:
+            self._notify(name)
+
+
+cache_versions = CacheVersionBus()
@@ -0,0 +1,131 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import Booking, CacheVersion, HairArtist
+from .availability import DEFAULT_DURATION_MINUTES
+from .booking_events import ARTIST_BOOKINGS_VERSION, BookingChange, booking_events
+
+FEED_PAST_DAYS = 30  # Past appointments kept in the feed
+FEED_BATCH_SIZE = 200  # Bookings loaded per round trip while streaming
+PRODID = "-//Salon Booking//Artist Calendar//EN"
+
+
+def _escape(value) -> str:
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (str(value or "").replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets, continuing with a leading space (RFC 5545 3.1)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def render_event(booking: Booking) -> str:
+    """One VEVENT for a booking, in the salon's local (floating) time"""
+    start = datetime.combine(booking.date, booking.time)
+    end = start + timedelta(minutes=booking.duration_minutes or DEFAULT_DURATION_MINUTES)
+    stamp = booking.created_at or start
+    description = "\n".join(
+        f"{label}: {value}" for label, value in (("Phone", booking.phone), ("Email", booking.email)) if value
+    )
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:booking-{booking.id}@salon-booking",
+        f"DTSTAMP:{_format_datetime(stamp)}Z",
+        f"DTSTART:{_format_datetime(start)}",
+        f"DTEND:{_format_datetime(end)}",
+        f"SUMMARY:{_escape(f'{booking.service} - {booking.name}')}",
+        f"DESCRIPTION:{_escape(description)}",
+        f"STATUS:{'CONFIRMED' if booking.status == 'confirmed' else 'TENTATIVE'}",
+        "END:VEVENT"
+    ]
+    return "".join(_fold(line) for line in lines)
+
+
+def feed_etag(db: Session, hair_artist: HairArtist) -> str:
+    """Entity tag of an artist's feed: their bookings version, the catalog version and the feed window"""
+    versions = dict(db.query(CacheVersion.namespace, CacheVersion.version).filter(
+        CacheVersion.namespace.in_([f"{ARTIST_BOOKINGS_VERSION}:{hair_artist.id}", "catalog"])
+    ).all())
+    return (f'"{hair_artist.id}-{versions.get(f"{ARTIST_BOOKINGS_VERSION}:{hair_artist.id}", 0)}'
+            f'-{versions.get("catalog", 0)}-{date.today().isoformat()}"')
+
+
+def iter_feed(db: Session, hair_artist: HairArtist) -> Iterator[str]:
+    """Yield the artist's calendar in chunks, one VEVENT per active booking, loading bookings in batches"""
+    yield "".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(f'Salon bookings - {hair_artist.name}')}",
+        "X-PUBLISHED-TTL:PT15M"
+    ])
+    bookings = db.query(Booking).filter(
+        Booking.hair_artist_id == hair_artist.id,
+        Booking.date >= date.today() - timedelta(days=FEED_PAST_DAYS),
+        Booking.status != "cancelled",
+        Booking.time != None
+    ).order_by(Booking.date, Booking.time).yield_per(FEED_BATCH_SIZE)
+    for booking in bookings:
+        yield render_event(booking)
+    yield "END:VCALENDAR\r\n"
+
+
+class CalendarFeedCache:
+    """Rendered .ics feeds by artist, valid for as long as their entity tag is current.
+
+    The tag is recomputed from the cache_versions table on every request (one
+    indexed query), so a booking change made in any worker invalidates the
+    feed everywhere without waiting for a sync.
+    """
+
+    def __init__(self):
+        self._feeds: Dict[int, Tuple[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, hair_artist_id: int, etag: str) -> Optional[bytes]:
+        entry = self._feeds.get(hair_artist_id)
+        return entry[1] if entry is not None and entry[0] == etag else None
+
+    def put(self, hair_artist_id: int, etag: str, body: bytes):
+        with self._lock:
+            self._feeds[hair_artist_id] = (etag, body)
+
+    def invalidate(self, hair_artist_id: int = None):
+        with self._lock:
+            if hair_artist_id is None:
+                self._feeds.clear()
+            else:
+                self._feeds.pop(hair_artist_id, None)
+
+
+calendar_feeds = CalendarFeedCache()
+
+
+def _on_booking_change(event: BookingChange):
+    """Drop this process's feeds of the artists a change touched; the writer has bumped their versions for the others"""
+    for hair_artist_id in {hair_artist_id for hair_artist_id, _ in event.affected if hair_artist_id}:
+        calendar_feeds.invalidate(hair_artist_id)
+
+
+booking_events.subscribe(_on_booking_change)
@@ -0,0 +1,115 @@
+import threading
+from typing import Dict, List, NamedTuple, Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from ..models.database import Service, HairArtist
+from ..models.schemas import Service as ServiceSchema, PublicHairArtist
+from .cache_versions import cache_versions
+
+GENDERS = ("male", "female")
+PAIR_SERVICE_FIELDS = ("id", "name", "duration", "price", "slot_gap_minutes")
+PAIR_ARTIST_FIELDS = ("id", "name")
+
+
+def serves_gender(specificity: Optional[str], gender: str) -> bool:
+    """Whether a service's gender_specificity (or an artist's gender_expertise) covers `gender`"""
+    return specificity in (None, "both", gender)
+
+
+def parse_gender(gender: Optional[str]) -> Optional[str]:
+    if gender is not None and gender not in GENDERS:
+        raise HTTPException(status_code=400, detail="Gender must be 'male' or 'female'")
+    return gender
+
+
+class CatalogView(NamedTuple):
+    services: List[dict]  # Serialized like the Service schema, ordered by id
+    hair_artists: List[dict]  # Serialized like the PublicHairArtist schema, ordered by id
+    compatible: dict  # Services with the ids of artists that can perform them, and those artists
+
+
+class CatalogViews:
+    """Precomputed, already serialized service and artist lists per customer gender.
+
+    The whole catalog is small, so one load builds a view for every gender
+    (and one for "any gender") in a few passes; gender-filtered list
+    endpoints then slice a prepared list instead of querying and validating
+    rows. Any edit to services or hair artists must publish the "catalog"
+    cache version, which drops the views in every worker process.
+    """
+
+    def __init__(self):
+        self._views: Optional[Dict[Optional[str], CatalogView]] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._views = None
+            self._generation += 1
+
+    def _build(self, db: Session) -> Dict[Optional[str], CatalogView]:
+        services = db.query(Service).order_by(Service.id).all()
+        artists = db.query(HairArtist).order_by(HairArtist.id).all()
+        service_items = [
+            jsonable_encoder(ServiceSchema.model_validate(s, from_attributes=True)) for s in services
+        ]
+        artist_items = [
+            jsonable_encoder(PublicHairArtist.model_validate(a, from_attributes=True)) for a in artists
+        ]
+
+        views: Dict[Optional[str], CatalogView] = {}
+        for gender in (None, *GENDERS):
+            # "Any gender" pairs a service with an artist when some gender is covered by both
+            genders = GENDERS if gender is None else (gender,)
+            service_view = [
+                item for service, item in zip(services, service_items)
+                if any(serves_gender(service.gender_specificity, g) for g in genders)
+            ]
+            artist_view = [
+                item for artist, item in zip(artists, artist_items)
+                if any(serves_gender(artist.gender_expertise, g) for g in genders)
+            ]
+
+            pair_services, paired_artists = [], set()
+            for service, item in zip(services, service_items):
+                artist_ids = [
+                    artist.id for artist in artists
+                    if any(
+                        serves_gender(service.gender_specificity, g) and serves_gender(artist.gender_expertise, g)
+                        for g in genders
+                    )
+                ]
+                if artist_ids:
+                    pair_services.append({
+                        **{name: item[name] for name in PAIR_SERVICE_FIELDS},
+                        "hair_artist_ids": artist_ids
+                    })
+                    paired_artists.update(artist_ids)
+            compatible = {
+                "gender": gender,
+                "services": pair_services,
+                "hair_artists": [
+                    {name: item[name] for name in PAIR_ARTIST_FIELDS}
+                    for artist, item in zip(artists, artist_items) if artist.id in paired_artists
+                ]
+            }
+            views[gender] = CatalogView(service_view, artist_view, compatible)
+        return views
+
+    def get(self, db: Session, gender: Optional[str] = None) -> CatalogView:
+        cache_versions.sync(db)
+        views = self._views
+        if views is None:
+            generation = self._generation
+            views = self._build(db)
+            with self._lock:
+                # Keep the result only if no catalog edit invalidated the views while building
+                if generation == self._generation:
+                    self._views = views
+        return views[gender]
+
+
+catalog_views = CatalogViews()
+cache_versions.subscribe("catalog", lambda key: catalog_views.invalidate())
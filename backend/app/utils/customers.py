@@ -0,0 +1,77 @@
+import re
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import Customer
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    email = (email or "").strip().lower()
+    return email if "@" in email else None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    phone = (phone or "").strip()
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) < 6:
+        return None
+    return ("+" if phone.startswith("+") else "") + digits
+
+
+def contact_keys(email: Optional[str] = None, phone: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    return normalize_email(email), normalize_phone(phone)
+
+
+def split_contact(contact: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Split an OTP contact, which may be an email or a phone number, into (email, phone)"""
+    if contact and "@" in contact:
+        return contact, None
+    return None, contact
+
+
+def find_customer(db: Session, email: Optional[str] = None, phone: Optional[str] = None) -> Optional[Customer]:
+    """Look a customer up by normalized email, then by normalized phone (both unique indexes)"""
+    email_key, phone_key = contact_keys(email, phone)
+    if email_key:
+        customer = db.query(Customer).filter(Customer.email_key == email_key).first()
+        if customer:
+            return customer
+    if phone_key:
+        return db.query(Customer).filter(Customer.phone_key == phone_key).first()
+    return None
+
+
+def get_or_create_customer(
+    db: Session,
+    name: Optional[str],
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    gender: Optional[str] = None
+) -> Optional[Customer]:
+    """Find or create the customer for a booking's contact details, within the caller's transaction.
+
+    Missing keys and details are filled in from the new booking, so a customer
+    first seen by email later also becomes findable by phone.
+    """
+    email_key, phone_key = contact_keys(email, phone)
+    if not email_key and not phone_key:
+        return None
+
+    customer = find_customer(db, email, phone)
+    if customer is None:
+        customer = Customer(email_key=email_key, phone_key=phone_key)
+        db.add(customer)
+    else:
+        if email_key and not customer.email_key:
+            customer.email_key = email_key
+        # Never steal a phone key that another customer already owns
+        if phone_key and not customer.phone_key and not db.query(Customer.id).filter(Customer.phone_key == phone_key).first():
+            customer.phone_key = phone_key
+
+    customer.name = name or customer.name
+    if email_key:
+        customer.email = email.strip()
+    if phone_key and phone:
+        customer.phone = phone.strip()
+    customer.gender = gender or customer.gender
+    db.flush()
+    return customer
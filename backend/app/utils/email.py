@@ -1,5 +1,3 @@
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
 import os
 from dotenv import load_dotenv
 
@@ -12,6 +10,10 @@ def send_otp_email(to_email: str, otp_code: str):
     if not SENDGRID_API_KEY:
         raise Exception("SendGrid API key not configured")
     
+    # Imported lazily: sendgrid is slow to import and only needed when an email is actually sent
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail
+    
     message = Mail(
         from_email=FROM_EMAIL,  # If None, SendGrid will use the default sender
         to_emails=to_email,
@@ -29,4 +31,62 @@ def send_otp_email(to_email: str, otp_code: str):
         return response.status_code == 202
     except Exception as e:
         print(f"Error sending email: {str(e)}")
-        return False 
\ No newline at end of file
+        return False 
+
+def send_waitlist_email(to_email: str, name: str, service: str, day, start_time):
+    if not SENDGRID_API_KEY:
+        raise Exception("SendGrid API key not configured")
+    
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail
+    
+    message = Mail(
+        from_email=FROM_EMAIL,
+        to_emails=to_email,
+        subject='A slot has opened up at the salon',
+        html_content=f'''
+            <h2>Good news, {name}!</h2>
+            <p>A slot for <strong>{service}</strong> is now free on {day.strftime("%Y-%m-%d")} at {start_time.strftime("%H:%M")}.</p>
+            <p>Slots are offered to several people on the waitlist, so book soon to secure it.</p>
+        '''
+    )
+    
+    try:
+        sg = SendGridAPIClient(SENDGRID_API_KEY)
+        response = sg.send(message)
+        return response.status_code == 202
+    except Exception as e:
+        print(f"Error sending email: {str(e)}")
+        return False
+
+def send_reminder_emails(reminders: list) -> list:
+    """Send appointment reminders over one SendGrid client; returns whether each was accepted.
+
+    Each reminder is a dict with email, name, service, date, time and hours.
+    """
+    if not SENDGRID_API_KEY:
+        raise Exception("SendGrid API key not configured")
+    
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail
+    
+    sg = SendGridAPIClient(SENDGRID_API_KEY)
+    results = []
+    for reminder in reminders:
+        message = Mail(
+            from_email=FROM_EMAIL,
+            to_emails=reminder["email"],
+            subject='Reminder: your salon appointment',
+            html_content=f'''
+                <h2>See you soon, {reminder["name"]}!</h2>
+                <p>Your <strong>{reminder["service"]}</strong> appointment is on {reminder["date"].strftime("%Y-%m-%d")} at {reminder["time"].strftime("%H:%M")}, in about {reminder["hours"]} hours.</p>
+                <p>If you cannot make it, please cancel so that someone else can take the slot.</p>
+            '''
+        )
+        try:
+            response = sg.send(message)
+            results.append(response.status_code == 202)
+        except Exception as e:
+            print(f"Error sending email: {str(e)}")
+            results.append(False)
+    return results
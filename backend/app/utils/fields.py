@@ -0,0 +1,38 @@
+from typing import Callable, Dict, List, Optional, Sequence
+from fastapi import HTTPException
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Parse a comma-separated `?fields=` value into column names, always including "id".
+
+    Returns None when no projection was requested. Unknown names are rejected
+    so that clients notice typos instead of silently getting less data.
+    """
+    if fields is None:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def project_query(query, model, fields: List[str]):
+    """Replace a query's selected entity with just the requested columns"""
+    return query.with_entities(*[getattr(model, name) for name in fields])
+
+
+def project_rows(rows, fields: List[str], formatters: Optional[Dict[str, Callable]] = None) -> List[dict]:
+    """Turn projected rows into plain dicts, formatting values where the full schema does"""
+    formatters = formatters or {}
+    result = []
+    for row in rows:
+        item = {}
+        for name, value in zip(fields, row):
+            formatter = formatters.get(name)
+            item[name] = formatter(value) if formatter and value is not None else value
+        result.append(item)
+    return result
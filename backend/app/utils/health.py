@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from sqlalchemy import text
+from ..models.database import engine
+
+PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "5"))
+PROBE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "2"))
+# A cached result older than this is treated as not ready (the prober itself is stuck)
+MAX_STATUS_AGE_SECONDS = PROBE_INTERVAL_SECONDS * 3 + PROBE_TIMEOUT_SECONDS
+
+
+def _check_database():
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def pool_status() -> dict:
+    """Connection pool usage; saturation is checked-out connections over pool capacity"""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        size = pool.size()
+        checked_out = pool.checkedout()
+        capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+        status.update({
+            "size": size,
+            "checked_out": checked_out,
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity else None
+        })
+    return status
+
+
+class HealthProber:
+    """Probes the database in the background and caches the result.
+
+    Readiness requests read the cached status instead of opening a session,
+    so probe frequency does not translate into database load. Background
+    workers register a depth callback with register_queue() so their backlog
+    shows up in the readiness report.
+    """
+
+    def __init__(self):
+        self._status: Optional[dict] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._queues: Dict[str, Callable[[], int]] = {}
+
+    def register_queue(self, name: str, depth: Callable[[], int]):
+        self._queues[name] = depth
+
+    def queue_depths(self) -> Dict[str, int]:
+        depths = {}
+        for name, depth in self._queues.items():
+            try:
+                depths[name] = depth()
+            except Exception as e:
+                print(f"Error reading depth of queue {name}: {str(e)}")
+                depths[name] = -1
+        return depths
+
+    async def probe(self) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(_check_database), timeout=PROBE_TIMEOUT_SECONDS)
+            database = {"status": "connected"}
+        except asyncio.TimeoutError:
+            database = {"status": "timeout", "error": f"No response within {PROBE_TIMEOUT_SECONDS}s"}
+        except Exception as e:
+            database = {"status": "disconnected", "error": str(e)}
+        database["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        self._status = {
+            "database": database,
+            "checked_at": datetime.now().isoformat()
+        }
+        self._checked_at = time.monotonic()
+        return self._status
+
+    async def _run(self):
+        while True:
+            await self.probe()
+            await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            # wait_for() drops a cancel that lands just as the probe's thread returns,
+            # leaving the loop asleep, so cancel again until the task has ended
+            while not self._task.done():
+                self._task.cancel()
+                await asyncio.wait({self._task}, timeout=0.1)
+            self._task = None
+
+    def readiness(self) -> dict:
+        """Assemble the readiness report from the cached probe plus in-process gauges"""
+        if self._status is None:
+            return {"status": "starting", "ready": False}
+
+        age = time.monotonic() - self._checked_at
+        ready = self._status["database"]["status"] == "connected" and age <= MAX_STATUS_AGE_SECONDS
+        return {
+            "status": "ready" if ready else "not_ready",
+            "ready": ready,
+            **self._status,
+            "status_age_seconds": round(age, 1),
+            "pool": pool_status(),
+            "queues": self.queue_depths()
+        }
+
+
+health_prober = HealthProber()
@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta
+from typing import List, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.database import Booking, SlotHold
+from .availability import booked_interval, earliest_start_minutes, generate_slots
+from .artist_schedule import artist_schedules, get_free_intervals
+
+
+def count_bookable_slots(
+    db: Session,
+    hair_artist_ids: Sequence[int],
+    days: Sequence[date],
+    duration: int,
+    slot_gap: int
+) -> np.ndarray:
+    """Number of bookable slots per artist and day, as an (artists, days) integer array.
+
+    Working time comes from the compiled artist schedules and booked time from
+    a single bookings query (plus one for slot holds) for the whole range. Both go into one
+    minute-resolution difference array (working +1, each booking -2), so a
+    single cumulative sum yields every artist-day's occupancy and a minute is
+    free exactly where it equals 1. A second cumulative sum over the free
+    minutes tests every candidate start at once: it fits when the count grows
+    by `duration` over its window. Candidates are the slot grid anchored at
+    the start of each working interval, as walked by generate_slots for
+    available-slots. Past days have no slots; today is counted with
+    generate_slots itself, since its first slot is searched in 15-minute
+    steps from the current time.
+    """
+    counts = np.zeros((len(hair_artist_ids), len(days)), dtype=np.int64)
+    if not hair_artist_ids or not days or duration <= 0 or slot_gap <= 0:
+        return counts
+    artist_position = {artist_id: i for i, artist_id in enumerate(hair_artist_ids)}
+    day_position = {day: i for i, day in enumerate(days)}
+
+    working = np.array([
+        (a * len(days) + d, start, end)
+        for a, artist_id in enumerate(hair_artist_ids)
+        for d, day in enumerate(days)
+        for start, end in artist_schedules.get_working_intervals(db, artist_id, day)
+    ], dtype=np.int64).reshape(-1, 3)
+    if not len(working):
+        return counts
+    # Only the minutes between the earliest opening and the latest closing are laid out
+    first_minute, last_minute = int(working[:, 1].min()), int(working[:, 2].max())
+    width = last_minute - first_minute
+
+    booked = [
+        (
+            artist_position[artist_id] * len(days) + day_position[booking_date],
+            *booked_interval(start, end)
+        )
+        for artist_id, booking_date, start, end in db.query(
+            Booking.hair_artist_id, Booking.date, Booking.time, Booking.end_time
+        ).filter(
+            Booking.hair_artist_id.in_(list(hair_artist_ids)),
+            Booking.date >= min(days),
+            Booking.date <= max(days),
+            Booking.status != "cancelled",
+            Booking.time != None,
+            Booking.end_time != None
+        )
+        if booking_date in day_position
+    ]
+    # Slots held during OTP verification are taken as well
+    booked += [
+        (
+            artist_position[artist_id] * len(days) + day_position[hold_date],
+            *booked_interval(start, end)
+        )
+        for artist_id, hold_date, start, end in db.query(
+            SlotHold.hair_artist_id, SlotHold.date, SlotHold.time, SlotHold.end_time
+        ).filter(
+            SlotHold.hair_artist_id.in_(list(hair_artist_ids)),
+            SlotHold.date >= min(days),
+            SlotHold.date <= max(days),
+            SlotHold.expires_at > datetime.utcnow()
+        )
+        if hold_date in day_position
+    ]
+    booked = np.array(booked, dtype=np.int64).reshape(-1, 3)
+    booked[:, 1:] = np.clip(booked[:, 1:], first_minute, last_minute)
+    booked = booked[booked[:, 1] < booked[:, 2]]
+
+    diff = np.zeros((counts.size, width + 1), dtype=np.int32)
+    np.add.at(diff, (working[:, 0], working[:, 1] - first_minute), 1)
+    np.add.at(diff, (working[:, 0], working[:, 2] - first_minute), -1)
+    np.add.at(diff, (booked[:, 0], booked[:, 1] - first_minute), -2)
+    np.add.at(diff, (booked[:, 0], booked[:, 2] - first_minute), 2)
+    free = np.cumsum(diff[:, :width], axis=1) == 1
+
+    # free_before[row, m] = free minutes in [first_minute, first_minute + m)
+    free_before = np.zeros((counts.size, width + 1), dtype=np.int32)
+    np.cumsum(free, axis=1, out=free_before[:, 1:])
+
+    # Grid starts of every working interval whose slot ends within the interval
+    per_interval = np.maximum((working[:, 2] - working[:, 1] - duration) // slot_gap + 1, 0)
+    interval = np.repeat(np.arange(len(working)), per_interval)
+    step = np.arange(len(interval)) - np.repeat(np.cumsum(per_interval) - per_interval, per_interval)
+    rows = working[interval, 0]
+    starts = working[interval, 1] + step * slot_gap - first_minute
+    fits = free_before[rows, starts + duration] - free_before[rows, starts] == duration
+    counts.reshape(-1)[:] = np.bincount(rows[fits], minlength=counts.size)
+
+    now = datetime.now()
+    for d, day in enumerate(days):
+        if day < now.date():
+            counts[:, d] = 0
+        elif day == now.date():
+            for a, artist_id in enumerate(hair_artist_ids):
+                working_intervals, free_intervals = get_free_intervals(db, artist_id, day)
+                counts[a, d] = len(generate_slots(
+                    working_intervals, free_intervals, duration, slot_gap,
+                    earliest=earliest_start_minutes(day, now), first_slot_step=15
+                ))
+    return counts
+
+
+def month_days(year: int, month: int) -> List[date]:
+    first = date(year, month, 1)
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return [first + timedelta(days=i) for i in range((next_month - first).days)]
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+MAX_IDEMPOTENCY_KEYS = 50000
+MAX_KEY_LENGTH = 255
+
+
+class RecordedResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    content: Any  # JSON-compatible body, or the error detail for status >= 400
+    headers: Optional[Dict[str, str]]
+    expires_at: float
+
+
+class IdempotencyStore:
+    """Bounded TTL store of responses keyed by (scope, Idempotency-Key).
+
+    All entries share one TTL, so insertion order is expiry order and expired
+    entries are dropped from the front of an ordered dict. Requests that
+    arrive while the same key is still being processed wait for the first
+    one instead of repeating its work.
+    """
+
+    def __init__(self, ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS, max_keys: int = MAX_IDEMPOTENCY_KEYS):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._responses: "OrderedDict[str, RecordedResponse]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[RecordedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            while self._responses:
+                oldest_key, oldest = next(iter(self._responses.items()))
+                if oldest.expires_at > now:
+                    break
+                del self._responses[oldest_key]
+            return self._responses.get(key)
+
+    def _put(self, key: str, response: RecordedResponse):
+        with self._lock:
+            self._responses[key] = response
+            while len(self._responses) > self.max_keys:
+                self._responses.popitem(last=False)
+
+    @staticmethod
+    def _replay(recorded: RecordedResponse, fingerprint: str):
+        if recorded.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key has already been used with a different request"
+            )
+        if recorded.status_code >= 400:
+            raise HTTPException(status_code=recorded.status_code, detail=recorded.content, headers=recorded.headers)
+        return recorded.content
+
+    async def run(
+        self,
+        scope: str,
+        idempotency_key: Optional[str],
+        payload: BaseModel,
+        handler: Callable[[], Awaitable[Any]]
+    ):
+        """Run `handler` once per key and replay its recorded response for repeats.
+
+        Without a key the handler simply runs. Server errors (5xx) are not
+        recorded, so the client can retry them with the same key.
+        """
+        if not idempotency_key:
+            return await handler()
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail="Idempotency-Key is too long")
+
+        key = f"{scope}:{idempotency_key}"
+        fingerprint = hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+        while True:
+            recorded = self._get(key)
+            if recorded is not None:
+                return self._replay(recorded, fingerprint)
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            # Coalesce with the request already processing this key, then replay its result
+            await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            content = jsonable_encoder(await handler())
+            self._put(key, RecordedResponse(fingerprint, 200, content, None,
+                                            time.monotonic() + self.ttl_seconds))
+            return content
+        except HTTPException as exc:
+            if exc.status_code < 500:
+                self._put(key, RecordedResponse(fingerprint, exc.status_code, exc.detail, exc.headers,
+                                                time.monotonic() + self.ttl_seconds))
+            raise
+        finally:
+            del self._in_flight[key]
+            future.set_result(None)
+
+
+idempotency_store = IdempotencyStore()
@@ -1,5 +1,6 @@
 import random
 from datetime import datetime, timedelta
+from typing import Optional
 from sqlalchemy.orm import Session
 from ..models.database import OTP
 
@@ -9,7 +10,7 @@ def generate_otp() -> str:
 
 def create_otp_record(db: Session, contact: str) -> OTP:
     code = generate_otp()
-    expires_at = datetime.now(datetime.timezone.utc) + timedelta(minutes=10)
+    expires_at = datetime.utcnow() + timedelta(minutes=10)
     
     otp_record = OTP(
         contact=contact,
@@ -31,14 +32,14 @@ def verify_otp(db: Session, contact: str, code: str) -> bool:
     # Check if there are any non-expired records
     non_expired_count = db.query(OTP).filter(
         OTP.contact == contact,
-        OTP.expires_at > datetime.now(datetime.timezone.utc)
+        OTP.expires_at > datetime.utcnow()
     ).count()
 
     # Find the specific OTP record
     otp_record = db.query(OTP).filter(
         OTP.contact == contact,
         OTP.code == code,
-        OTP.expires_at > datetime.now(datetime.timezone.utc),
+        OTP.expires_at > datetime.utcnow(),
         OTP.verified == False
     ).order_by(OTP.created_at.desc()).first()
     
@@ -47,4 +48,20 @@ def verify_otp(db: Session, contact: str, code: str) -> bool:
         db.commit()
         return True
     else:
-        return False
\ No newline at end of file
+        return False
+
+def find_valid_otp(db: Session, contact: str, code: str) -> Optional[OTP]:
+    """The newest unexpired, unused OTP record for the contact and code, without consuming it"""
+    return db.query(OTP).filter(
+        OTP.contact == contact,
+        OTP.code == code,
+        OTP.expires_at > datetime.utcnow(),
+        OTP.verified == False
+    ).order_by(OTP.created_at.desc()).first()
+
+def consume_otp(db: Session, otp_record: OTP) -> bool:
+    """Mark the record used within the caller's transaction; False if another request used it first"""
+    return db.query(OTP).filter(
+        OTP.id == otp_record.id,
+        OTP.verified == False
+    ).update({"verified": True}, synchronize_session=False) == 1
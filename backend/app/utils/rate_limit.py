@@ -0,0 +1,143 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Protocol, Tuple
+from fastapi import HTTPException, Request
+
+
+class RateLimitRule(NamedTuple):
+    key_type: str  # "ip" or "contact"
+    capacity: int  # Burst size
+    per_seconds: float  # Time to refill a full bucket
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+class RateLimitBackend(Protocol):
+    def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Consume one token; return 0 if allowed, otherwise seconds until a token is available"""
+        ...
+
+
+class InMemoryTokenBuckets:
+    """Token buckets held as (tokens, last_seen) tuples in an access-ordered dict.
+
+    Every access moves the key to the end, so idle keys collect at the front and
+    are evicted in O(1) amortized time. A bucket idle for longer than its refill
+    period is full again, so evicting it loses no state.
+    """
+
+    def __init__(self, idle_seconds: float = 3600, max_keys: int = 100000):
+        self.idle_seconds = idle_seconds
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._buckets.pop(key, None)
+            tokens = capacity if entry is None else min(capacity, entry[0] + (now - entry[1]) * refill_rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+        return retry_after
+
+    def _evict(self, now: float):
+        while self._buckets:
+            key, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < self.idle_seconds and len(self._buckets) <= self.max_keys:
+                break
+            del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RateLimiter:
+    """Applies rate limit rules against a pluggable bucket backend.
+
+    The default backend is per-process. Multi-worker deployments that need a
+    shared budget can install any object implementing RateLimitBackend (for
+    example one backed by Redis) with set_backend().
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend = backend or InMemoryTokenBuckets()
+
+    def set_backend(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    def check(self, scope: str, rules: List[RateLimitRule], ip: str, contact: Optional[str]) -> float:
+        """Consume a token from each applicable bucket; return the longest required wait"""
+        retry_after = 0.0
+        for rule in rules:
+            value = ip if rule.key_type == "ip" else contact
+            if not value:
+                continue
+            key = f"{scope}:{rule.key_type}:{value}"
+            retry_after = max(retry_after, self.backend.take(key, rule.capacity, rule.refill_rate))
+        return retry_after
+
+
+rate_limiter = RateLimiter()
+
+
+async def _extract_contact(request: Request, field: str) -> Optional[str]:
+    """Read the contact field from the (already buffered) JSON or form body"""
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            value = (await request.json()).get(field)
+        else:
+            value = (await request.form()).get(field)
+    except Exception:
+        return None
+    return str(value).strip().lower() if value else None
+
+
+def rate_limit(scope: str, rules: List[RateLimitRule], contact_field: str = "contact"):
+    """Build a dependency enforcing `rules` for an endpoint.
+
+    Attach it through the route's `dependencies=` so it runs before any
+    dependency or handler that does database work.
+    """
+    async def dependency(request: Request):
+        ip = request.client.host if request.client else None
+        contact = await _extract_contact(request, contact_field)
+        retry_after = rate_limiter.check(scope, rules, ip, contact)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+    return dependency
+
+
+send_otp_rate_limit = rate_limit("send-otp", [
+    RateLimitRule("contact", 3, 600),
+    RateLimitRule("ip", 20, 600)
+])
+verify_otp_rate_limit = rate_limit("verify-otp", [
+    RateLimitRule("contact", 5, 600),
+    RateLimitRule("ip", 30, 600)
+])
+booking_change_rate_limit = rate_limit("booking-change", [
+    RateLimitRule("contact", 5, 600),
+    RateLimitRule("ip", 30, 600)
+])
+customer_history_rate_limit = rate_limit("customer-history", [
+    RateLimitRule("contact", 5, 600),
+    RateLimitRule("ip", 30, 600)
+])
+login_rate_limit = rate_limit("token", [
+    RateLimitRule("contact", 5, 300),
+    RateLimitRule("ip", 20, 300)
+], contact_field="username")
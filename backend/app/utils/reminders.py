@@ -0,0 +1,284 @@
+import asyncio
+import heapq
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import SessionLocal, Booking, BookingReminder, dialect_insert
+from .booking_events import BookingChange, booking_events
+from .email import SENDGRID_API_KEY, send_reminder_emails
+
+REMINDER_LEADS = (("24h", timedelta(hours=24)), ("2h", timedelta(hours=2)))  # Longest lead first
+REMINDERS_ENABLED = os.getenv("REMINDERS_ENABLED", "1") != "0"
+RELOAD_INTERVAL_SECONDS = float(os.getenv("REMINDER_RELOAD_INTERVAL_SECONDS", "3600"))
+REMINDER_BATCH_SIZE = 100  # Reminders claimed and sent per round
+REMINDER_RETENTION_DAYS = 2  # Handled reminders are kept until their appointment is over
+REMINDER_RETRY_SECONDS = 60  # Delay before retrying a failed send, doubled after each further failure
+REMINDER_MAX_ATTEMPTS = 5
+
+
+def appointment_start(booking: Booking) -> datetime:
+    return datetime.combine(booking.date, booking.time)
+
+
+def pending_reminders(booking: Booking, now: datetime) -> List[Tuple[str, datetime]]:
+    """The booking's reminders that are still worth sending at `now`, as (kind, due time).
+
+    A reminder whose due time has passed is dropped once the next (shorter)
+    reminder is also due, so a late reminder is sent at most once.
+    """
+    if booking.status == "cancelled" or booking.date is None or booking.time is None:
+        return []
+    start = appointment_start(booking)
+    reminders = []
+    for i, (kind, lead) in enumerate(REMINDER_LEADS):
+        superseded_at = start - REMINDER_LEADS[i + 1][1] if i + 1 < len(REMINDER_LEADS) else start
+        if superseded_at > now:
+            reminders.append((kind, start - lead))
+    return reminders
+
+
+class ReminderScheduler:
+    """Sends appointment reminders from an in-memory min-heap of due times.
+
+    Every RELOAD_INTERVAL_SECONDS the reminders due before the next reload
+    (plus one interval of slack) are loaded with one query, and between
+    reloads booking_events keep the heap current: new and rescheduled
+    bookings are pushed, cancelled ones dropped. The loop sleeps until the
+    earliest due time or the next event, so nothing polls the bookings table.
+
+    Heap entries are never removed in place; an entry is stale when its due
+    time no longer matches `_scheduled`, and stale entries are skipped when
+    popped. Before sending, every due reminder is re-checked against the
+    booking and claimed by inserting its booking_reminders row, so a reminder
+    goes out at most once across restarts and worker processes (each worker
+    runs its own scheduler). Reminders already due when a booking is made or
+    moved are recorded as skipped: the customer has just chosen that time.
+    A send that fails releases its claim and is pushed again after a backoff,
+    up to REMINDER_MAX_ATTEMPTS attempts, after which it is recorded as failed.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._scheduled: Dict[Tuple[int, str], datetime] = {}
+        self._attempts: Dict[Tuple[int, str], int] = {}  # Failed sends of reminders awaiting a retry
+        self._horizon = datetime.min
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self):
+        return len(self._scheduled)
+
+    def _push(self, booking_id: int, kind: str, due: datetime):
+        with self._lock:
+            if self._scheduled.get((booking_id, kind)) != due:
+                self._scheduled[(booking_id, kind)] = due
+                heapq.heappush(self._heap, (due, booking_id, kind))
+
+    def _discard(self, booking_id: int):
+        with self._lock:
+            for kind, _ in REMINDER_LEADS:
+                self._scheduled.pop((booking_id, kind), None)
+                self._attempts.pop((booking_id, kind), None)
+
+    def _pop_due(self, now: datetime, limit: int) -> List[Tuple[datetime, int, str]]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(due) < limit:
+                entry = heapq.heappop(self._heap)
+                if self._scheduled.get((entry[1], entry[2])) == entry[0]:
+                    del self._scheduled[(entry[1], entry[2])]
+                    due.append(entry)
+        return due
+
+    def _seconds_until_next_due(self) -> float:
+        with self._lock:
+            if not self._heap:
+                return float("inf")
+            return (self._heap[0][0] - datetime.now()).total_seconds()
+
+    def reload(self, db: Session, now: Optional[datetime] = None):
+        """Schedule every unhandled reminder due before the next reload, and purge old reminder rows"""
+        now = now or datetime.now()
+        horizon = now + timedelta(seconds=2 * RELOAD_INTERVAL_SECONDS)
+        longest_lead = REMINDER_LEADS[0][1]
+        booking_filters = [
+            Booking.date >= now.date(),
+            Booking.date <= (horizon + longest_lead).date(),
+            Booking.status != "cancelled",
+            Booking.time != None
+        ]
+        handled = set(db.query(BookingReminder.booking_id, BookingReminder.kind).filter(
+            BookingReminder.booking_id.in_(db.query(Booking.id).filter(*booking_filters))
+        ))
+        for booking in db.query(Booking).filter(*booking_filters):
+            for kind, due in pending_reminders(booking, now):
+                # A reminder awaiting a retry keeps its backoff time
+                if due <= horizon and (booking.id, kind) not in handled and (booking.id, kind) not in self._attempts:
+                    self._push(booking.id, kind, due)
+        self._horizon = horizon
+
+        db.query(BookingReminder).filter(
+            BookingReminder.created_at < now - timedelta(days=REMINDER_RETENTION_DAYS)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def _record(self, db: Session, booking_id: int, kind: str, status: str) -> bool:
+        """Insert the reminder's row; False if it was already handled (by this or another worker)"""
+        statement = dialect_insert(db)(BookingReminder).values(
+            booking_id=booking_id, kind=kind, status=status, created_at=datetime.now()
+        ).on_conflict_do_nothing(index_elements=[BookingReminder.booking_id, BookingReminder.kind])
+        return db.execute(statement).rowcount == 1
+
+    def on_booking_change(self, event: BookingChange):
+        """Booking event subscriber: reschedule the reminders of the bookings that changed"""
+        if self._task is None:
+            return
+        now = datetime.now()
+        db = SessionLocal()
+        try:
+            if event.action == "rescheduled":
+                # A new appointment time gets its reminders again
+                db.query(BookingReminder).filter(
+                    BookingReminder.booking_id.in_(event.booking_ids)
+                ).delete(synchronize_session=False)
+            for booking_id in event.booking_ids:
+                self._discard(booking_id)
+            if event.action != "cancelled":
+                for booking in db.query(Booking).filter(Booking.id.in_(event.booking_ids)):
+                    for kind, due in pending_reminders(booking, now):
+                        if due <= now:
+                            self._record(db, booking.id, kind, "skipped")
+                        elif due <= self._horizon:
+                            self._push(booking.id, kind, due)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error scheduling reminders for bookings {list(event.booking_ids)}: {str(e)}")
+        finally:
+            db.close()
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def send_due(self, now: Optional[datetime] = None) -> int:
+        """Send up to REMINDER_BATCH_SIZE due reminders; returns how many were taken off the heap"""
+        now = now or datetime.now()
+        entries = self._pop_due(now, REMINDER_BATCH_SIZE)
+        if not entries:
+            return 0
+        db = SessionLocal()
+        try:
+            bookings = {
+                booking.id: booking
+                for booking in db.query(Booking).filter(Booking.id.in_({booking_id for _, booking_id, _ in entries}))
+            }
+            claimed = []
+            for due, booking_id, kind in entries:
+                booking = bookings.get(booking_id)
+                with self._lock:
+                    attempts = self._attempts.pop((booking_id, kind), 0)
+                # Cancelled or moved by another worker, or superseded by a shorter reminder;
+                # a retry is popped at its backoff time, after the reminder's own due time
+                reminder_due = dict(pending_reminders(booking, now)).get(kind) if booking is not None else None
+                if booking is None or not booking.email or reminder_due is None or reminder_due > now \
+                        or (not attempts and reminder_due != due):
+                    continue
+                if self._record(db, booking_id, kind, "sent"):
+                    claimed.append((booking, kind, attempts))
+            db.commit()
+            if not claimed:
+                return len(entries)
+
+            try:
+                results = send_reminder_emails([
+                    {
+                        "email": booking.email,
+                        "name": booking.name,
+                        "service": booking.service,
+                        "date": booking.date,
+                        "time": booking.time,
+                        "hours": max(round((appointment_start(booking) - now).total_seconds() / 3600), 1)
+                    }
+                    for booking, _, _ in claimed
+                ])
+            except Exception as e:
+                print(f"Error sending appointment reminders: {str(e)}")
+                results = [False] * len(claimed)
+            retries, failed = [], 0
+            for (booking, kind, attempts), sent in zip(claimed, results):
+                if sent:
+                    continue
+                attempts += 1
+                claim = db.query(BookingReminder).filter(
+                    BookingReminder.booking_id == booking.id, BookingReminder.kind == kind
+                )
+                if attempts < REMINDER_MAX_ATTEMPTS:
+                    # Release the claim so this or another worker can send it after the backoff
+                    claim.delete(synchronize_session=False)
+                    retries.append((booking.id, kind, attempts))
+                else:
+                    claim.update({"status": "failed"}, synchronize_session=False)
+                    failed += 1
+            db.commit()
+            for booking_id, kind, attempts in retries:
+                with self._lock:
+                    self._attempts[(booking_id, kind)] = attempts
+                self._push(booking_id, kind, now + timedelta(seconds=REMINDER_RETRY_SECONDS * 2 ** (attempts - 1)))
+            sent_count = len(claimed) - len(retries) - failed
+            print(f"Sent {sent_count} appointment reminders ({len(retries)} to retry, {failed} failed)")
+        except Exception as e:
+            db.rollback()
+            print(f"Error processing appointment reminders: {str(e)}")
+        finally:
+            db.close()
+        return len(entries)
+
+    def _reload(self):
+        db = SessionLocal()
+        try:
+            self.reload(db)
+        finally:
+            db.close()
+
+    async def _run(self):
+        next_reload = 0.0
+        while True:
+            self._wakeup.clear()
+            try:
+                if time.monotonic() >= next_reload:
+                    await asyncio.to_thread(self._reload)
+                    next_reload = time.monotonic() + RELOAD_INTERVAL_SECONDS
+                while await asyncio.to_thread(self.send_due) == REMINDER_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                print(f"Error in reminder scheduler: {str(e)}")
+            timeout = min(self._seconds_until_next_due(), next_reload - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if not REMINDERS_ENABLED or not SENDGRID_API_KEY:
+            print("Appointment reminders disabled (REMINDERS_ENABLED=0 or no SendGrid API key)")
+            return
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+reminder_scheduler = ReminderScheduler()
+booking_events.subscribe(reminder_scheduler.on_booking_change)
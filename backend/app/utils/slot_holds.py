@@ -0,0 +1,160 @@
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import SlotHold
+from .availability import MinuteInterval, booked_interval, merge_intervals, get_booked_intervals
+from .cache_versions import cache_versions
+
+SLOT_HOLD_TTL_SECONDS = int(os.getenv("SLOT_HOLD_TTL_SECONDS", "300"))
+MAX_CACHED_HOLD_DAYS = 20000
+
+# (start minute, end minute, expires_at) of one hold
+HeldInterval = Tuple[int, int, datetime]
+
+
+class SlotHoldStore:
+    """Short-lived holds on the slot a customer chose, from send-otp until verify-otp or expiry.
+
+    Holds are rows in slot_holds, so every worker sees them; reads for
+    availability go through an in-memory copy per (artist, day) that is
+    loaded on first use and dropped through the "slot_holds" cache version
+    whenever a hold for that artist is placed or released. Expiry needs no
+    invalidation: each cached hold carries its expires_at and is filtered out
+    once it has passed. Placing a hold and booking check the table itself,
+    so they never act on a stale copy.
+    """
+
+    def __init__(self, ttl_seconds: int = SLOT_HOLD_TTL_SECONDS):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._days: Dict[Tuple[int, date], List[HeldInterval]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, hair_artist_id: int = None):
+        with self._lock:
+            if hair_artist_id is None:
+                self._days.clear()
+            else:
+                for key in [k for k in self._days if k[0] == hair_artist_id]:
+                    del self._days[key]
+            self._generation += 1
+
+    def get_held_intervals(self, db: Session, hair_artist_id: int, day: date) -> List[MinuteInterval]:
+        """Unexpired holds on the artist's day as sorted, merged minute intervals"""
+        cache_versions.sync(db)
+        holds = self._days.get((hair_artist_id, day))
+        if holds is None:
+            generation = self._generation
+            holds = [
+                (*booked_interval(start, end), expires_at)
+                for start, end, expires_at in db.query(SlotHold.time, SlotHold.end_time, SlotHold.expires_at).filter(
+                    SlotHold.hair_artist_id == hair_artist_id,
+                    SlotHold.date == day,
+                    SlotHold.expires_at > datetime.utcnow()
+                )
+            ]
+            with self._lock:
+                # Drop the result if a hold was placed or released while we were loading
+                if generation == self._generation:
+                    if len(self._days) >= MAX_CACHED_HOLD_DAYS:
+                        self._days.clear()
+                    self._days[(hair_artist_id, day)] = holds
+        now = datetime.utcnow()
+        return merge_intervals(sorted((start, end) for start, end, expires_at in holds if expires_at > now))
+
+    def find_conflicting_hold(
+        self,
+        db: Session,
+        hair_artist_id: int,
+        day: date,
+        start: time,
+        end: time,
+        contacts: Sequence[str] = ()
+    ) -> Optional[SlotHold]:
+        """Return an unexpired hold by someone other than `contacts` overlapping [start, end), if any"""
+        return self._conflicting_holds(db, hair_artist_id, day, start, end, contacts).first()
+
+    def _conflicting_holds(self, db: Session, hair_artist_id: int, day: date, start: time, end: time,
+                           contacts: Sequence[str]):
+        query = db.query(SlotHold).filter(
+            SlotHold.hair_artist_id == hair_artist_id,
+            SlotHold.date == day,
+            SlotHold.time < end,
+            SlotHold.end_time > start,
+            SlotHold.expires_at > datetime.utcnow()
+        )
+        contacts = [contact for contact in contacts if contact]
+        if contacts:
+            query = query.filter(SlotHold.contact.notin_(contacts))
+        return query
+
+    def place(self, db: Session, contact: str, hair_artist_id: int, day: date, start: time,
+              end: time) -> Optional[SlotHold]:
+        """Hold [start, end) for `contact`, replacing any hold they already had; None if someone else holds part of it.
+
+        Two requests can both find the slot free before either commits, so the
+        new hold is checked again once committed: of two overlapping holds the
+        one placed first (the lower id) stands and the other is deleted. Expired
+        holds are purged.
+        """
+        if self.find_conflicting_hold(db, hair_artist_id, day, start, end, [contact]):
+            return None
+        now = datetime.utcnow()
+        released = {
+            artist_id for (artist_id,) in db.query(SlotHold.hair_artist_id).filter(SlotHold.contact == contact)
+        }
+        db.query(SlotHold).filter(
+            (SlotHold.contact == contact) | (SlotHold.expires_at <= now)
+        ).delete(synchronize_session=False)
+        hold = SlotHold(
+            contact=contact,
+            hair_artist_id=hair_artist_id,
+            date=day,
+            time=start,
+            end_time=end,
+            expires_at=now + self.ttl,
+            created_at=now
+        )
+        db.add(hold)
+        db.commit()
+        db.refresh(hold)
+        if self._conflicting_holds(db, hair_artist_id, day, start, end, [contact]).filter(SlotHold.id < hold.id).first():
+            db.query(SlotHold).filter(SlotHold.id == hold.id).delete(synchronize_session=False)
+            db.commit()
+            hold = None
+        for artist_id in sorted(released | {hair_artist_id}):
+            cache_versions.publish(db, "slot_holds", artist_id)
+        return hold
+
+    def release(self, db: Session, contact: str):
+        """Drop the contact's hold, e.g. once it has become a booking"""
+        try:
+            released = {
+                artist_id for (artist_id,) in db.query(SlotHold.hair_artist_id).filter(SlotHold.contact == contact)
+            }
+            if not released:
+                return
+            db.query(SlotHold).filter(SlotHold.contact == contact).delete(synchronize_session=False)
+            db.commit()
+            for artist_id in sorted(released):
+                cache_versions.publish(db, "slot_holds", artist_id)
+        except Exception as e:
+            # The hold still expires on its own
+            db.rollback()
+            print(f"Error releasing slot hold for {contact}: {str(e)}")
+
+
+slot_holds = SlotHoldStore()
+cache_versions.subscribe(
+    "slot_holds",
+    lambda key: slot_holds.invalidate(int(key) if key else None)
+)
+
+
+def get_unavailable_intervals(db: Session, hair_artist_id: int, day: date) -> List[MinuteInterval]:
+    """Booked and held time of an artist on a date, as sorted, merged minute intervals"""
+    return merge_intervals(sorted(
+        get_booked_intervals(db, hair_artist_id, day) + slot_holds.get_held_intervals(db, hair_artist_id, day)
+    ))
@@ -0,0 +1,201 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Off by default: per-span timings of login and OTP checks would let any client time them
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "0") != "0"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))  # Share of requests written to TRACE_FILE
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+MAX_PENDING_TRACES = 10000  # Sampled traces waiting to be written; more are dropped
+
+
+class Trace:
+    """Span timings of one request.
+
+    Every trace keeps a total duration and count per span name, which is all
+    the Server-Timing header needs. Sampled traces also keep each span with
+    its start offset, for the JSON lines file.
+    """
+
+    def __init__(self, sampled: bool):
+        self.started = time.perf_counter()
+        self.totals: Dict[str, List[float]] = {}
+        self.spans: Optional[List[dict]] = [] if sampled else None
+
+    def record(self, name: str, started: float, ended: float):
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [ended - started, 1]
+        else:
+            total[0] += ended - started
+            total[1] += 1
+        if self.spans is not None:
+            self.spans.append({
+                "name": name,
+                "start_ms": round((started - self.started) * 1000, 3),
+                "duration_ms": round((ended - started) * 1000, 3)
+            })
+
+    def server_timing(self) -> str:
+        entries = [
+            f'{name};dur={duration * 1000:.1f}' + (f';desc="{count}x"' if count > 1 else "")
+            for name, (duration, count) in self.totals.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block as span `name` of the current request's trace; a no-op outside a traced request"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, started, time.perf_counter())
+
+
+def instrument_engine(engine: Engine):
+    """Record every statement executed on `engine` as a "db" span"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_trace.get() is not None:
+            conn.info.setdefault("trace_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        trace = _current_trace.get()
+        started = conn.info.get("trace_query_started")
+        if trace is not None and started:
+            trace.record("db", started.pop(), time.perf_counter())
+
+
+def instrument_routing():
+    """Wrap FastAPI's per-request steps in "deps", "endpoint" and "serialize" spans.
+
+    FastAPI has no hooks between resolving dependencies, running the endpoint
+    and validating the response, so the module-level functions its request
+    handler calls are wrapped instead (checked against the pinned 0.104).
+    """
+    from fastapi import routing
+
+    def traced(name, function):
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await function(*args, **kwargs)
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    for name, attribute in (("deps", "solve_dependencies"), ("endpoint", "run_endpoint_function"),
+                            ("serialize", "serialize_response")):
+        function = getattr(routing, attribute, None)
+        if function is not None and not hasattr(function, "__wrapped__"):
+            setattr(routing, attribute, traced(name, function))
+
+
+class _TraceWriter:
+    """Appends sampled traces to a JSON lines file from a background thread.
+
+    write() only queues the record, so the middleware never blocks the event
+    loop on file I/O; the thread appends whatever has queued up in one write.
+    """
+
+    def __init__(self, path: str, max_pending: int = MAX_PENDING_TRACES):
+        self.path = path
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def write(self, record: dict):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                print(f"Trace writer is behind; {self.dropped} traces dropped so far")
+
+    def _run(self):
+        while True:
+            records = [self._queue.get()]
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "a") as trace_file:
+                    trace_file.write("".join(json.dumps(record) + "\n" for record in records))
+            except Exception as e:
+                print(f"Error writing {len(records)} traces: {str(e)}")
+
+
+class TracingMiddleware:
+    """Trace each HTTP request and, when enabled, report its spans in a Server-Timing header.
+
+    A fraction `sample_rate` of requests is also written to `trace_file` as a
+    JSON line with every span. Spans nest freely (e.g. "db" inside
+    "endpoint"), so their durations are not meant to add up to the total.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = SERVER_TIMING_ENABLED,
+                 sample_rate: float = TRACE_SAMPLE_RATE, trace_file: str = TRACE_FILE):
+        self.app = app
+        self.server_timing = server_timing
+        self.sample_rate = sample_rate
+        self.writer = _TraceWriter(trace_file) if sample_rate > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not (self.server_timing or self.writer):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.writer is not None and random.random() < self.sample_rate
+        trace = Trace(sampled)
+        token = _current_trace.set(trace)
+        status_code = None
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            if sampled:
+                self.writer.write({
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - trace.started) * 1000, 3),
+                    "spans": trace.spans
+                })
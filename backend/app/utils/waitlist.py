@@ -0,0 +1,170 @@
+import heapq
+import threading
+from bisect import bisect_right, insort
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.database import WaitlistEntry
+from .availability import earliest_start_minutes, from_minutes
+from .artist_schedule import get_free_intervals
+from .email import send_waitlist_email
+from .cache_versions import cache_versions
+
+ANY_ARTIST = 0  # Index key for entries that accept any hair artist
+MAX_WAITLIST_RANGE_DAYS = 31
+WAITLIST_NOTIFY_LIMIT = 3  # Entries notified per freed interval
+
+
+class WaitlistIndex:
+    """In-memory index of waiting entries by (artist, day) and duration.
+
+    Each (artist, day) bucket maps a duration to a FIFO queue of entry ids, and
+    keeps its durations sorted. Finding the oldest entries that fit a freed
+    interval touches only the buckets for that artist (and "any artist") on
+    that day, and only the queues whose duration fits, so the cost does not
+    depend on the total size of the waitlist. Removed entries are dropped
+    lazily when they reach the head of a queue, and the buckets of days that
+    have passed are dropped once a day, along with entries whose range ended.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, date], Tuple[List[int], Dict[int, Deque[int]]]] = {}
+        self._active: Dict[int, date] = {}  # Entry id -> end date
+        self._loaded = False
+        self._evicted_on: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self, db: Session):
+        cache_versions.sync(db)
+        if self._loaded:
+            return
+        entries = db.query(WaitlistEntry).filter(
+            WaitlistEntry.status == "waiting",
+            WaitlistEntry.end_date >= date.today()
+        ).order_by(WaitlistEntry.id).all()
+        with self._lock:
+            if self._loaded:
+                return
+            for entry in entries:
+                self._add(entry)
+            self._loaded = True
+            self._evicted_on = date.today()
+
+    def _evict_past(self):
+        today = date.today()
+        if self._evicted_on == today:
+            return
+        for key in [key for key in self._buckets if key[1] < today]:
+            del self._buckets[key]
+        for entry_id in [entry_id for entry_id, end_date in self._active.items() if end_date < today]:
+            del self._active[entry_id]
+        self._evicted_on = today
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt from the database on next use"""
+        with self._lock:
+            self._buckets.clear()
+            self._active.clear()
+            self._loaded = False
+            self._evicted_on = None
+
+    def _add(self, entry: WaitlistEntry):
+        artist_key = entry.hair_artist_id or ANY_ARTIST
+        day = max(entry.start_date, date.today())
+        while day <= entry.end_date:
+            durations, queues = self._buckets.setdefault((artist_key, day), ([], {}))
+            if entry.duration_minutes not in queues:
+                insort(durations, entry.duration_minutes)
+                queues[entry.duration_minutes] = deque()
+            queues[entry.duration_minutes].append(entry.id)
+            day += timedelta(days=1)
+        self._active[entry.id] = entry.end_date
+
+    def add(self, entry: WaitlistEntry):
+        with self._lock:
+            if self._loaded:
+                self._add(entry)
+
+    def remove(self, entry_id: int):
+        with self._lock:
+            self._active.pop(entry_id, None)
+
+    def candidates(self, hair_artist_id: int, day: date, max_duration: int, limit: int) -> List[int]:
+        """Oldest active entry ids for the artist (or any artist) on `day` that fit in `max_duration`"""
+        with self._lock:
+            self._evict_past()
+            queues = []
+            for artist_key in (hair_artist_id, ANY_ARTIST):
+                bucket = self._buckets.get((artist_key, day))
+                if not bucket:
+                    continue
+                durations, by_duration = bucket
+                for duration in durations[:bisect_right(durations, max_duration)]:
+                    queue = by_duration[duration]
+                    while queue and queue[0] not in self._active:
+                        queue.popleft()
+                    if queue:
+                        queues.append(queue)
+
+            # Queues are in id (arrival) order, so a k-way merge yields the oldest entries first
+            result = []
+            for entry_id in heapq.merge(*queues):
+                if entry_id in self._active:
+                    result.append(entry_id)
+                    if len(result) == limit:
+                        break
+            return result
+
+
+waitlist_index = WaitlistIndex()
+# Entries added or removed by another worker are picked up by rebuilding the index
+cache_versions.subscribe("waitlist", lambda key: waitlist_index.invalidate())
+
+
+def match_freed_interval(db: Session, hair_artist_id: int, day: date, start: int, limit: int = WAITLIST_NOTIFY_LIMIT) -> List[dict]:
+    """Claim the waitlist entries that fit the free gap around a just-freed booking start.
+
+    The whole free interval containing `start` is used, so a cancellation next
+    to existing free time can satisfy longer services. Entries are claimed with
+    a conditional update, so concurrent workers never notify the same entry twice.
+    Returns plain dicts (safe to use after the session closes); the caller
+    commits, removes the matched ids from waitlist_index, and then notifies.
+    Claimed entries stay in the index until then, so a rolled-back claim
+    leaves them matchable.
+    """
+    waitlist_index.ensure_loaded(db)
+    _, free = get_free_intervals(db, hair_artist_id, day)
+    earliest = earliest_start_minutes(day, datetime.now())
+    gap = next(((max(s, earliest), e) for s, e in free if s <= start < e), None)
+    if gap is None or gap[0] >= gap[1]:
+        return []
+
+    matches = []
+    for entry_id in waitlist_index.candidates(hair_artist_id, day, gap[1] - gap[0], limit):
+        claimed = db.query(WaitlistEntry).filter(
+            WaitlistEntry.id == entry_id,
+            WaitlistEntry.status == "waiting"
+        ).update({"status": "notified", "notified_at": datetime.utcnow()}, synchronize_session=False)
+        if claimed:
+            entry = db.query(WaitlistEntry).filter(WaitlistEntry.id == entry_id).first()
+            matches.append({
+                "id": entry.id,
+                "name": entry.name,
+                "email": entry.email,
+                "service": entry.service,
+                "start": gap[0]
+            })
+        else:
+            # Already notified or cancelled elsewhere
+            waitlist_index.remove(entry_id)
+    return matches
+
+
+def notify_waitlist_matches(matches: List[dict], day: date):
+    """Email matched customers; meant to run as a background task after the transaction commits"""
+    for match in matches:
+        try:
+            send_waitlist_email(match["email"], match["name"], match["service"], day, from_minutes(match["start"]))
+        except Exception as e:
+            print(f"Error notifying waitlist entry {match['id']}: {str(e)}")
@@ -1,4 +1,7 @@
+import os
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    # Several workers share in-memory caches coherently through the cache_versions table
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=workers == 1, workers=workers)
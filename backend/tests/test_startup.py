@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.main import app
+from app.models.database import SessionLocal, engine
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+STARTUP_BUDGET_MS = 500  # A boot that skips seeding only looks up the seed hash
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    """A fresh database migrated to head, bound to the app's sessions in place of the checkout's salon.db"""
+    path = tmp_path / "salon.db"
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+
+    test_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SessionLocal.configure(bind=test_engine)
+    yield path
+    SessionLocal.configure(bind=engine)
+    test_engine.dispose()
+
+
+def boot() -> dict:
+    with TestClient(app):
+        pass
+    return app.state.startup
+
+
+def test_first_startup_seeds_and_restart_skips_seeding(migrated_db):
+    first = boot()
+    assert first["seeded"]
+
+    second = boot()
+    assert not second["seeded"]
+    assert second["duration_ms"] < STARTUP_BUDGET_MS
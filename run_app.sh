@@ -53,7 +53,11 @@ pip install -r requirements.txt
 
 # Run migrations and seed database
 echo "Setting up database..."
-alembic upgrade head
+if ! alembic upgrade head; then
+    # Databases created before migrations managed the schema have no alembic_version yet
+    echo "Stamping existing database at the initial revision and retrying..."
+    alembic stamp f957f392ca77 && alembic upgrade head
+fi
 PYTHONPATH=$PROJECT_ROOT/backend python -m app.scripts.seed_db
 
 # Apply additional schema changes for slot_gap_minutes if needed